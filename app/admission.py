@@ -0,0 +1,200 @@
+"""Admission control and load shedding.
+
+Without a limit, every request a worker accepts is started at once: under
+overload they all compete for the event loop and the connection pool, and
+every one of them gets slow. `AdmissionController` serves at most
+`ADMISSION_MAX_CONCURRENCY` requests at a time and keeps the others waiting
+in a bounded queue, so admitted requests keep their usual latency and the
+excess is turned away quickly with a 503 and `Retry-After` instead of timing
+out.
+
+Waiting requests have one of two priorities. Cheap reads (`GET` and `HEAD`
+outside the admin listings) are admitted before expensive requests (writes,
+`/users` listings and exports, `/admin`), and when the queue is full a cheap
+read takes the place of the most recently queued expensive request. A request
+that waits longer than `ADMISSION_QUEUE_TIMEOUT_SECONDS` is shed as well, which
+also bounds how long expensive requests can be starved by reads.
+
+Requests are classified from the method and path before routing, so the
+controller adds no work to requests that are admitted right away.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import config
+from .monitoring.metrics import Counter, Gauge, Histogram, registry
+
+CHEAP = "cheap"
+EXPENSIVE = "expensive"
+PRIORITIES = (CHEAP, EXPENSIVE)
+
+CHEAP_METHODS = {"GET", "HEAD"}
+EXPENSIVE_READ_PATHS = {"/users", "/users/export"}
+EXPENSIVE_READ_PREFIXES = ("/admin/",)
+EXEMPT_PATHS = {"/metrics"}
+"""Paths served whatever the load, so the worker can still be monitored."""
+
+shed_total = registry.register(Counter(
+    "admission_shed_total", "Requests turned away by admission control", ("priority", "reason")))
+queue_wait = registry.register(Histogram(
+    "admission_queue_wait_seconds", "Time admitted requests waited in the admission queue", ("priority",)))
+
+
+def request_priority(scope: Scope) -> Optional[str]:
+    """
+    Classifies a request for admission.
+
+    Args:
+        scope (Scope): ASGI scope of the request
+
+    Returns:
+        str | None: `CHEAP` or `EXPENSIVE`, None for requests admitted unconditionally
+    """
+    path = scope["path"]
+    if path in EXEMPT_PATHS:
+        return None
+    if scope["method"] not in CHEAP_METHODS:
+        return EXPENSIVE
+    if path.rstrip("/") in EXPENSIVE_READ_PATHS or path.startswith(EXPENSIVE_READ_PREFIXES):
+        return EXPENSIVE
+    return CHEAP
+
+
+class AdmissionController:
+    """
+    Limits the requests served concurrently and queues the excess by priority.
+
+    Attributes:
+        max_concurrency (int): Requests served at the same time
+        queue_size (int): Requests waiting at most, over both priorities
+        queue_timeout (float): Seconds a request waits before it is shed
+        in_flight (int): Requests being served
+        queues (dict[str, deque[asyncio.Future]]): Waiting requests of every priority, oldest first
+    """
+
+    def __init__(self, max_concurrency: int, queue_size: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queues = {priority: deque() for priority in PRIORITIES}
+
+    def queued(self, priority: Optional[str] = None) -> int:
+        if priority is not None:
+            return len(self.queues[priority])
+        return sum(len(queue) for queue in self.queues.values())
+
+    async def acquire(self, priority: str) -> Optional[str]:
+        """
+        Waits until the request may be served.
+
+        The caller must call `release` once the admitted request is served.
+
+        Args:
+            priority (str): `CHEAP` or `EXPENSIVE`
+
+        Returns:
+            str | None: None if admitted, otherwise why the request was shed
+                (`queue_full`, `timeout` or `evicted`)
+        """
+        if self.in_flight < self.max_concurrency and not self.queued():
+            self.in_flight += 1
+            return None
+        if self.queued() >= self.queue_size:
+            expensive = self.queues[EXPENSIVE]
+            if priority == EXPENSIVE or not expensive:
+                return self.shed(priority, "queue_full")
+            # Make room for the read: the latest expensive request is shed instead.
+            # Waiters of cancelled requests stay queued until their task resumes.
+            while expensive:
+                waiter = expensive.pop()
+                if not waiter.done():
+                    waiter.set_result(False)
+                    self.shed(EXPENSIVE, "evicted")
+                    break
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.queues[priority].append(waiter)
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                admitted = await waiter
+        except BaseException as error:
+            if not waiter.done():
+                waiter.cancel()
+            elif not waiter.cancelled() and waiter.result():
+                # Admitted as the wait ended: hand the slot on.
+                self.release()
+            if waiter in self.queues[priority]:
+                self.queues[priority].remove(waiter)
+            if not isinstance(error, TimeoutError):
+                raise
+            if not waiter.cancelled() and not waiter.result():
+                return "evicted"
+            return self.shed(priority, "timeout")
+        if not admitted:
+            return "evicted"
+        queue_wait.observe(time.perf_counter() - started, priority)
+        return None
+
+    def release(self):
+        """Hands the slot of a served request to the next waiting one, cheap reads first."""
+        for priority in PRIORITIES:
+            queue = self.queues[priority]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(True)
+                    return
+        self.in_flight -= 1
+
+    def shed(self, priority: str, reason: str) -> str:
+        shed_total.inc(priority, reason)
+        return reason
+
+
+admission_controller = AdmissionController(config.ADMISSION_MAX_CONCURRENCY or 0,
+                                           config.ADMISSION_QUEUE_SIZE,
+                                           config.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+
+registry.register(Gauge("admission_in_flight", "Requests admitted and being served",
+                        function=lambda: admission_controller.in_flight))
+registry.register(Gauge("admission_queue_depth", "Requests waiting for admission", ("priority",),
+                        function=lambda: {(priority,): admission_controller.queued(priority)
+                                          for priority in PRIORITIES}))
+
+
+class AdmissionMiddleware:
+    """Admits requests through an `AdmissionController` and answers shed ones with 503."""
+
+    def __init__(self,
+                 app: ASGIApp,
+                 controller: AdmissionController = admission_controller,
+                 retry_after: int = config.ADMISSION_RETRY_AFTER_SECONDS):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.controller.max_concurrency:
+            await self.app(scope, receive, send)
+            return
+        priority = request_priority(scope)
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+        if await self.controller.acquire(priority) is not None:
+            response = JSONResponse({"detail": "Server is overloaded, retry later"}, status_code=503,
+                                    headers={"Retry-After": str(self.retry_after)})
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
@@ -1,11 +1,15 @@
 from fastapi_users.authentication import JWTStrategy, BearerTransport, AuthenticationBackend
+from .tokens import CachedJWTStrategy, token_cache, revocation_store
 from ..config import config
 from fastapi import Depends, Request
-from fastapi_users import BaseUserManager, FastAPIUsers
+from fastapi_users import BaseUserManager, FastAPIUsers, exceptions
 from app.repositories.user import UserRepository
 
 from app.models.user_model import User
 from app.repositories import get_user_repository
+from app.auth.hashing import get_password_helper, hash_passwords
+from app.schemas.users import UserCreate, UserBulkResult, BulkStatusEnum
+from app.tracing import trace_methods
 
 from typing import Optional, List
 
@@ -14,7 +18,10 @@ bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 SECRET = config.JWT_SECRET_KEY
 
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=SECRET, lifetime_seconds=3600)
+    return CachedJWTStrategy(secret=SECRET,
+                             lifetime_seconds=3600,
+                             cache=token_cache,
+                             revocations=revocation_store)
 
 auth_backend = AuthenticationBackend(
     name="jwt",
@@ -22,12 +29,16 @@ auth_backend = AuthenticationBackend(
     get_strategy=get_jwt_strategy,
 )
 
+@trace_methods
 class UserManager(BaseUserManager[User, int]):
     """
     User management class that handles user-related operations like registration,
     password reset, and verification.
 
     Inherits from BaseUserManager and specializes for User model with integer IDs.
+    Passwords are hashed with the parameters stored in `Config` (see app.auth.hashing);
+    `authenticate` rehashes the stored password on a successful login whenever those
+    parameters changed since the hash was created.
 
     Attributes:
         reset_password_token_secret (str): Secret key used for password reset tokens
@@ -95,6 +106,109 @@ class UserManager(BaseUserManager[User, int]):
         """
         return await self.user_db.get_all()
 
+    async def get_page(self,
+                       limit: int,
+                       cursor: Optional[int] = None,
+                       is_active: Optional[bool] = None,
+                       is_superuser: Optional[bool] = None,
+                       email_prefix: Optional[str] = None):
+        """
+        Retrieves one page of users ordered by id.
+
+        Args:
+            limit (int): Maximum number of users to return
+            cursor (Optional[int]): Cursor returned with the previous page
+            is_active (Optional[bool]): Filter on the active flag
+            is_superuser (Optional[bool]): Filter on the superuser flag
+            email_prefix (Optional[str]): Only return users whose email starts with it
+
+        Returns:
+            tuple[List[User], Optional[int]]: The users and the cursor of the next page
+        """
+        return await self.user_db.get_page(limit, cursor, is_active, is_superuser, email_prefix)
+
+    async def export(self,
+                     batch_size: int,
+                     is_active: Optional[bool] = None,
+                     is_superuser: Optional[bool] = None,
+                     email_prefix: Optional[str] = None):
+        """
+        Iterates over all matching users in batches, for streaming responses.
+
+        The session is closed once the iteration ends, since streaming outlives
+        the request's dependencies.
+
+        Args:
+            batch_size (int): Number of users loaded per query
+            is_active (Optional[bool]): Filter on the active flag
+            is_superuser (Optional[bool]): Filter on the superuser flag
+            email_prefix (Optional[str]): Only return users whose email starts with it
+
+        Yields:
+            List[User]: The next batch of users
+        """
+        try:
+            async for users in self.user_db.iter_batches(batch_size, is_active, is_superuser, email_prefix):
+                yield users
+        finally:
+            await self.user_db.close()
+
+    async def bulk_create(self, users: List[UserCreate], batch_size: int, request: Optional[Request] = None):
+        """
+        Creates many users at once, reporting the outcome of every row.
+
+        Existing emails are found with a single query, passwords of the remaining
+        rows are hashed in parallel on the hashing thread pool, and users are
+        inserted in transactions of `batch_size` rows.
+
+        Args:
+            users (List[UserCreate]): Users to create
+            batch_size (int): Number of users per transaction
+            request (Optional[Request]): The FastAPI request object, if available
+
+        Returns:
+            List[UserBulkResult]: One result per row, in request order
+        """
+        results = [UserBulkResult(index=index, email=user.email, status=BulkStatusEnum.created)
+                   for index, user in enumerate(users)]
+
+        existing = await self.user_db.get_existing_emails([user.email for user in users])
+        seen = set()
+        pending = []
+        for index, user in enumerate(users):
+            email = user.email.lower()
+            if email in existing:
+                results[index].status = BulkStatusEnum.conflict
+                results[index].detail = "User already exist"
+                continue
+            if email in seen:
+                results[index].status = BulkStatusEnum.conflict
+                results[index].detail = "Duplicate email in request"
+                continue
+            try:
+                await self.validate_password(user.password, user)
+            except exceptions.InvalidPasswordException as e:
+                results[index].status = BulkStatusEnum.invalid
+                results[index].detail = str(e.reason)
+                continue
+            seen.add(email)
+            pending.append(index)
+
+        rows = [users[index].create_update_dict_superuser() for index in pending]
+        hashed_passwords = await hash_passwords([row.pop("password") for row in rows], self.password_helper)
+        for row, hashed_password in zip(rows, hashed_passwords):
+            row["hashed_password"] = hashed_password
+
+        created_users = await self.user_db.create_many(rows, batch_size)
+        for index, created_user in zip(pending, created_users):
+            if created_user is None:
+                results[index].status = BulkStatusEnum.conflict
+                results[index].detail = "User already exist"
+            else:
+                results[index].id = created_user.id
+                await self.on_after_register(created_user, request)
+        return results
+
     def parse_id(self, value):
         """
         Converts a user ID value to integer format.
@@ -136,7 +250,7 @@ async def get_user_manager(user_db: UserRepository = Depends(get_user_repository
     """
     if not isinstance(user_db, UserRepository):
         raise TypeError(f"Expected UserRepository, got {type(user_db).__name__}")
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_helper=get_password_helper())
 
 fastapi_users = FastAPIUsers[User, int](get_user_manager, [auth_backend])
 current_active_user = fastapi_users.current_user(active=True)
@@ -0,0 +1,162 @@
+"""Password hashing parameters and latency calibration.
+
+The argon2 parameters live in `Config` so that login latency (and the CPU
+spent per login) is a planned number instead of a library default. When
+`Config.PASSWORD_HASH_TARGET_MS` is set, `calibrate_password_hashing` is run
+at startup and picks the time cost that reaches that budget on the current
+hardware.
+
+Hashes created with other parameters keep verifying: pwdlib reports them as
+needing a rehash and `BaseUserManager.authenticate` stores the upgraded hash
+after the next successful login.
+
+Bulk operations hash on a thread pool (`hash_passwords`); argon2 releases the
+GIL while hashing, so the pool runs hashes in parallel without blocking the
+event loop.
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from ..config import config
+
+MAX_TIME_COST = 32
+CALIBRATION_PASSWORD = "calibration-password"
+
+_password_helper = None
+_password_helper_params = None
+_hash_executor = None
+
+
+def build_password_helper(time_cost: int, memory_cost: int, parallelism: int) -> PasswordHelper:
+    """
+    Creates a password helper hashing with argon2 using the given parameters.
+
+    Bcrypt stays registered as a secondary hasher so legacy hashes still verify
+    (and get upgraded on login).
+
+    Args:
+        time_cost (int): Argon2 iterations
+        memory_cost (int): Argon2 memory usage in KiB
+        parallelism (int): Argon2 lanes
+
+    Returns:
+        PasswordHelper: Helper usable by `BaseUserManager`
+    """
+    argon2_hasher = Argon2Hasher(time_cost=time_cost,
+                                 memory_cost=memory_cost,
+                                 parallelism=parallelism)
+    return PasswordHelper(PasswordHash((argon2_hasher, BcryptHasher())))
+
+
+def get_password_helper() -> PasswordHelper:
+    """
+    Returns the password helper for the parameters currently stored in `Config`.
+
+    The helper is cached and rebuilt only when the parameters change, e.g. after
+    calibration.
+
+    Returns:
+        PasswordHelper: Shared helper instance
+    """
+    global _password_helper, _password_helper_params
+    params = (config.ARGON2_TIME_COST, config.ARGON2_MEMORY_COST, config.ARGON2_PARALLELISM)
+    if _password_helper is None or params != _password_helper_params:
+        _password_helper = build_password_helper(*params)
+        _password_helper_params = params
+    return _password_helper
+
+
+def measure_hash_latency(hasher: Argon2Hasher, rounds: int = 3) -> float:
+    """
+    Measures how long a single hash takes with the given hasher.
+
+    Args:
+        hasher (Argon2Hasher): Hasher to measure
+        rounds (int): Number of hashes; the median is reported
+
+    Returns:
+        float: Median latency of one hash in milliseconds
+    """
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.hash(CALIBRATION_PASSWORD)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def calibrate_password_hashing(target_ms: float,
+                               memory_cost: int | None = None,
+                               parallelism: int | None = None,
+                               rounds: int = 3) -> int:
+    """
+    Picks the argon2 time cost reaching `target_ms` per hash and stores it in `Config`.
+
+    Latency grows linearly with the time cost, so the search extrapolates from the
+    last measurement and stops at the first cost meeting the budget. Memory cost and
+    parallelism are kept fixed; if a single iteration is already slower than the
+    target, the time cost stays at 1.
+
+    Args:
+        target_ms (float): Latency budget for one hash in milliseconds
+        memory_cost (int | None): Argon2 memory usage in KiB, defaults to `Config`
+        parallelism (int | None): Argon2 lanes, defaults to `Config`
+        rounds (int): Hashes measured per candidate
+
+    Returns:
+        int: The selected time cost
+    """
+    memory_cost = memory_cost or config.ARGON2_MEMORY_COST
+    parallelism = parallelism or config.ARGON2_PARALLELISM
+
+    time_cost = 1
+    latency = measure_hash_latency(Argon2Hasher(time_cost, memory_cost, parallelism), rounds)
+    while latency < target_ms and time_cost < MAX_TIME_COST:
+        estimate = int(time_cost * target_ms / latency) if latency > 0 else MAX_TIME_COST
+        time_cost = min(MAX_TIME_COST, max(time_cost + 1, estimate))
+        latency = measure_hash_latency(Argon2Hasher(time_cost, memory_cost, parallelism), rounds)
+
+    config.ARGON2_TIME_COST = time_cost
+    config.ARGON2_MEMORY_COST = memory_cost
+    config.ARGON2_PARALLELISM = parallelism
+    return time_cost
+
+
+def get_hash_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool used for parallel password hashing.
+
+    Returns:
+        ThreadPoolExecutor: Pool with `Config.PASSWORD_HASH_WORKERS` threads
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS,
+                                            thread_name_prefix="password-hash")
+    return _hash_executor
+
+
+async def hash_passwords(passwords: list[str], password_helper: PasswordHelper | None = None) -> list[str]:
+    """
+    Hashes many passwords in parallel off the event loop.
+
+    Args:
+        passwords (list[str]): Plain passwords
+        password_helper (PasswordHelper | None): Helper to hash with, defaults to `get_password_helper()`
+
+    Returns:
+        list[str]: Hashes in the order of `passwords`
+    """
+    password_helper = password_helper or get_password_helper()
+    loop = asyncio.get_running_loop()
+    executor = get_hash_executor()
+    return await asyncio.gather(*(loop.run_in_executor(executor, password_helper.hash, password)
+                                  for password in passwords))
@@ -0,0 +1,193 @@
+"""Server-side revocation of access tokens.
+
+Every access token carries a unique `jti` claim. Revoking a token (logout, or
+killing a compromised token) stores its `jti` in the `revoked_tokens` table
+and in memory. Authenticated requests only consult memory: a Bloom filter
+answers "certainly not revoked" for almost every token, and the in-memory map
+confirms the rare positive, so the happy path never touches the database.
+
+Other workers learn about revocations when `sync` reloads the table, which
+`run_maintenance` does periodically together with pruning expired entries.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+
+from sqlalchemy import delete, or_, select
+
+from app.db import async_session_maker
+from app.models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set: no false negatives, false positives at `error_rate`.
+
+    Attributes:
+        size (int): Number of bits
+        hash_count (int): Number of bit positions per key
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize an empty filter sized for `capacity` keys.
+
+        Args:
+            capacity (int): Expected number of keys
+            error_rate (float): Target false positive rate at capacity
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # The filter never leaves the process, so the (per-process salted) string
+        # hash is a valid source; its two 32-bit halves seed double hashing.
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        first = value & 0xFFFFFFFF
+        second = (value >> 32) | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        """
+        Adds a key to the filter.
+
+        Args:
+            key (str): Key to add
+        """
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str):
+        bits = self._bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationStore:
+    """
+    Revoked token identifiers held in memory and persisted in `revoked_tokens`.
+
+    Attributes:
+        session_maker (async_sessionmaker): Factory for database sessions
+        capacity (int): Minimum number of entries the Bloom filter is sized for
+    """
+
+    def __init__(self, session_maker=async_session_maker, capacity: int = 100_000):
+        """
+        Initialize an empty store.
+
+        Args:
+            session_maker (async_sessionmaker): Factory for database sessions
+            capacity (int): Minimum number of entries the Bloom filter is sized for
+        """
+        self.session_maker = session_maker
+        self.capacity = capacity
+        self._revoked: dict[str, Optional[int]] = {}
+        self._bloom = BloomFilter(capacity)
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def _remember(self, jti: str, expires_at: Optional[int]):
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+
+    def _rebuild_filter(self):
+        self._bloom = BloomFilter(max(self.capacity, 2 * len(self._revoked)))
+        for jti in self._revoked:
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Checks whether a token identifier was revoked, without any I/O.
+
+        Args:
+            jti (str | None): The `jti` claim of the token
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        if jti is None or not self._revoked or jti not in self._bloom:
+            return False
+        return jti in self._revoked
+
+    async def revoke(self, jti: str, expires_at: Optional[int]):
+        """
+        Revokes a token identifier in memory and in the database.
+
+        Args:
+            jti (str): The `jti` claim of the token
+            expires_at (int | None): Expiry of the token as a UNIX timestamp
+        """
+        self._remember(jti, expires_at)
+        async with self.session_maker() as session:
+            await session.merge(RevokedToken(jti=jti, expires_at=expires_at))
+            await session.commit()
+
+    async def sync(self, now: Optional[float] = None) -> int:
+        """
+        Loads revocations stored by any worker that have not expired yet.
+
+        Args:
+            now (float | None): Current UNIX time, defaults to `time.time()`
+
+        Returns:
+            int: Number of revoked identifiers held in memory afterwards
+        """
+        now = now or time.time()
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at)
+                .where(or_(RevokedToken.expires_at.is_(None), RevokedToken.expires_at > now))
+            )
+            for jti, expires_at in result:
+                self._remember(jti, expires_at)
+        return len(self._revoked)
+
+    async def prune(self, now: Optional[float] = None) -> int:
+        """
+        Forgets revocations of tokens that have expired anyway.
+
+        Args:
+            now (float | None): Current UNIX time, defaults to `time.time()`
+
+        Returns:
+            int: Number of identifiers dropped from memory
+        """
+        now = now or time.time()
+        expired = [jti for jti, expires_at in self._revoked.items()
+                   if expires_at is not None and expires_at <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        self._rebuild_filter()
+
+        async with self.session_maker() as session:
+            await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+            await session.commit()
+        return len(expired)
+
+    async def run_maintenance(self, interval: float):
+        """
+        Periodically prunes expired revocations and loads new ones.
+
+        Runs until cancelled; errors are logged and retried on the next tick.
+
+        Args:
+            interval (float): Seconds between runs
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.prune()
+                await self.sync()
+            except Exception:
+                logger.exception("Revoked token maintenance failed")
@@ -0,0 +1,247 @@
+"""Verified-token cache for the JWT authentication backend.
+
+Clients reuse the same access token for its whole lifetime, so decoding and
+verifying the signature on every request repeats identical work. The
+`CachedJWTStrategy` keeps the result of a successful verification in a bounded
+LRU cache keyed by the raw token. Entries are dropped once the token expires.
+
+Each token carries a unique `jti` claim which is checked against the
+revocation store (see app.auth.revocation) on every request, cached or not;
+logout revokes the token.
+
+The user itself is still loaded on every request, so deactivated or deleted
+users are rejected even while their token is cached. Its id is recorded in
+the `request_user` context variable for the access log.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import NamedTuple, Optional
+
+import jwt
+from fastapi_users import exceptions
+from fastapi_users.authentication import JWTStrategy
+from fastapi_users.jwt import decode_jwt, generate_jwt
+
+from ..config import config
+from .revocation import RevocationStore
+
+
+class CachedToken(NamedTuple):
+    """Result of a successful token verification."""
+
+    user_id: str
+    """Value of the `sub` claim."""
+    expires_at: Optional[float]
+    """Value of the `exp` claim as a UNIX timestamp, None if the token never expires."""
+    claims: dict
+    """All decoded claims."""
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified tokens.
+
+    Attributes:
+        max_size (int): Maximum number of cached tokens, 0 disables caching
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that required verification
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of cached tokens, 0 disables caching
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[CachedToken]:
+        """
+        Returns the cached verification result for a token.
+
+        Args:
+            token (str): Raw encoded token
+            now (float | None): Current UNIX time, defaults to `time.time()`
+
+        Returns:
+            CachedToken | None: The entry, or None if absent or expired
+        """
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at is not None and entry.expires_at <= (now or time.time()):
+            del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry
+
+    def put(self, token: str, entry: CachedToken):
+        """
+        Stores a verification result, evicting the least recently used entries.
+
+        Args:
+            token (str): Raw encoded token
+            entry (CachedToken): Verification result
+        """
+        if self.max_size <= 0:
+            return
+        self._entries[token] = entry
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        """
+        Drops a token from the cache.
+
+        Args:
+            token (str): Raw encoded token
+        """
+        self._entries.pop(token, None)
+
+    def clear(self):
+        """Drops every cached token and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class RequestUser:
+    """Holder of the id of the user authenticated by the current request.
+
+    Attributes:
+        id (int | None): The user id, None while no token has been accepted.
+    """
+
+    __slots__ = ("id",)
+
+    def __init__(self):
+        self.id = None
+
+
+request_user: ContextVar[Optional[RequestUser]] = ContextVar("request_user", default=None)
+"""User of the current request, set by the access log middleware."""
+
+
+class CachedJWTStrategy(JWTStrategy):
+    """
+    JWT strategy that caches verified tokens and supports revocation.
+
+    Attributes:
+        cache (TokenCache): Cache of verified tokens
+        revocations (RevocationStore): Revoked token identifiers
+    """
+
+    def __init__(self, *args, cache: TokenCache, revocations: RevocationStore, **kwargs):
+        """
+        Initialize the strategy.
+
+        Args:
+            *args: Positional arguments of `JWTStrategy`
+            cache (TokenCache): Cache of verified tokens
+            revocations (RevocationStore): Revoked token identifiers
+            **kwargs: Keyword arguments of `JWTStrategy`
+        """
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+        self.revocations = revocations
+
+    def verify_token(self, token: str) -> Optional[CachedToken]:
+        """
+        Returns the verified claims of a token, from the cache when possible.
+
+        Args:
+            token (str): Raw encoded token
+
+        Returns:
+            CachedToken | None: Verification result, None if the token is invalid or revoked
+        """
+        entry = self.cache.get(token)
+        if entry is None:
+            try:
+                claims = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+            except jwt.PyJWTError:
+                return None
+            user_id = claims.get("sub")
+            if user_id is None:
+                return None
+            entry = CachedToken(user_id, claims.get("exp"), claims)
+            self.cache.put(token, entry)
+
+        if self.revocations.is_revoked(entry.claims.get("jti")):
+            return None
+        return entry
+
+    async def read_token(self, token, user_manager):
+        """
+        Returns the user owning a valid token.
+
+        Args:
+            token (str | None): Raw encoded token
+            user_manager (BaseUserManager): Manager used to load the user
+
+        Returns:
+            User | None: The user, or None if the token is invalid or the user does not exist
+        """
+        if token is None:
+            return None
+
+        entry = self.verify_token(token)
+        if entry is None:
+            return None
+
+        try:
+            parsed_id = user_manager.parse_id(entry.user_id)
+            user = await user_manager.get(parsed_id)
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        holder = request_user.get()
+        if holder is not None:
+            holder.id = user.id
+        return user
+
+    async def write_token(self, user) -> str:
+        """
+        Issues an access token with a unique `jti` claim.
+
+        Args:
+            user (User): Owner of the token
+
+        Returns:
+            str: Encoded token
+        """
+        data = {"sub": str(user.id), "aud": self.token_audience, "jti": uuid.uuid4().hex}
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+    async def destroy_token(self, token: str, user):
+        """
+        Revokes a token on logout.
+
+        Tokens issued without a `jti` claim cannot be revoked and stay valid until they expire.
+
+        Args:
+            token (str): Raw encoded token
+            user (User): Owner of the token
+        """
+        entry = self.verify_token(token)
+        self.cache.invalidate(token)
+        if entry is not None and entry.claims.get("jti") is not None:
+            await self.revocations.revoke(entry.claims["jti"], entry.expires_at)
+
+
+token_cache = TokenCache(config.TOKEN_CACHE_SIZE)
+revocation_store = RevocationStore(capacity=config.REVOCATION_FILTER_CAPACITY)
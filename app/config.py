@@ -5,9 +5,32 @@ a Config class to access application configuration settings.
 """
 
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def find_env_file():
+    """Finds the `.env` file python-dotenv would load: in this directory or a parent.
+
+    Returns:
+        str | None: Path of the file, None if there is none
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+# python-dotenv is only imported when there is a file to load, which is
+# rarely the case in containers where the environment is set directly.
+ENV_FILE = find_env_file()
+if ENV_FILE is not None:
+    from dotenv import load_dotenv
+
+    load_dotenv(ENV_FILE)
 
 class Config:
     """Configuration class holding application settings.
@@ -15,8 +38,138 @@ class Config:
     Attributes:
         DATABASE_URL (str): Database connection URL from environment variables
         JWT_SECRET_KEY (str): Secret key for JWT token generation and validation
+        PASSWORD_HASH_TARGET_MS (float | None): Per-hash latency budget in milliseconds.
+            When set, argon2 parameters are calibrated at startup to reach it, once
+            for all the workers of the prefork server
+        ARGON2_TIME_COST (int): Argon2 iterations; overwritten by calibration
+        ARGON2_MEMORY_COST (int): Argon2 memory usage in KiB
+        ARGON2_PARALLELISM (int): Argon2 lanes (changes the resulting hash)
+        PASSWORD_HASH_WORKERS (int): Threads hashing passwords for bulk operations
+        TOKEN_CACHE_SIZE (int): Number of verified access tokens kept in memory, 0 disables the cache
+        REVOCATION_FILTER_CAPACITY (int): Revoked tokens the Bloom prefilter is sized for
+        REVOCATION_SYNC_INTERVAL_SECONDS (float): How often revocations are pruned and reloaded
+        USERS_PAGE_MAX_SIZE (int): Largest page size accepted by `GET /users`
+        USERS_EXPORT_BATCH_SIZE (int): Users loaded per query by `GET /users/export`
+        USERS_BULK_MAX_SIZE (int): Largest number of users accepted by `POST /users/bulk`
+        USERS_BULK_BATCH_SIZE (int): Users inserted per transaction by `POST /users/bulk`
+        SQL_QUERY_BUDGET (int | None): Statements a request may execute before a warning is logged,
+            None disables the warning
+        SLOW_QUERY_THRESHOLD_MS (float | None): Statements slower than this are written to the
+            slow-query log, None disables it
+        SLOW_QUERY_LOG_PATH (str): File of the slow-query log
+        SLOW_QUERY_LOG_MAX_BYTES (int): Size at which the slow-query log is rotated
+        SLOW_QUERY_LOG_BACKUPS (int): Rotated slow-query log files kept
+        PROFILE_STORE_SIZE (int): Request profiles kept in memory for `/admin/profiles`
+        SAMPLER_ENABLED (bool): Whether the event loop is continuously sampled for `/admin/flamegraph`
+        SAMPLER_INTERVAL_MS (float): Milliseconds between two stack samples
+        SAMPLER_MAX_STACKS (int): Distinct stacks kept by the sampler
+        LOOP_LAG_MONITOR_ENABLED (bool): Whether event-loop lag is measured and stalls are captured
+        LOOP_LAG_INTERVAL_MS (float): Milliseconds between two event-loop lag measurements
+        LOOP_LAG_THRESHOLD_MS (float): Lag above which a stall is logged with the blocking stack
+        TRACING_SAMPLE_RATE (float): Fraction of requests traced, 0 disables tracing
+        TRACING_EXPORT (str): JSON lines file the traces are appended to, or the http(s) URL
+            of an OTLP/HTTP collector (e.g. `http://localhost:4318/v1/traces`)
+        TRACING_SERVICE_NAME (str): `service.name` resource attribute of the exported traces
+        ACCESS_LOG_ENABLED (bool): Whether a JSON access log entry is written per request
+        ACCESS_LOG_PATH (str): File the access log is appended to, `-` for stdout
+        ACCESS_LOG_QUEUE_SIZE (int): Entries waiting to be written before new ones are dropped
+        WARMUP_ENABLED (bool): Whether pool connections and repository statements are prepared
+            before the first request
+        WARMUP_CONNECTIONS (int | None): Connections opened by the warm-up, None for the pool size
+        WARMUP_OPENAPI (bool): Whether the warm-up also renders the OpenAPI schema, which builds the
+            lazily loaded routers; otherwise it is rendered on the first request for it
+        SHUTDOWN_DRAIN_TIMEOUT_SECONDS (float): How long shutdown waits for requests in flight
+        SERVER_HOST (str): Address `python -m app.serve` listens on
+        SERVER_PORT (int): Port `python -m app.serve` listens on
+        SERVER_WORKERS (int): Worker processes, 0 for one per CPU
+        SERVER_LOOP (str): Event loop, `auto` (uvloop if installed), `asyncio` or `uvloop`
+        SERVER_HTTP (str): HTTP parser, `auto` (httptools if installed), `h11` or `httptools`
+        SERVER_BACKLOG (int): Connections waiting to be accepted before new ones are refused
+        SERVER_KEEPALIVE_SECONDS (int): How long idle keep-alive connections are kept open
+        SERVER_LIMIT_CONCURRENCY (int | None): Connections and tasks per worker above which
+            uvicorn answers 503, None for no limit
+        ADMISSION_MAX_CONCURRENCY (int | None): Requests a worker serves at the same time before
+            queueing the others, None disables admission control
+        ADMISSION_QUEUE_SIZE (int): Requests waiting for admission before new ones get a 503
+        ADMISSION_QUEUE_TIMEOUT_SECONDS (float): How long a request waits for admission before it gets a 503
+        ADMISSION_RETRY_AFTER_SECONDS (int): `Retry-After` of the 503 responses of shed requests
+        RATE_LIMITS (str | None): Token bucket of every limited route group as `group=rate/burst` pairs,
+            e.g. `tasks_read=5/20,auth=0.5/5` (see app.ratelimit), None disables rate limiting
+        RATE_LIMIT_EVICTION_INTERVAL_SECONDS (float): How often refilled token buckets are dropped
+        TASK_READ_COALESCING (bool): Whether concurrent reads of the same user's tasks share one
+            query and one encoded response
+        TASK_GROUP_COMMIT (bool): Whether concurrent task creations, updates and deletions are
+            committed together in shared transactions
+        TASK_GROUP_COMMIT_WINDOW_MS (float): Milliseconds task writes are collected before their batch
+            is committed
+        TASK_GROUP_COMMIT_MAX_BATCH (int): Task writes per batch at most
     """
     DATABASE_URL = os.getenv("DATABASE_URL")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 
-config = Config
\ No newline at end of file
+    PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS")) if os.getenv("PASSWORD_HASH_TARGET_MS") else None
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    REVOCATION_FILTER_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+    REVOCATION_SYNC_INTERVAL_SECONDS = float(os.getenv("REVOCATION_SYNC_INTERVAL_SECONDS", "60"))
+
+    USERS_PAGE_MAX_SIZE = int(os.getenv("USERS_PAGE_MAX_SIZE", "1000"))
+    USERS_EXPORT_BATCH_SIZE = int(os.getenv("USERS_EXPORT_BATCH_SIZE", "1000"))
+    USERS_BULK_MAX_SIZE = int(os.getenv("USERS_BULK_MAX_SIZE", "10000"))
+    USERS_BULK_BATCH_SIZE = int(os.getenv("USERS_BULK_BATCH_SIZE", "500"))
+
+    SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET")) if os.getenv("SQL_QUERY_BUDGET") else None
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS")) if os.getenv("SLOW_QUERY_THRESHOLD_MS") else None
+    SLOW_QUERY_LOG_PATH = os.getenv("SLOW_QUERY_LOG_PATH", "slow_queries.log")
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+
+    PROFILE_STORE_SIZE = int(os.getenv("PROFILE_STORE_SIZE", "20"))
+    SAMPLER_ENABLED = os.getenv("SAMPLER_ENABLED", "false").lower() in ("1", "true", "yes")
+    SAMPLER_INTERVAL_MS = float(os.getenv("SAMPLER_INTERVAL_MS", "10"))
+    SAMPLER_MAX_STACKS = int(os.getenv("SAMPLER_MAX_STACKS", "10000"))
+
+    LOOP_LAG_MONITOR_ENABLED = os.getenv("LOOP_LAG_MONITOR_ENABLED", "true").lower() in ("1", "true", "yes")
+    LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "50"))
+    LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+
+    TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "0"))
+    TRACING_EXPORT = os.getenv("TRACING_EXPORT", "traces.jsonl")
+    TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "users-and-tasks")
+
+    ACCESS_LOG_ENABLED = os.getenv("ACCESS_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+    ACCESS_LOG_PATH = os.getenv("ACCESS_LOG_PATH", "-")
+    ACCESS_LOG_QUEUE_SIZE = int(os.getenv("ACCESS_LOG_QUEUE_SIZE", "10000"))
+
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+    WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS")) if os.getenv("WARMUP_CONNECTIONS") else None
+    WARMUP_OPENAPI = os.getenv("WARMUP_OPENAPI", "false").lower() in ("1", "true", "yes")
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "10"))
+
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+    SERVER_LOOP = os.getenv("SERVER_LOOP", "auto")
+    SERVER_HTTP = os.getenv("SERVER_HTTP", "auto")
+    SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+    SERVER_LIMIT_CONCURRENCY = int(os.getenv("SERVER_LIMIT_CONCURRENCY")) if os.getenv("SERVER_LIMIT_CONCURRENCY") else None
+
+    ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY")) if os.getenv("ADMISSION_MAX_CONCURRENCY") else None
+    ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "100"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+    ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+    RATE_LIMITS = os.getenv("RATE_LIMITS") or None
+    RATE_LIMIT_EVICTION_INTERVAL_SECONDS = float(os.getenv("RATE_LIMIT_EVICTION_INTERVAL_SECONDS", "60"))
+
+    TASK_READ_COALESCING = os.getenv("TASK_READ_COALESCING", "true").lower() in ("1", "true", "yes")
+    TASK_GROUP_COMMIT = os.getenv("TASK_GROUP_COMMIT", "false").lower() in ("1", "true", "yes")
+    TASK_GROUP_COMMIT_WINDOW_MS = float(os.getenv("TASK_GROUP_COMMIT_WINDOW_MS", "2"))
+    TASK_GROUP_COMMIT_MAX_BATCH = int(os.getenv("TASK_GROUP_COMMIT_MAX_BATCH", "64"))
+
+config = Config
@@ -1,7 +1,11 @@
+import time
 from collections.abc import AsyncGenerator
+from contextvars import ContextVar
+from typing import Optional
 from .config import config
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.models.base_model import Base
 
@@ -9,7 +13,55 @@ from app.models.base_model import Base
 DATABASE_URL = config.DATABASE_URL
 
 
+class QueryStats:
+    """Statements executed on behalf of one request.
+
+    Attributes:
+        count (int): Number of statements executed.
+        duration (float): Time spent executing them, in seconds.
+    """
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+"""Statistics of the current request, set by the monitoring middleware."""
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if query_stats.get() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = query_stats.get()
+    started = conn.info.pop("query_started", None)
+    if stats is not None and started is not None:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Counts and times the statements an engine executes for the current request.
+
+    Statements are attributed through the `query_stats` context variable, which
+    SQLAlchemy's greenlets share with the awaiting task; statements executed
+    outside a request cost a context variable lookup only.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument. Instrumenting twice has no effect.
+    """
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
 engine = create_async_engine(DATABASE_URL)
+instrument_engine(engine)
 Base.metadata.bind = engine
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
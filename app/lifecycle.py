@@ -0,0 +1,189 @@
+"""Start-up warm-up and graceful shutdown.
+
+Without warm-up, the first requests served by a new worker pay for opening
+database connections, configuring the ORM mappers, compiling SQL and
+generating the OpenAPI document. `Warmup` does this work in the lifespan,
+before the worker is ready, by opening the pool connections and running the
+hot read paths of the repositories with ids matching no row (which fills
+SQLAlchemy's compiled statement cache). Rendering the OpenAPI schema also
+builds the lazily loaded routers, so it is opt-in (`WARMUP_OPENAPI`).
+
+On shutdown, `RequestGate` stops accepting requests (new ones get a 503 with
+`Connection: close`) and waits for the requests in flight to finish before
+the lifespan releases resources and disposes the engine.
+"""
+
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import config
+from .db import async_session_maker, engine
+from .models import Task, User
+from .repositories import TaskRepository, UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Prepares a worker before it serves requests.
+
+    Attributes:
+        engine (AsyncEngine): Engine whose pool is filled
+        session_maker (async_sessionmaker): Factory of the sessions requests use
+        connections (int | None): Connections opened, None for the size of the pool
+        render_openapi (bool): Whether the OpenAPI schema is rendered
+    """
+
+    def __init__(self,
+                 engine: AsyncEngine,
+                 session_maker: async_sessionmaker,
+                 connections=None,
+                 render_openapi: bool = False):
+        self.engine = engine
+        self.session_maker = session_maker
+        self.connections = connections
+        self.render_openapi = render_openapi
+
+    async def pool(self) -> int:
+        """
+        Opens pool connections concurrently and checks each with `SELECT 1`.
+
+        The connections opened are returned to the pool even if others failed.
+
+        Returns:
+            int: Connections opened
+
+        Raises:
+            SQLAlchemyError: If the database cannot be reached
+        """
+        count = self.connections
+        if count is None:
+            size = getattr(self.engine.pool, "size", None)
+            count = size() if callable(size) else 1
+        opened = await asyncio.gather(*(self.engine.connect() for _ in range(count)), return_exceptions=True)
+        connections = [connection for connection in opened if not isinstance(connection, BaseException)]
+        try:
+            for error in opened:
+                if isinstance(error, BaseException):
+                    raise error
+            await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in connections))
+        finally:
+            for connection in connections:
+                await connection.close()
+        return count
+
+    async def statements(self):
+        """Runs the hot read paths of the repositories so their SQL is compiled and cached."""
+        async with self.session_maker() as session:
+            tasks = TaskRepository(session, Task, User)
+            users = UserRepository(session, User)
+            await tasks.get_tasks(0)
+            await tasks.get_task_by_id(0, 0)
+            await tasks.get_specific_task_by_id(0)
+            await tasks._check_user_exists(0)
+            await tasks._check_task_exists(0)
+            await users.get(0)
+            await users.get_by_email("")
+            await users.get_page(1)
+            await session.rollback()
+
+    async def run(self, app: FastAPI) -> dict:
+        """
+        Runs every warm-up step.
+
+        Statement warm-up is best effort: a failure is logged and start-up goes on.
+
+        Args:
+            app (FastAPI): Application whose OpenAPI schema is rendered, if enabled
+
+        Returns:
+            dict: Duration of every step in milliseconds
+        """
+        durations = {}
+        started = time.perf_counter()
+        await self.pool()
+        durations["pool"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        try:
+            await self.statements()
+        except Exception:
+            logger.exception("Warming up repository statements failed")
+        durations["statements"] = (time.perf_counter() - started) * 1000
+        if self.render_openapi:
+            started = time.perf_counter()
+            app.openapi()
+            durations["openapi"] = (time.perf_counter() - started) * 1000
+        return durations
+
+
+warmup = Warmup(engine, async_session_maker, config.WARMUP_CONNECTIONS, config.WARMUP_OPENAPI)
+
+
+class RequestGate:
+    """
+    Counts requests in flight and turns new ones away once closed.
+
+    Attributes:
+        accepting (bool): Whether new requests are served
+        in_flight (int): Requests being served
+    """
+
+    def __init__(self):
+        self.accepting = True
+        self.in_flight = 0
+
+    def open(self):
+        self.accepting = True
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stops accepting requests and waits for those in flight.
+
+        Args:
+            timeout (float): Seconds to wait at most
+
+        Returns:
+            bool: True if every request finished in time
+        """
+        self.accepting = False
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        if self.in_flight:
+            logger.warning("Shutting down with %d requests still in flight", self.in_flight)
+        return not self.in_flight
+
+
+request_gate = RequestGate()
+
+
+class RequestGateMiddleware:
+    """Rejects requests arriving while the worker shuts down and tracks the others."""
+
+    def __init__(self, app: ASGIApp, gate: RequestGate = request_gate):
+        self.app = app
+        self.gate = gate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if not self.gate.accepting:
+            response = JSONResponse({"detail": "Server is shutting down"}, status_code=503,
+                                    headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        self.gate.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.gate.in_flight -= 1
@@ -1,51 +1,188 @@
-import uvicorn
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
+from .config import config
+
 # schemas import
 from app.schemas import UserCreate, UserRead, UserUpdate
 
 # auth
 from .auth.auth import auth_backend, fastapi_users
+from .auth.hashing import calibrate_password_hashing
+from .auth.tokens import revocation_store, token_cache
+
+# monitoring
+from .db import engine
+from .repositories import task_writer
+from .monitoring import (
+    AccessLogMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    configure_access_log,
+    configure_slow_query_log,
+    loop_lag_monitor,
+    register_group_commit_metrics,
+    register_pool_metrics,
+    stack_sampler,
+    register_token_cache_metrics,
+)
+
+# lifecycle, admission control, rate limiting and tracing
+from .admission import AdmissionMiddleware
+from .ratelimit import RateLimitMiddleware, rate_limiter
+from .lifecycle import RequestGateMiddleware, request_gate, warmup
+from .tracing import TracingMiddleware, trace_engine, tracer
 
 # routes
 from app.routes import (
     authenticated_router,
+    metrics_router,
+    profiling_router,
     tasks_router,
     users_router,
 )
+from app.routes.lazy import include_lazy_router, load_lazy_routers
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-app.include_router(
-    fastapi_users.get_auth_router(auth_backend), prefix="/auth/jwt", tags=["auth"]
-)
-app.include_router(
-    fastapi_users.get_register_router(UserRead, UserCreate),
-    prefix="/auth",
-    tags=["auth"],
-)
-app.include_router(
-    fastapi_users.get_reset_password_router(),
-    prefix="/auth",
-    tags=["auth"],
-)
-app.include_router(
-    fastapi_users.get_verify_router(UserRead),
-    prefix="/auth",
-    tags=["auth"],
-)
-app.include_router(
-    fastapi_users.get_users_router(UserRead, UserUpdate),
-    prefix="/users",
-    tags=["users"],
-)
-app.include_router(authenticated_router)
-app.include_router(tasks_router)
-app.include_router(
-    users_router,
-    prefix='',
-    tags=["users"]
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Prepares the application before serving and cleans up on shutdown.
+
+    Calibrates password hashing to the configured latency budget, loads revoked
+    tokens and keeps them pruned and in sync with other workers. Starts the
+    slow-query log if a threshold is configured, the access log, the stack
+    sampler and the event-loop lag monitor if enabled, the eviction of
+    refilled rate limit buckets if rate limits are configured, then warms up the
+    connection pool, the repository statements and the OpenAPI schema.
+
+    On shutdown, stops accepting requests and waits for those in flight, writes
+    the queued traces and access log entries and disposes the engine.
+    """
+    started = time.perf_counter()
+    if config.PASSWORD_HASH_TARGET_MS:
+        calibrate_password_hashing(config.PASSWORD_HASH_TARGET_MS)
+    slow_query_log = configure_slow_query_log(engine)
+    access_log = configure_access_log()
+    if config.SAMPLER_ENABLED:
+        stack_sampler.start()
+    await revocation_store.sync()
+    maintenance = asyncio.create_task(
+        revocation_store.run_maintenance(config.REVOCATION_SYNC_INTERVAL_SECONDS)
+    )
+    lag_monitor = asyncio.create_task(loop_lag_monitor.run()) if config.LOOP_LAG_MONITOR_ENABLED else None
+    eviction = None
+    if rate_limiter.limits:
+        eviction = asyncio.create_task(rate_limiter.run_eviction(config.RATE_LIMIT_EVICTION_INTERVAL_SECONDS))
+    if config.WARMUP_ENABLED:
+        durations = await warmup.run(app)
+        logger.info("Warm-up took %s", ", ".join(f"{step} {ms:.1f} ms" for step, ms in durations.items()))
+    request_gate.open()
+    logger.info("Started in %.1f ms", (time.perf_counter() - started) * 1000)
+    yield
+    await request_gate.drain(config.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    maintenance.cancel()
+    if eviction is not None:
+        eviction.cancel()
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+        with suppress(asyncio.CancelledError):
+            await lag_monitor
+    stack_sampler.stop()
+    tracer.exporter.shutdown()
+    if slow_query_log is not None:
+        slow_query_log.close()
+    if access_log is not None:
+        access_log.stop()
+    await engine.dispose()
+
+def create_app() -> FastAPI:
+    """
+    Builds the application with its middlewares and routes.
+
+    Serve it with `uvicorn app.main:app`, or `uvicorn --factory app.main:create_app`
+    to build a fresh application per worker.
+
+    Returns:
+        FastAPI: The application
+    """
+    app = FastAPI(lifespan=lifespan)
+
+    # Middlewares added last run first: metrics wrap the logged request, which
+    # the gate may turn away during shutdown, rate limiting when its client
+    # is over its limit and admission control under overload, then the
+    # traced, profiled request.
+    # The access log reads the query count metrics collect.
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(TracingMiddleware)
+    app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(RequestGateMiddleware)
+    app.add_middleware(AccessLogMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    trace_engine(engine)
+    register_pool_metrics(engine)
+    register_token_cache_metrics(token_cache)
+    register_group_commit_metrics(task_writer)
+
+    app.include_router(
+        fastapi_users.get_auth_router(auth_backend), prefix="/auth/jwt", tags=["auth"]
+    )
+    app.include_router(
+        fastapi_users.get_register_router(UserRead, UserCreate),
+        prefix="/auth",
+        tags=["auth"],
+    )
+    # Rarely used: built on their first request or when the OpenAPI schema is rendered.
+    include_lazy_router(
+        app,
+        fastapi_users.get_reset_password_router,
+        ["/forgot-password", "/reset-password"],
+        prefix="/auth",
+        tags=["auth"],
+    )
+    include_lazy_router(
+        app,
+        lambda: fastapi_users.get_verify_router(UserRead),
+        ["/request-verify-token", "/verify"],
+        prefix="/auth",
+        tags=["auth"],
+    )
+    # Registered before the fastapi-users router so that `/users/export`
+    # is not captured by its `/users/{id}` route.
+    app.include_router(
+        users_router,
+        prefix='',
+        tags=["users"]
+    )
+    app.include_router(
+        fastapi_users.get_users_router(UserRead, UserUpdate),
+        prefix="/users",
+        tags=["users"],
+    )
+    app.include_router(authenticated_router)
+    app.include_router(tasks_router)
+    app.include_router(metrics_router)
+    app.include_router(profiling_router)
+
+    render_openapi = app.openapi
+
+    def openapi():
+        load_lazy_routers(app)
+        return render_openapi()
+
+    # FastAPI keeps the rendered schema; it is built on the first request for it.
+    app.openapi = openapi
+    return app
+
+app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", log_level="info")
\ No newline at end of file
+    from .serve import main
+
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""Single-flight coalescing of identical concurrent reads.
+
+When many requests ask for the same data at the same moment (clients of one
+user polling at the top of the minute), each of them would run the same
+query and build the same response. `SingleFlight.do` runs the call of the
+first request for a key (the leader) and makes the requests arriving for
+that key while it runs (the followers) wait for its result instead of
+running their own. Nothing is cached: the key is forgotten as soon as the
+call completes, so a request arriving afterwards runs a fresh call.
+
+Followers share the leader's result object, which must not be modified, and
+its exception, if it raised. If the leader is cancelled (its client went
+away), its followers run the call again themselves. Writes call `forget`
+once committed, so a read that starts after a write never joins a call that
+may have read the data from before it.
+
+Leaders and followers are counted per operation in
+`coalesced_calls_total`, and `coalescing_ratio` is the fraction of calls
+answered by another request's call.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from ..monitoring.metrics import Counter, Gauge, registry
+
+coalesced_calls_total = registry.register(Counter(
+    "coalesced_calls_total", "Calls of coalesced reads, by whether they ran (leader) or shared the result (follower)",
+    ("operation", "role")))
+
+
+def coalescing_ratios() -> dict:
+    ratios = {}
+    for (operation, role), count in coalesced_calls_total.values.items():
+        if role == "follower":
+            leaders = coalesced_calls_total.values.get((operation, "leader"), 0)
+            ratios[(operation,)] = count / (count + leaders)
+    return ratios
+
+
+registry.register(Gauge("coalescing_ratio", "Fraction of coalesced read calls answered by another request's call",
+                        ("operation",), function=coalescing_ratios))
+
+_RETRY = object()
+"""Result of a call whose leader was cancelled: its followers run it again."""
+
+
+class SingleFlight:
+    """
+    Shares the result of a call among the concurrent callers with the same key.
+
+    Attributes:
+        operation (str): Name of the coalesced operation in the metrics
+        enabled (bool): Whether calls are coalesced; otherwise every caller runs its own
+        calls (dict[Hashable, asyncio.Future]): Result of the call in flight, by key
+    """
+
+    def __init__(self, operation: str, enabled: bool = True):
+        self.operation = operation
+        self.enabled = enabled
+        self.calls = {}
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs a call, or waits for the call in flight with the same key.
+
+        Args:
+            key (Hashable): Identity of the call, e.g. the user and parameters of a read
+            function (Callable[[], Awaitable]): Runs the call
+
+        Returns:
+            Any: Result of the call, shared with the other callers
+
+        Raises:
+            Exception: Whatever the call raised
+        """
+        if not self.enabled:
+            return await function()
+        while (future := self.calls.get(key)) is not None:
+            # Shielded: a follower going away must not cancel the leader's call.
+            try:
+                result = await asyncio.shield(future)
+            except Exception:
+                coalesced_calls_total.inc(self.operation, "follower")
+                raise
+            if result is not _RETRY:
+                coalesced_calls_total.inc(self.operation, "follower")
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self.calls[key] = future
+        coalesced_calls_total.inc(self.operation, "leader")
+        try:
+            result = await function()
+        except Exception as error:
+            future.set_exception(error)
+            # Marks the exception as retrieved when no follower waits for it.
+            future.exception()
+            raise
+        except BaseException:
+            future.set_result(_RETRY)
+            raise
+        finally:
+            if self.calls.get(key) is future:
+                del self.calls[key]
+        future.set_result(result)
+        return result
+
+    def forget(self, key: Hashable):
+        """
+        Makes later callers run a new call instead of joining the one in flight.
+
+        Args:
+            key (Hashable): Identity of the call
+        """
+        self.calls.pop(key, None)
@@ -1,15 +1,39 @@
 from app.repositories import TaskRepository
 from app.repositories import get_task_repository
 from fastapi import Depends, HTTPException
+from pydantic import TypeAdapter
+from app.config import config
 from app.schemas.tasks import TaskCreate, TaskUpdate, TaskRead
 from app.errors.user_errors import UserNotFoundError
+from app.managers.coalescing import SingleFlight
+from app.tracing import trace_methods
 
+task_list_adapter = TypeAdapter(list[TaskRead])
+
+# Concurrent identical reads of a user's tasks share one query and one encoded response.
+user_tasks_reads = SingleFlight("get_tasks", config.TASK_READ_COALESCING)
+user_tasks_json_reads = SingleFlight("get_tasks_json", config.TASK_READ_COALESCING)
+
+
+def forget_user_tasks_reads(user_id):
+    """
+    Makes reads of a user's tasks starting after a write run a new query.
+
+    Args:
+        user_id (int): Owner of the written task
+    """
+    user_tasks_reads.forget(user_id)
+    user_tasks_json_reads.forget(user_id)
+
+
+@trace_methods
 class TaskManager:
     """
     Manager class for handling task-related operations.
     
     This class provides methods for creating, retrieving, updating, and deleting tasks,
-    with support for both user-specific and general task operations.
+    with support for both user-specific and general task operations. Concurrent reads
+    of the same user's tasks are coalesced (see app.managers.coalescing).
 
     Attributes:
         task_db (TaskRepository): Repository instance for task database operations
@@ -39,6 +63,8 @@ class TaskManager:
         """
         try:
             result = await self.task_db.create_task(task_data)
+            if result:
+                forget_user_tasks_reads(result.user_id)
             return TaskRead(**result.__dict__) if result else None
         except UserNotFoundError:
             raise HTTPException(status_code=404, detail=f"User id: {task_data.user_id} not found")
@@ -51,10 +77,29 @@ class TaskManager:
             user_id (int): ID of the user whose tasks to retrieve
 
         Returns:
-            List[TaskRead]: List of tasks belonging to the user
+            List[TaskRead]: List of tasks belonging to the user, shared with concurrent
+                callers and not to be modified
         """
-        results = await self.task_db.get_tasks(user_id)
-        return [TaskRead(**task.__dict__) for task in results] if results else []
+        async def read():
+            results = await self.task_db.get_tasks(user_id)
+            return [TaskRead(**task.__dict__) for task in results] if results else []
+
+        return await user_tasks_reads.do(user_id, read)
+
+    async def get_tasks_json(self, user_id: int) -> bytes:
+        """
+        Retrieve all tasks for a specific user, encoded as a JSON array.
+
+        Args:
+            user_id (int): ID of the user whose tasks to retrieve
+
+        Returns:
+            bytes: JSON array of the tasks, shared with concurrent callers
+        """
+        async def encode():
+            return task_list_adapter.dump_json(await self.get_tasks(user_id))
+
+        return await user_tasks_json_reads.do(user_id, encode)
 
     async def get_all_tasks(self):
         """
@@ -106,6 +151,8 @@ class TaskManager:
             TaskRead: Updated task data
         """
         result = await self.task_db.update_task(task_id, task_data, user_id)
+        if result:
+            forget_user_tasks_reads(result.user_id)
         return TaskRead(**result.__dict__) if result else None
 
     async def update_specific_task(self, task_id: int, task_data: TaskUpdate):
@@ -120,6 +167,8 @@ class TaskManager:
             TaskRead: Updated task data
         """
         result = await self.task_db.update_specific_task(task_id, task_data)
+        if result:
+            forget_user_tasks_reads(result.user_id)
         return TaskRead(**result.__dict__) if result else None
 
     async def delete_task(self, task_id: int, user_id: int):
@@ -134,6 +183,8 @@ class TaskManager:
             TaskRead: Deleted task data
         """
         result = await self.task_db.delete_task(task_id, user_id)
+        if result:
+            forget_user_tasks_reads(result.user_id)
         return TaskRead(**result.__dict__) if result else None
 
     async def delete_specific_task(self, task_id: int):
@@ -147,6 +198,8 @@ class TaskManager:
             TaskRead: Deleted task data
         """
         result = await self.task_db.delete_specific_task(task_id)
+        if result:
+            forget_user_tasks_reads(result.user_id)
         return TaskRead(**result.__dict__) if result else None
 
 
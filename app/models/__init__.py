@@ -1,7 +1,9 @@
 from app.models.user_model import User
 from app.models.task_model import Task
+from app.models.revoked_token_model import RevokedToken
 
 __all__ = [
     'User',
-    'Task'
-]
\ No newline at end of file
+    'Task',
+    'RevokedToken'
+]
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer
+from app.models.base_model import Base
+
+class RevokedToken(Base):
+    """Revoked access token, identified by its `jti` claim."""
+
+    __tablename__ = 'revoked_tokens'
+
+    jti = Column(String(64), primary_key=True)
+    """Unique identifier of the revoked token (`jti` claim)."""
+
+    expires_at = Column(Integer, nullable=True, index=True)
+    """Expiry of the token as a UNIX timestamp. The row can be pruned afterwards."""
@@ -1,6 +1,6 @@
 from fastapi_users.db import SQLAlchemyBaseUserTable
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, Index
 from app.models.base_model import Base
 
 class User(SQLAlchemyBaseUserTable, Base):
@@ -9,6 +9,11 @@ class User(SQLAlchemyBaseUserTable, Base):
     Inherits from SQLAlchemyBaseUserTable to include default fields required by FastAPI Users.
     """
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_is_active_is_superuser_id', 'is_active', 'is_superuser', 'id'),
+        Index('ix_users_is_superuser_id', 'is_superuser', 'id'),
+    )
+    """Indexes serving the filtered, id-ordered admin user listing."""
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     """Primary key for the user, auto-incremented."""
@@ -0,0 +1,48 @@
+"""
+Application monitoring.
+
+- metrics: Prometheus counters, gauges and histograms and their registry.
+- middleware: per-route request count, in-flight and latency metrics.
+- collectors: gauges over the connection pool, the token cache and the group-commit writer.
+- slow_queries: rotating JSON log of slow statements with their query plan.
+- profiling: cProfile of single requests flagged by a superuser.
+- sampler: continuous collapsed-stack sampling of the event loop thread.
+- loop_lag: event-loop lag histogram and capture of the code stalling the loop.
+- access_log: JSON access log written by a background thread.
+"""
+
+from app.monitoring.access_log import AccessLog, AccessLogMiddleware, access_log, configure_access_log
+from app.monitoring.collectors import (
+    register_group_commit_metrics,
+    register_pool_metrics,
+    register_token_cache_metrics,
+)
+from app.monitoring.metrics import Counter, Gauge, Histogram, Registry, registry
+from app.monitoring.loop_lag import LoopLagMonitor, loop_lag_monitor
+from app.monitoring.middleware import MetricsMiddleware
+from app.monitoring.profiling import ProfilingMiddleware, RequestProfiler, request_profiler
+from app.monitoring.sampler import StackSampler, stack_sampler
+from app.monitoring.slow_queries import SlowQueryLog, configure_slow_query_log
+
+__all__ = ["AccessLog",
+           "AccessLogMiddleware",
+           "access_log",
+           "configure_access_log",
+           "Counter",
+           "Gauge",
+           "Histogram",
+           "Registry",
+           "registry",
+           "LoopLagMonitor",
+           "loop_lag_monitor",
+           "MetricsMiddleware",
+           "ProfilingMiddleware",
+           "RequestProfiler",
+           "request_profiler",
+           "StackSampler",
+           "stack_sampler",
+           "SlowQueryLog",
+           "configure_slow_query_log",
+           "register_group_commit_metrics",
+           "register_pool_metrics",
+           "register_token_cache_metrics"]
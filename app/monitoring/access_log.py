@@ -0,0 +1,190 @@
+"""Structured access log written off the event loop.
+
+`AccessLogMiddleware` builds one entry per request: method, route template,
+raw path, status, latency, the id of the authenticated user (see
+`request_user` in app.auth.tokens) and the statements executed (read from the
+`query_stats` of the metrics middleware, so it must run inside it).
+
+The request only hands the entry to a `QueueHandler` over a bounded queue.
+A `QueueListener` thread encodes it as JSON and writes it to stdout or a
+file. When the writer falls behind and the queue is full, entries are
+dropped and counted in `access_log_dropped_total` instead of blocking the
+request.
+"""
+
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..auth.tokens import RequestUser, request_user
+from ..config import config
+from ..db import query_stats
+from .metrics import Counter, registry
+from .middleware import route_template
+
+access_log_dropped_total = registry.register(Counter(
+    "access_log_dropped_total", "Access log entries dropped because the write queue was full"))
+
+
+class JsonFormatter(logging.Formatter):
+    """Encodes records whose message is a dict as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            return json.dumps(record.msg, separators=(",", ":"))
+        return super().format(record)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that drops records when the queue is full.
+
+    Records are enqueued as they are: formatting is left to the listener thread.
+
+    Attributes:
+        dropped (int): Records dropped
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            access_log_dropped_total.inc()
+
+
+class BlockingStopQueueListener(QueueListener):
+    """Queue listener whose stop waits for room in a full queue instead of failing."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class AccessLog:
+    """
+    Bounded, non-blocking access log.
+
+    Attributes:
+        handler (DroppingQueueHandler): Handler the entries are passed to
+        listener (QueueListener | None): Thread writing the entries, None while stopped
+    """
+
+    def __init__(self, queue_size: int = 10_000):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.listener = None
+
+    @property
+    def running(self) -> bool:
+        return self.listener is not None
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def start(self, handler: logging.Handler):
+        """
+        Starts writing entries to a handler from a background thread.
+
+        Args:
+            handler (logging.Handler): Destination of the entries; a `JsonFormatter` is set on it
+        """
+        if self.running:
+            return
+        handler.setFormatter(JsonFormatter())
+        self.listener = BlockingStopQueueListener(self.queue, handler)
+        self.listener.start()
+
+    def stop(self):
+        """Writes the queued entries, stops the thread and closes the handler."""
+        if not self.running:
+            return
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.listener = None
+
+    def log(self, entry: dict):
+        """
+        Queues one entry, never blocking.
+
+        Args:
+            entry (dict): JSON-serializable entry
+        """
+        self.handler.handle(logging.makeLogRecord({"msg": entry, "levelno": logging.INFO, "levelname": "INFO"}))
+
+
+access_log = AccessLog(config.ACCESS_LOG_QUEUE_SIZE)
+
+
+def configure_access_log() -> Optional[AccessLog]:
+    """
+    Starts the access log if `ACCESS_LOG_ENABLED` is set.
+
+    Entries go to stdout when `ACCESS_LOG_PATH` is `-`, otherwise they are
+    appended to that file, reopened if an external tool rotates it.
+
+    Returns:
+        AccessLog | None: The started log, None if disabled
+    """
+    if not config.ACCESS_LOG_ENABLED:
+        return None
+    if config.ACCESS_LOG_PATH == "-":
+        handler = logging.StreamHandler(sys.stdout)
+    else:
+        handler = WatchedFileHandler(config.ACCESS_LOG_PATH)
+    access_log.start(handler)
+    return access_log
+
+
+class AccessLogMiddleware:
+    """Hands one structured entry per request to the access log."""
+
+    def __init__(self, app: ASGIApp, log: AccessLog = access_log):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.log.running:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        user = RequestUser()
+        user_token = request_user.set(user)
+        timestamp = time.time()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_user.reset(user_token)
+            stats = query_stats.get()
+            self.log.log({"timestamp": timestamp,
+                          "method": scope["method"],
+                          "route": route_template(scope),
+                          "path": scope["path"],
+                          "status": status,
+                          "duration_ms": round(elapsed * 1000, 3),
+                          "user_id": user.id,
+                          "queries": stats.count if stats is not None else None})
@@ -0,0 +1,58 @@
+"""Gauges exposing the state of the connection pool, in-memory caches and the group-commit writer."""
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .metrics import Gauge, Registry, registry as default_registry
+
+
+def register_pool_metrics(engine: AsyncEngine, registry: Registry = default_registry):
+    """
+    Exposes the size and usage of an engine's connection pool.
+
+    Pools without these statistics (e.g. the static pool of in-memory SQLite)
+    report nothing.
+
+    Args:
+        engine (AsyncEngine): Engine whose pool is exposed
+        registry (Registry): Registry to add the gauges to
+    """
+    pool = engine.pool
+
+    def read(attribute: str):
+        return lambda: {(): getattr(pool, attribute)()} if hasattr(pool, attribute) else {}
+
+    registry.register(Gauge("db_pool_size", "Configured size of the connection pool", function=read("size")))
+    registry.register(Gauge("db_pool_checked_out", "Connections currently in use", function=read("checkedout")))
+    registry.register(Gauge("db_pool_checked_in", "Idle connections in the pool", function=read("checkedin")))
+    registry.register(Gauge("db_pool_overflow", "Connections opened beyond the pool size", function=read("overflow")))
+
+
+def register_token_cache_metrics(cache, registry: Registry = default_registry):
+    """
+    Exposes the size and hit counts of the verified-token cache.
+
+    Args:
+        cache (TokenCache): The cache
+        registry (Registry): Registry to add the gauges to
+    """
+    registry.register(Gauge("token_cache_entries", "Verified tokens in the cache", function=lambda: len(cache)))
+    registry.register(Gauge("token_cache_hits", "Token lookups answered from the cache", function=lambda: cache.hits))
+    registry.register(Gauge("token_cache_misses", "Token lookups that required verification",
+                            function=lambda: cache.misses))
+
+
+def register_group_commit_metrics(writer, registry: Registry = default_registry):
+    """
+    Exposes the batches committed by a group-commit writer.
+
+    The average batch size is `task_write_operations / task_write_batches`.
+
+    Args:
+        writer (GroupCommitWriter): The writer
+        registry (Registry): Registry to add the gauges to
+    """
+    registry.register(Gauge("task_write_batches", "Batches of task writes committed", function=lambda: writer.batches))
+    registry.register(Gauge("task_write_operations", "Task writes committed in batches",
+                            function=lambda: writer.operations))
+    registry.register(Gauge("task_write_pending", "Task writes waiting for the next batch",
+                            function=lambda: len(writer.pending)))
@@ -0,0 +1,118 @@
+"""Event-loop lag monitor.
+
+A task sleeps for `LOOP_LAG_INTERVAL_MS` in a loop and records how late it
+wakes up in the `event_loop_lag_seconds` histogram. Lag means something ran
+on the event loop without yielding: CPU-bound work, a synchronous library
+call, a large validation.
+
+The blocking code can only be seen while it runs, so a watchdog thread
+checks when the task last woke up. Once the loop has been stuck longer than
+`LOOP_LAG_THRESHOLD_MS`, it captures the stack of the event loop thread and
+the route of the request it is running, which the loop thread keeps in
+`running_request`. When the loop recovers, the
+stall is logged with its duration, counted per route and kept for
+`/admin/stalls`.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional
+
+from ..config import config
+from .metrics import Counter, Histogram, registry
+from .middleware import route_template, running_request
+
+logger = logging.getLogger(__name__)
+
+loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds", "Delay of the event loop in running a scheduled callback",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)))
+loop_stalls_total = registry.register(Counter(
+    "event_loop_stalls_total", "Event loop stalls longer than the threshold", ("route",)))
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag and captures the code causing stalls.
+
+    Attributes:
+        interval (float): Seconds between two measurements
+        threshold (float): Lag in seconds above which a stall is reported
+        stalls (deque[dict]): Latest stalls, oldest first
+    """
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1, max_stalls: int = 50, max_depth: int = 30):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_depth = max_depth
+        self.stalls = deque(maxlen=max_stalls)
+        self.heartbeat = None
+        self.pending = None
+        self.lock = threading.Lock()
+        self.thread_id = None
+        self.stopped = threading.Event()
+
+    async def run(self):
+        """Measures lag until cancelled, with the watchdog running alongside."""
+        self.thread_id = threading.get_ident()
+        self.heartbeat = time.perf_counter()
+        self.stopped.clear()
+        watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                expected = time.perf_counter() + self.interval
+                await asyncio.sleep(self.interval)
+                now = time.perf_counter()
+                self.heartbeat = now
+                lag = max(0.0, now - expected)
+                loop_lag.observe(lag)
+                if lag >= self.threshold:
+                    self._report(lag)
+        finally:
+            self.stopped.set()
+            watchdog.join()
+
+    def capture(self) -> dict:
+        """
+        Captures what the event loop thread is doing.
+
+        Called from the watchdog thread while the loop is blocked.
+
+        Returns:
+            dict: Method and route of the running request (None outside requests) and the stack
+        """
+        frame = sys._current_frames().get(self.thread_id)
+        stack = traceback.format_stack(frame, limit=self.max_depth) if frame is not None else []
+        scope = running_request.scope
+        return {"timestamp": time.time(),
+                "method": scope["method"] if scope else None,
+                "route": route_template(scope) if scope else None,
+                "stack": "".join(stack)}
+
+    def _watch(self):
+        while not self.stopped.wait(self.threshold / 4):
+            blocked = time.perf_counter() - self.heartbeat - self.interval
+            if blocked >= self.threshold:
+                with self.lock:
+                    if self.pending is None:
+                        self.pending = self.capture()
+
+    def _report(self, lag: float):
+        with self.lock:
+            stall, self.pending = self.pending, None
+        if stall is None:
+            stall = {"timestamp": time.time(), "method": None, "route": None, "stack": ""}
+        stall["duration_ms"] = round(lag * 1000, 3)
+        self.stalls.append(stall)
+        loop_stalls_total.inc(stall["route"] or "none")
+        logger.warning("Event loop blocked for %.0f ms during %s %s\n%s",
+                       lag * 1000, stall["method"] or "-", stall["route"] or "-", stall["stack"])
+
+
+loop_lag_monitor = LoopLagMonitor(config.LOOP_LAG_INTERVAL_MS / 1000, config.LOOP_LAG_THRESHOLD_MS / 1000)
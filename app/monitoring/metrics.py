@@ -0,0 +1,211 @@
+"""Minimal Prometheus metrics.
+
+Counters, gauges and histograms keep their values in plain dicts keyed by
+label-value tuples and are only formatted when scraped, so recording a sample
+costs a dict lookup and, for histograms, a bisect. Metrics are updated from
+the event loop thread only and need no locking.
+
+Gauges may be backed by a function evaluated at scrape time, which is how
+state owned by other components (connection pool, caches) is exposed without
+hooking into them.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    """
+    Formats a label set such as `{method="GET",status="200"}`.
+
+    Args:
+        names (tuple[str, ...]): Label names
+        values (tuple): Label values, in the order of the names
+        extra (str): Already formatted label appended last, e.g. `le="0.5"`
+
+    Returns:
+        str: The label set, empty if there are no labels
+    """
+    pairs = [f'{name}="{escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Base class of all metrics.
+
+    Attributes:
+        name (str): Metric name
+        documentation (str): Help text
+        label_names (tuple[str, ...]): Names of the labels
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """
+        Current samples of the metric.
+
+        Returns:
+            Iterable[tuple[str, str, float]]: Sample name suffix, formatted labels and value
+        """
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {escape(self.documentation)}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(f"{self.name}{suffix}{labels} {format_value(value)}" for suffix, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.values = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        """
+        Increments the counter.
+
+        Args:
+            *label_values: Values of the labels, in the order of `label_names`
+            amount (float): Increment, must not be negative
+        """
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        for label_values, value in self.values.items():
+            yield "", format_labels(self.label_names, label_values), value
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down, either set directly or read from a function.
+
+    The function, if given, is called at scrape time and returns either a
+    single value or a dict of label-value tuples to values.
+    """
+
+    type = "gauge"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 label_names: Iterable[str] = (),
+                 function: Optional[Callable[[], float | dict]] = None):
+        super().__init__(name, documentation, label_names)
+        self.values = {}
+        self.function = function
+
+    def set(self, value: float, *label_values):
+        self.values[label_values] = value
+
+    def inc(self, *label_values, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) - amount
+
+    def samples(self):
+        values = self.values
+        if self.function is not None:
+            result = self.function()
+            values = result if isinstance(result, dict) else {(): result}
+        for label_values, value in values.items():
+            yield "", format_labels(self.label_names, label_values), value
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 label_names: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        self.values = {}
+
+    def observe(self, value: float, *label_values):
+        """
+        Records one observation.
+
+        Args:
+            value (float): Observed value
+            *label_values: Values of the labels, in the order of `label_names`
+        """
+        state = self.values.get(label_values)
+        if state is None:
+            # Per-bucket counts (last one is +Inf), sum, count
+            state = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self):
+        bounds = [format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for label_values, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                yield "_bucket", format_labels(self.label_names, label_values, f'le="{bound}"'), cumulative
+            labels = format_labels(self.label_names, label_values)
+            yield "_sum", labels, total
+            yield "_count", labels, count
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Adds a metric, replacing any metric of the same name.
+
+        Args:
+            metric (Metric): The metric
+
+        Returns:
+            Metric: The same metric
+        """
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Renders all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition
+        """
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+registry = Registry()
@@ -0,0 +1,143 @@
+"""ASGI middleware recording HTTP request metrics.
+
+Requests are labeled by route template (`/tasks/{task_id}`) rather than raw
+path, so the number of label sets stays bounded. The template is read from
+the `route` entry FastAPI's router stores in the request scope once it has
+matched; requests that match no route are labeled `unmatched`.
+
+The statements each request executes are counted and timed through the
+`query_stats` context variable of app.db. They are reported to the client in
+a `Server-Timing` header, recorded per route, and logged when a request
+exceeds `SQL_QUERY_BUDGET`.
+
+The event loop thread stores the scope of a request in `running_request`
+while it runs a step of that request, so monitors running on other threads
+(see loop_lag) can tell which route the loop is busy with without reading
+asyncio's state.
+"""
+
+import logging
+import time
+import types
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import config
+from ..db import QueryStats, query_stats
+from .metrics import Counter, Gauge, Histogram, registry
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RunningRequest:
+    """
+    Request whose code the event loop is running.
+
+    Attributes:
+        scope (Scope | None): Scope of the request, None between steps of requests
+    """
+
+    __slots__ = ("scope",)
+
+    def __init__(self):
+        self.scope = None
+
+
+running_request = RunningRequest()
+
+requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests served", ("method", "route", "status")))
+requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests being served"))
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to serve an HTTP request", ("method", "route", "status")))
+request_queries = registry.register(Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)))
+request_db_duration = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per HTTP request", ("method", "route")))
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+@types.coroutine
+def run_request(coroutine, scope: Scope):
+    """
+    Runs the coroutine of a request, exposing its scope in `running_request` during each step.
+
+    Args:
+        coroutine (Coroutine): Serves the request
+        scope (Scope): ASGI scope of the request
+
+    Returns:
+        Any: Result of the coroutine
+    """
+    steps = coroutine.__await__()
+    value, error = None, None
+    while True:
+        running_request.scope = scope
+        try:
+            future = steps.send(value) if error is None else steps.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            running_request.scope = None
+        try:
+            value, error = (yield future), None
+        except BaseException as raised:
+            value, error = None, raised
+
+
+def server_timing(stats: QueryStats) -> str:
+    return f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'
+
+
+class MetricsMiddleware:
+    """
+    Counts requests, tracks in-flight requests and records their latency and SQL usage.
+
+    Implemented as a plain ASGI middleware rather than `BaseHTTPMiddleware`,
+    so bodies are not buffered and no extra task is spawned per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = QueryStats()
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(stats))
+            await send(message)
+
+        requests_in_progress.inc()
+        stats_token = query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await run_request(self.app(scope, receive, send_wrapper), scope)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_stats.reset(stats_token)
+            requests_in_progress.dec()
+            method, route = scope["method"], route_template(scope)
+            requests_total.inc(method, route, status)
+            request_duration.observe(elapsed, method, route, status)
+            request_queries.observe(stats.count, method, route)
+            request_db_duration.observe(stats.duration, method, route)
+            if config.SQL_QUERY_BUDGET is not None and stats.count > config.SQL_QUERY_BUDGET:
+                logger.warning("%s %s executed %d SQL statements (budget %d) in %.1f ms",
+                               method, route, stats.count, config.SQL_QUERY_BUDGET, stats.duration * 1000)
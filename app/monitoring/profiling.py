@@ -0,0 +1,187 @@
+"""On-demand profiling of single requests.
+
+A superuser adds the `X-Profile: 1` header or the `profile=1` query parameter
+to a request; that request is run under cProfile and the profile is stored
+under the request id, returned in the `X-Profile-Id` response header, and
+served by the admin endpoints in app.routes.profiling.
+
+Requests without the flag only pay for a scan of the query string and the
+header names. Flagged requests from other users are served normally. One
+request is profiled at a time; cProfile records everything running on the
+event loop thread meanwhile, so profiles are cleanest on a quiet worker.
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..auth.auth import get_jwt_strategy
+from ..config import config
+from ..db import async_session_maker
+from ..models import User
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = b"profile="
+
+
+class RequestProfile(NamedTuple):
+    """Profile of one request."""
+
+    id: str
+    """Request id, taken from `X-Request-ID` or generated."""
+    method: str
+    """HTTP method."""
+    path: str
+    """Raw request path."""
+    status: int
+    """Response status code."""
+    duration_ms: float
+    """Time to serve the request under the profiler."""
+    created_at: float
+    """UNIX timestamp of the request."""
+    profile: cProfile.Profile
+    """The profiler, disabled."""
+
+    def summary(self) -> dict:
+        return {"id": self.id, "method": self.method, "path": self.path, "status": self.status,
+                "duration_ms": round(self.duration_ms, 3), "created_at": self.created_at}
+
+    def report(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """
+        Renders the profile as a pstats text report.
+
+        Args:
+            sort (str): pstats sort key, e.g. `cumulative`, `tottime` or `ncalls`
+            limit (int): Number of functions listed
+
+        Returns:
+            str: The report
+        """
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump(self) -> bytes:
+        """
+        Serializes the profile in the format of `pstats.Stats.dump_stats`.
+
+        Returns:
+            bytes: Content loadable by `pstats.Stats(path)`, snakeviz, etc.
+        """
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and keeps the latest profiles.
+
+    Attributes:
+        session_maker (async_sessionmaker): Factory of sessions used to load the requesting user
+        max_profiles (int): Number of profiles kept, the oldest are dropped first
+        profiles (OrderedDict[str, RequestProfile]): Stored profiles, oldest first
+        active (bool): Whether a request is being profiled
+    """
+
+    def __init__(self, session_maker=async_session_maker, max_profiles: int = 20):
+        self.session_maker = session_maker
+        self.max_profiles = max_profiles
+        self.profiles = OrderedDict()
+        self.active = False
+
+    @staticmethod
+    def is_requested(scope: Scope) -> bool:
+        """
+        Checks for the profiling flag without parsing the request.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+
+        Returns:
+            bool: True if the header or query parameter is present and not `0`
+        """
+        if PROFILE_QUERY in scope["query_string"]:
+            value = QueryParams(scope["query_string"]).get("profile")
+            if value is not None and value not in ("", "0"):
+                return True
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return value not in (b"", b"0")
+        return False
+
+    async def is_superuser(self, scope: Scope) -> bool:
+        """
+        Checks that the request carries the access token of an active superuser.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+
+        Returns:
+            bool: True if the request may be profiled
+        """
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        entry = get_jwt_strategy().verify_token(token)
+        if entry is None:
+            return False
+        async with self.session_maker() as session:
+            user = await session.get(User, int(entry.user_id))
+        return user is not None and user.is_active and user.is_superuser
+
+    def store(self, profile: RequestProfile):
+        self.profiles[profile.id] = profile
+        while len(self.profiles) > self.max_profiles:
+            self.profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return self.profiles.get(profile_id)
+
+
+request_profiler = RequestProfiler(max_profiles=config.PROFILE_STORE_SIZE)
+
+
+class ProfilingMiddleware:
+    """Runs flagged requests of superusers under cProfile."""
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler = request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # `active` is checked after the await so two requests cannot both start profiling
+        if scope["type"] != "http" or not self.profiler.is_requested(scope) \
+                or not await self.profiler.is_superuser(scope) or self.profiler.active:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = Headers(scope=scope).get("x-request-id") or uuid.uuid4().hex
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        profile = cProfile.Profile()
+        self.profiler.active = True
+        created_at = time.time()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.disable()
+            self.profiler.active = False
+            self.profiler.store(RequestProfile(profile_id, scope["method"], scope["path"], status,
+                                               (time.perf_counter() - started) * 1000, created_at, profile))
@@ -0,0 +1,119 @@
+"""Continuous sampling profiler of the event loop thread.
+
+A daemon thread wakes up every `SAMPLER_INTERVAL_MS`, reads the current
+stack of the event loop thread from `sys._current_frames` and counts it in
+collapsed form (`module:function;module:function ...`, root first), the
+input format of flamegraph.pl, speedscope and similar tools.
+
+The event loop is never interrupted, so the cost on requests is limited to
+the GIL hand-offs of the sampler thread. Memory is bounded by
+`SAMPLER_MAX_STACKS` distinct stacks; further new stacks are counted under
+a single `[other]` entry. Time the loop spends waiting for I/O shows up
+under the selector's `select` frame.
+"""
+
+import sys
+import threading
+from typing import Optional
+
+from ..config import config
+
+OTHER_STACK = "[other]"
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread and aggregates collapsed-stack counts.
+
+    Attributes:
+        interval (float): Seconds between samples
+        max_stacks (int): Distinct stacks kept
+        max_depth (int): Frames kept per stack, the innermost ones
+        samples (int): Samples taken since the last reset
+    """
+
+    def __init__(self, interval: float = 0.01, max_stacks: int = 10_000, max_depth: int = 128):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.samples = 0
+        self.counts = {}
+        self.labels = {}
+        self.lock = threading.Lock()
+        self.thread_id = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None
+
+    def start(self, thread_id: Optional[int] = None):
+        """
+        Starts sampling a thread.
+
+        Args:
+            thread_id (int | None): Thread to sample, defaults to the calling thread
+                (the event loop thread when called from the lifespan)
+        """
+        if self.running:
+            return
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops sampling; the counts are kept."""
+        if not self.running:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+
+    def reset(self):
+        """Drops the counts."""
+        with self.lock:
+            self.counts = {}
+            self.samples = 0
+
+    def label(self, frame) -> str:
+        code = frame.f_code
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = f"{frame.f_globals.get('__name__', '?')}:{code.co_name}"
+        return label
+
+    def sample(self):
+        """Records the current stack of the sampled thread."""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(self.label(frame))
+            frame = frame.f_back
+        stack = ";".join(reversed(labels))
+        with self.lock:
+            if stack not in self.counts and len(self.counts) >= self.max_stacks:
+                stack = OTHER_STACK
+            self.counts[stack] = self.counts.get(stack, 0) + 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        Renders the counts in collapsed-stack format, most frequent first.
+
+        Returns:
+            str: One `stack count` line per distinct stack
+        """
+        with self.lock:
+            counts = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in counts)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+
+stack_sampler = StackSampler(config.SAMPLER_INTERVAL_MS / 1000, config.SAMPLER_MAX_STACKS)
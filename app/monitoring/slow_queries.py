@@ -0,0 +1,213 @@
+"""Slow-query log.
+
+Statements slower than `SLOW_QUERY_THRESHOLD_MS` are written as JSON lines
+to a rotating log file together with the shape of their parameters (types
+and lengths, never values) and, on SQLite, the `EXPLAIN QUERY PLAN` output.
+
+The plan is captured out of band: the request thread only enqueues the
+statement, and a background thread explains it over its own read-only
+sqlite3 connection before writing the entry. When the queue is full, entries
+are dropped and counted rather than slowing requests down.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import config
+from .metrics import Counter, registry
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+slow_queries_total = registry.register(Counter(
+    "db_slow_queries_total", "SQL statements slower than the slow-query threshold", ("logged",)))
+
+
+def parameter_shape(parameters, executemany: bool):
+    """
+    Describes bound parameters without their values.
+
+    Args:
+        parameters (tuple | dict | list): Parameters as passed to the driver
+        executemany (bool): Whether `parameters` is a list of parameter sets
+
+    Returns:
+        list | dict: Type (and length of strings and bytes) of every parameter; for
+            executemany, the number of rows and the shape of the first one
+    """
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "first": parameter_shape(rows[0], False) if rows else None}
+
+    def shape(value):
+        if isinstance(value, (str, bytes)):
+            return f"{type(value).__name__}({len(value)})"
+        return type(value).__name__
+
+    if isinstance(parameters, dict):
+        return {name: shape(value) for name, value in parameters.items()}
+    return [shape(value) for value in parameters or ()]
+
+
+class SlowQueryLog:
+    """
+    Times the statements of an engine and logs the slow ones with their plan.
+
+    Attributes:
+        threshold (float): Duration in seconds above which a statement is logged
+        database (str | None): Path of the SQLite database to explain statements against,
+            None if plans are not captured
+        dropped (int): Entries dropped because the queue was full
+    """
+
+    def __init__(self,
+                 threshold_ms: float,
+                 path: str,
+                 database: Optional[str] = None,
+                 max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5,
+                 queue_size: int = 1000):
+        """
+        Initialize the log; nothing is recorded until `attach` is called.
+
+        Args:
+            threshold_ms (float): Duration in milliseconds above which a statement is logged
+            path (str): Path of the log file
+            database (str | None): Path of the SQLite database, None to skip plans
+            max_bytes (int): Size at which the log file is rotated
+            backup_count (int): Number of rotated files kept
+            queue_size (int): Slow statements waiting to be explained before new ones are dropped
+        """
+        self.threshold = threshold_ms / 1000
+        self.database = database
+        self.dropped = 0
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.engine = None
+        self.thread = None
+        self.handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+
+    def attach(self, engine: AsyncEngine):
+        """
+        Starts timing the statements of an engine and the thread writing entries.
+
+        Args:
+            engine (AsyncEngine): The engine
+        """
+        self.engine = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        self.thread = threading.Thread(target=self._run, name="slow-query-log", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """Stops timing statements, writes the pending entries and closes the file."""
+        if self.engine is not None:
+            event.remove(self.engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(self.engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+            self.engine = None
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self.handler.close()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["slow_query_started"] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("slow_query_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        if duration < self.threshold:
+            return
+        try:
+            self.queue.put_nowait((time.time(), statement, parameters, executemany, duration))
+            slow_queries_total.inc("true")
+        except queue.Full:
+            self.dropped += 1
+            slow_queries_total.inc("false")
+
+    def explain(self, connection: sqlite3.Connection, statement: str, parameters, executemany: bool):
+        """
+        Returns the query plan of a statement, one line per plan step.
+
+        Args:
+            connection (sqlite3.Connection): Read-only connection to the database
+            statement (str): The statement
+            parameters: Its parameters, the first set is used for executemany
+            executemany (bool): Whether `parameters` is a list of parameter sets
+
+        Returns:
+            list[str] | None: Plan steps indented by depth, None if the statement cannot be explained
+        """
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+        depth = {0: -1}
+        plan = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            plan.append("  " * depth[node_id] + detail)
+        return plan
+
+    def _run(self):
+        connection = None
+        if self.database:
+            connection = sqlite3.connect(f"file:{self.database}?mode=ro", uri=True, check_same_thread=False)
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    return
+                timestamp, statement, parameters, executemany, duration = item
+                entry = {"timestamp": timestamp,
+                         "duration_ms": round(duration * 1000, 3),
+                         "statement": statement,
+                         "parameters": parameter_shape(parameters, executemany),
+                         "plan": None}
+                if connection is not None:
+                    try:
+                        entry["plan"] = self.explain(connection, statement, parameters, executemany)
+                    except sqlite3.Error as error:
+                        entry["plan_error"] = str(error)
+                self.handler.handle(logging.makeLogRecord({"msg": json.dumps(entry), "levelno": logging.INFO}))
+        finally:
+            if connection is not None:
+                connection.close()
+
+
+def configure_slow_query_log(engine: AsyncEngine) -> Optional[SlowQueryLog]:
+    """
+    Attaches a slow-query log to the engine if `SLOW_QUERY_THRESHOLD_MS` is set.
+
+    Plans are captured for file-based SQLite databases only.
+
+    Args:
+        engine (AsyncEngine): The engine
+
+    Returns:
+        SlowQueryLog | None: The attached log, None if disabled
+    """
+    if config.SLOW_QUERY_THRESHOLD_MS is None:
+        return None
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        database = None
+    slow_query_log = SlowQueryLog(config.SLOW_QUERY_THRESHOLD_MS,
+                                  config.SLOW_QUERY_LOG_PATH,
+                                  database,
+                                  config.SLOW_QUERY_LOG_MAX_BYTES,
+                                  config.SLOW_QUERY_LOG_BACKUPS)
+    slow_query_log.attach(engine)
+    return slow_query_log
@@ -0,0 +1,291 @@
+"""Per-user and per-IP rate limiting.
+
+Every request is counted against a token bucket of its route group (see
+`ROUTE_GROUPS`) and of its client: the id of the user its bearer token
+belongs to, or the client IP address for anonymous requests. A bucket holds
+up to `burst` tokens and refills at `rate` tokens per second; a request
+takes one token, and a request finding the bucket empty gets a 429 with
+`Retry-After`. Every response of a limited group carries the
+`X-RateLimit-Limit`, `X-RateLimit-Remaining` and `X-RateLimit-Reset`
+(seconds until the bucket is full again) headers.
+
+Limits are configured per group by `RATE_LIMITS`, e.g.
+`tasks_read=5/20,tasks_write=2/10,auth=0.5/5`: five tokens per second with
+bursts of twenty for task reads, and so on. Groups without a limit are not
+limited; `default` is the group of the requests no other group matches.
+
+The user is identified from the token through the verified-token cache of
+the authentication backend, before the request reaches the handler, so a
+client over its limit costs neither a database session nor a user lookup.
+
+Buckets are kept by a `RateLimitBackend`. `MemoryBackend` keeps them in a
+dict, refilled lazily when a request takes a token, so each request costs
+one lookup whatever the number of clients; full buckets are equivalent to
+missing ones and are evicted periodically. Its limits apply per worker
+process. A backend shared by the workers (e.g. on Redis) implements the same
+interface and replaces `rate_limiter.backend`.
+"""
+
+import asyncio
+import logging
+import time
+from typing import NamedTuple, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .auth.auth import auth_backend
+from .config import config
+from .monitoring.metrics import Counter, Gauge, registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP = "default"
+ROUTE_GROUPS = (
+    ("auth", None, "/auth/"),
+    ("tasks_read", {"GET", "HEAD"}, "/tasks"),
+    ("tasks_write", None, "/tasks"),
+    ("users", None, "/users"),
+)
+"""Route groups as (name, methods or None for any, path prefix), first match wins."""
+EXEMPT_PATHS = {"/metrics"}
+
+rate_limited_total = registry.register(Counter(
+    "rate_limited_requests_total", "Requests rejected by rate limiting", ("group", "client")))
+
+
+class Limit(NamedTuple):
+    """Token bucket parameters."""
+
+    rate: float
+    """Tokens added per second."""
+    burst: int
+    """Tokens the bucket holds at most."""
+
+
+class Decision(NamedTuple):
+    """Outcome of taking a token from a bucket."""
+
+    allowed: bool
+    remaining: int
+    """Whole tokens left in the bucket."""
+    reset_after: float
+    """Seconds until the bucket is full again."""
+    retry_after: float
+    """Seconds until a token is available, 0 if the request is allowed."""
+
+
+def parse_limits(value: Optional[str]) -> dict[str, Limit]:
+    """
+    Parses limits such as `tasks_read=5/20,auth=0.5/5`.
+
+    Args:
+        value (str | None): Comma-separated `group=rate/burst` pairs
+
+    Returns:
+        dict[str, Limit]: Limit of every configured group
+
+    Raises:
+        ValueError: If a pair is malformed, names an unknown group or is not positive
+    """
+    limits = {}
+    groups = {name for name, _, _ in ROUTE_GROUPS} | {DEFAULT_GROUP}
+    for part in (value or "").split(","):
+        if not part.strip():
+            continue
+        name, _, spec = part.strip().partition("=")
+        rate, _, burst = spec.partition("/")
+        if name not in groups:
+            raise ValueError(f"Unknown rate limit group {name!r}, expected one of {sorted(groups)}")
+        limit = Limit(float(rate), int(burst or max(1, float(rate))))
+        if limit.rate <= 0 or limit.burst <= 0:
+            raise ValueError(f"Rate limit of {name!r} must be positive")
+        limits[name] = limit
+    return limits
+
+
+def route_group(method: str, path: str) -> str:
+    for name, methods, prefix in ROUTE_GROUPS:
+        if path.startswith(prefix) and (methods is None or method in methods):
+            return name
+    return DEFAULT_GROUP
+
+
+class RateLimitBackend:
+    """Storage of the token buckets."""
+
+    async def take(self, key: tuple, limit: Limit, now: float) -> Decision:
+        """
+        Refills a bucket for the time elapsed and takes a token from it.
+
+        Args:
+            key (tuple): Bucket key, (group, client)
+            limit (Limit): Parameters of the bucket
+            now (float): Current monotonic time in seconds
+
+        Returns:
+            Decision: Whether the token was taken and the state of the bucket
+        """
+        raise NotImplementedError
+
+    def evict(self, now: float) -> int:
+        """
+        Drops the buckets that are full again.
+
+        Args:
+            now (float): Current monotonic time in seconds
+
+        Returns:
+            int: Buckets dropped
+        """
+        return 0
+
+    def __len__(self):
+        return 0
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    Token buckets of the current process, in a dict.
+
+    Attributes:
+        buckets (dict[tuple, list[float]]): Tokens, last refill time and time the
+            bucket is full again, by key
+    """
+
+    def __init__(self):
+        self.buckets = {}
+
+    async def take(self, key, limit, now):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            tokens = limit.burst
+        else:
+            tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        reset_after = (limit.burst - tokens) / limit.rate
+        self.buckets[key] = [tokens, now, now + reset_after]
+        return Decision(allowed, int(tokens), reset_after, 0 if allowed else (1 - tokens) / limit.rate)
+
+    def evict(self, now):
+        full = [key for key, bucket in self.buckets.items() if bucket[2] <= now]
+        for key in full:
+            del self.buckets[key]
+        return len(full)
+
+    def __len__(self):
+        return len(self.buckets)
+
+
+class RateLimiter:
+    """
+    Applies the limits of the route groups.
+
+    Attributes:
+        limits (dict[str, Limit]): Limit of every limited group
+        backend (RateLimitBackend): Storage of the buckets
+    """
+
+    def __init__(self, limits: dict[str, Limit], backend: Optional[RateLimitBackend] = None):
+        self.limits = limits
+        self.backend = backend or MemoryBackend()
+
+    async def check(self, group: str, client: str) -> Optional[Decision]:
+        """
+        Takes a token for a request.
+
+        Args:
+            group (str): Route group of the request
+            client (str): `user:<id>` or `ip:<address>`
+
+        Returns:
+            Decision | None: The decision, None if the group is not limited
+        """
+        limit = self.limits.get(group)
+        if limit is None:
+            return None
+        return await self.backend.take((group, client), limit, time.monotonic())
+
+    async def run_eviction(self, interval: float):
+        """
+        Periodically drops the buckets that are full again.
+
+        Runs until cancelled.
+
+        Args:
+            interval (float): Seconds between runs
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.backend.evict(time.monotonic())
+            except Exception:
+                logger.exception("Rate limit bucket eviction failed")
+
+
+rate_limiter = RateLimiter(parse_limits(config.RATE_LIMITS))
+
+registry.register(Gauge("rate_limit_buckets", "Token buckets kept by the rate limiter",
+                        function=lambda: len(rate_limiter.backend)))
+
+
+def request_client(scope: Scope) -> str:
+    """
+    Identifies the client of a request for rate limiting.
+
+    Args:
+        scope (Scope): ASGI scope of the request
+
+    Returns:
+        str: `user:<id>` if it carries a valid bearer token, otherwise `ip:<address>`
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                entry = auth_backend.get_strategy().verify_token(token)
+                if entry is not None:
+                    return f"user:{entry.user_id}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Rejects requests over the limit of their client with 429 and reports the limit in headers."""
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.limiter.limits or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        group = route_group(scope["method"], scope["path"])
+        if group not in self.limiter.limits:
+            await self.app(scope, receive, send)
+            return
+        client = request_client(scope)
+        decision = await self.limiter.check(group, client)
+        headers = {"X-RateLimit-Limit": str(self.limiter.limits[group].burst),
+                   "X-RateLimit-Remaining": str(decision.remaining),
+                   "X-RateLimit-Reset": str(int(decision.reset_after + 0.999))}
+        if not decision.allowed:
+            rate_limited_total.inc(group, client.partition(":")[0])
+            headers["Retry-After"] = str(int(decision.retry_after + 0.999))
+            response = JSONResponse({"detail": "Too many requests"}, status_code=429, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers.items():
+                    response_headers.append(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
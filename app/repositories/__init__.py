@@ -1,5 +1,7 @@
 from app.repositories.task import TaskRepository
 from app.repositories.user import UserRepository
+from app.repositories.group_commit import GroupCommitWriter, task_writer
+from app.config import config
 from app.db import get_async_session
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
@@ -23,11 +25,14 @@ async def get_task_repository(session: AsyncSession = Depends(get_async_session)
         session (AsyncSession): The async SQLAlchemy session (injected by FastAPI).
 
     Yields:
-        TaskRepository: An instance of TaskRepository for handling task-related database operations.
+        TaskRepository: An instance of TaskRepository for handling task-related database operations,
+            submitting its writes to the group-commit writer if `TASK_GROUP_COMMIT` is enabled.
     """
-    yield TaskRepository(session, Task, User)
+    yield TaskRepository(session, Task, User, writer=task_writer if config.TASK_GROUP_COMMIT else None)
 
 __all__ = ["TaskRepository",
            "UserRepository",
+           "GroupCommitWriter",
+           "task_writer",
            "get_user_repository",
            "get_task_repository"]
@@ -0,0 +1,137 @@
+"""Group commit of concurrent task writes.
+
+Every write committed in its own transaction costs a sync of the database
+file (on SQLite, one fsync per commit), which caps write throughput whatever
+the concurrency. `GroupCommitWriter` collects the write operations submitted
+within `TASK_GROUP_COMMIT_WINDOW_MS`, or up to `TASK_GROUP_COMMIT_MAX_BATCH`
+of them, and applies them in one transaction with a single commit.
+
+Each operation runs in its own savepoint, so an operation that fails is
+rolled back alone and its caller gets its error while the others are
+committed. Callers get their result only once the commit returned: a write
+is never reported before it is durable. If the commit itself fails, every
+operation of the batch gets that error, as none of them was committed.
+
+Batches are committed one after the other; operations submitted while a
+batch commits form the next one, so batches grow with the load. The writer
+uses its own sessions, so the statements of a batch are not counted in the
+query statistics of the requests that submitted them.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import config
+from ..db import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """
+    Applies concurrent write operations in shared transactions.
+
+    Attributes:
+        session_maker (async_sessionmaker): Factory of the sessions batches run in
+        window (float): Seconds operations are collected before a batch is committed
+        max_batch (int): Operations per batch at most, a full batch is committed right away
+        pending (list[tuple[Callable, asyncio.Future]]): Operations waiting for the next batch
+        batches (int): Batches committed
+        operations (int): Operations applied in committed batches
+    """
+
+    def __init__(self, session_maker: async_sessionmaker, window_ms: float, max_batch: int):
+        self.session_maker = session_maker
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.pending = []
+        self.batches = 0
+        self.operations = 0
+        self._task = None
+        self._batch_full = None
+
+    async def submit(self, operation: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """
+        Applies a write operation in the next batch.
+
+        The operation must not commit; it is given the session of the batch and
+        should flush its changes so that database errors are raised within it.
+
+        Args:
+            operation (Callable[[AsyncSession], Awaitable]): Applies the write and returns its result
+
+        Returns:
+            Any: Result of the operation, once committed
+
+        Raises:
+            Exception: Whatever the operation raised, or the error of the commit
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((operation, future))
+        if len(self.pending) >= self.max_batch and self._batch_full is not None and not self._batch_full.done():
+            self._batch_full.set_result(None)
+        if self._task is None:
+            # Started in an empty context: the batches belong to no request.
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+        # Shielded: a caller going away does not withdraw its write from the batch.
+        return await asyncio.shield(future)
+
+    async def _run(self):
+        try:
+            while self.pending:
+                if len(self.pending) < self.max_batch and self.window > 0:
+                    self._batch_full = asyncio.get_running_loop().create_future()
+                    await asyncio.wait([self._batch_full], timeout=self.window)
+                    self._batch_full = None
+                batch = self.pending[:self.max_batch]
+                del self.pending[:self.max_batch]
+                await self._commit(batch)
+        finally:
+            self._task = None
+            for _, future in self.pending:
+                if not future.done():
+                    future.set_exception(RuntimeError("The group-commit writer stopped"))
+            self.pending.clear()
+
+    async def _commit(self, batch: list):
+        outcomes = []
+        try:
+            async with self.session_maker() as session:
+                connection = await session.connection()
+                if connection.dialect.name == "sqlite":
+                    # The sqlite3 driver only opens a transaction before DML: the
+                    # savepoints would otherwise run in autocommit mode, and
+                    # releasing each of them would commit its operation alone.
+                    await connection.exec_driver_sql("BEGIN")
+                for operation, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            outcomes.append((future, await operation(session), None))
+                    except Exception as error:
+                        outcomes.append((future, None, error))
+                await session.commit()
+        except Exception as error:
+            logger.exception("Committing a batch of %d writes failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        except BaseException:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("The group-commit writer stopped"))
+            raise
+        self.batches += 1
+        self.operations += len(batch)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+task_writer = GroupCommitWriter(async_session_maker, config.TASK_GROUP_COMMIT_WINDOW_MS, config.TASK_GROUP_COMMIT_MAX_BATCH)
@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Task, User
@@ -6,6 +7,8 @@ from app.schemas import (
     TaskUpdate
 )
 from app.errors import UserNotFoundError, TaskNotFoundError
+from app.repositories.group_commit import GroupCommitWriter
+from app.tracing import trace_methods
 
 def check_user_exists(func):
     """
@@ -75,23 +78,29 @@ def check_task_exists(func):
             return await func(self, *args, **kwargs)
     return wrapper
 
+@trace_methods
 class TaskRepository:
     """
     Repository class for handling database operations related to tasks.
     
     This class provides methods for creating, retrieving, updating, and deleting
     tasks in the database, with support for both user-specific and general operations.
+    With a group-commit writer, creations, updates and deletions are applied in
+    batches shared with concurrent requests (see app.repositories.group_commit).
 
     Attributes:
         session (AsyncSession): The async SQLAlchemy session for database operations
         task_table (Task): The SQLAlchemy model for tasks
         user_table (User): The SQLAlchemy model for users
+        writer (GroupCommitWriter | None): Writer the writes are submitted to, None to
+            commit them in the session
     """
 
     def __init__(self,
                  session: AsyncSession,
                  task_table: Task,
-                 user_table: User):
+                 user_table: User,
+                 writer: Optional[GroupCommitWriter] = None):
 
         """
         Initialize the TaskRepository.
@@ -100,10 +109,13 @@ class TaskRepository:
             session (AsyncSession): The async SQLAlchemy session for database operations
             task_table (Task): The SQLAlchemy model for tasks
             user_table (User): The SQLAlchemy model for users
+            writer (GroupCommitWriter | None): Writer the writes are submitted to, None to
+                commit them in the session
         """
         self.session = session
         self.task_table = task_table
         self.user_table = user_table
+        self.writer = writer
 
     async def _check_user_exists(self, user_id: int):
         """Checks if a user with the given ID exists in the database.
@@ -135,6 +147,50 @@ class TaskRepository:
         except:
             return False
 
+    async def _submit(self, operation):
+        """
+        Submits a write to the group-commit writer.
+
+        The transaction of this session is ended first, so that its connection goes
+        back to the pool the writer takes its own from, and holds no lock the commit
+        of the batch would wait for.
+        """
+        await self.session.commit()
+        return await self.writer.submit(operation)
+
+    async def _find_task(self, session: AsyncSession, task_id: int, user_id: Optional[int] = None):
+        """Loads a task in a group-commit batch, None if absent or not owned by the user."""
+        query = select(self.task_table).where(self.task_table.id == task_id)
+        if user_id is not None:
+            query = query.where(self.task_table.user_id == user_id)
+        result = await session.execute(query)
+        return result.scalar_one_or_none()
+
+    def _update_operation(self, task_id: int, task_data: TaskUpdate, user_id: Optional[int] = None):
+        """Builds the group-commit operation updating a task."""
+        async def update(session):
+            task = await self._find_task(session, task_id, user_id)
+            if task is None:
+                return None
+            for key, value in task_data.model_dump(exclude_unset=True).items():
+                setattr(task, key, value)
+            await session.flush()
+            return task
+
+        return update
+
+    def _delete_operation(self, task_id: int, user_id: Optional[int] = None):
+        """Builds the group-commit operation deleting a task."""
+        async def delete(session):
+            task = await self._find_task(session, task_id, user_id)
+            if task is None:
+                return None
+            await session.delete(task)
+            await session.flush()
+            return task
+
+        return delete
+
     @check_user_exists
     async def create_task(self, task_data: TaskCreate):
         """Creates a new task in the database.
@@ -146,6 +202,14 @@ class TaskRepository:
         Returns:
             Task: The newly created task object.
         """
+        if self.writer is not None:
+            async def insert(session):
+                task = self.task_table(**task_data.model_dump())
+                session.add(task)
+                await session.flush()
+                return task
+
+            return await self._submit(insert)
         task = self.task_table(**task_data.model_dump())
         self.session.add(task)
         await self.session.commit()
@@ -214,6 +278,8 @@ class TaskRepository:
         Returns:
             Task | None: The updated task object if found and updated, otherwise None
         """
+        if self.writer is not None:
+            return await self._submit(self._update_operation(task_id, task_data, user_id))
         task = await self.get_task_by_id(task_id, user_id)
         if task is None:
             return None
@@ -235,6 +301,8 @@ class TaskRepository:
         Returns:
             Task | None: The updated task object if found, otherwise None.
         """
+        if self.writer is not None:
+            return await self._submit(self._update_operation(task_id, task_data))
         task = await self.get_specific_task_by_id(task_id)
         if task is None:
             return None
@@ -256,6 +324,8 @@ class TaskRepository:
         Returns:
             Task | None: The deleted task object if found, otherwise None.
         """
+        if self.writer is not None:
+            return await self._submit(self._delete_operation(task_id, user_id))
         task = await self.get_task_by_id(task_id, user_id)
         if task is None:
             return None
@@ -273,6 +343,8 @@ class TaskRepository:
         Returns:
             Task | None: The deleted task object if found, otherwise None.
         """
+        if self.writer is not None:
+            return await self._submit(self._delete_operation(task_id))
         task = await self.get_specific_task_by_id(task_id)
         if task is None:
             return None
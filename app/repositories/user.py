@@ -1,7 +1,12 @@
+import sys
+from typing import Optional
 from fastapi_users.db import SQLAlchemyUserDatabase
 from app.models import User
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from app.tracing import trace_methods
 
+@trace_methods
 class UserRepository(SQLAlchemyUserDatabase):
     """Repository class for handling user-related database operations.
 
@@ -22,7 +27,157 @@ class UserRepository(SQLAlchemyUserDatabase):
             >>> repo = UserRepository(session)
             >>> users = await repo.get_all()
         """
-        async with self.session as session:
-            result = await session.execute(select(User))
-            users = result.scalars().all()
-            return users
\ No newline at end of file
+        result = await self.session.execute(select(User))
+        return result.scalars().all()
+
+    def _filtered_query(self,
+                        after_id: Optional[int] = None,
+                        is_active: Optional[bool] = None,
+                        is_superuser: Optional[bool] = None,
+                        email_prefix: Optional[str] = None):
+        """Builds an id-ordered user query with keyset and attribute filters.
+
+        The email prefix is expressed as a range so the unique email index can serve it.
+
+        Args:
+            after_id (Optional[int]): Only return users with a greater id.
+            is_active (Optional[bool]): Filter on the active flag.
+            is_superuser (Optional[bool]): Filter on the superuser flag.
+            email_prefix (Optional[str]): Only return users whose email starts with it.
+
+        Returns:
+            Select: The query.
+        """
+        query = select(User).order_by(User.id)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        if is_active is not None:
+            query = query.where(User.is_active == is_active)
+        if is_superuser is not None:
+            query = query.where(User.is_superuser == is_superuser)
+        if email_prefix:
+            query = query.where(User.email >= email_prefix)
+            # The smallest string above every string with the prefix; the last
+            # character cannot be incremented past U+10FFFF, so carry into the
+            # previous one, and leave the range open if there is none.
+            stem = email_prefix.rstrip(chr(sys.maxunicode))
+            if stem:
+                query = query.where(User.email < stem[:-1] + chr(ord(stem[-1]) + 1))
+        return query
+
+    async def get_page(self,
+                       limit: int,
+                       after_id: Optional[int] = None,
+                       is_active: Optional[bool] = None,
+                       is_superuser: Optional[bool] = None,
+                       email_prefix: Optional[str] = None):
+        """Retrieves one page of users ordered by id.
+
+        Args:
+            limit (int): Maximum number of users to return.
+            after_id (Optional[int]): Cursor, the id of the last user of the previous page.
+            is_active (Optional[bool]): Filter on the active flag.
+            is_superuser (Optional[bool]): Filter on the superuser flag.
+            email_prefix (Optional[str]): Only return users whose email starts with it.
+
+        Returns:
+            tuple[list[User], Optional[int]]: The users and the cursor of the next page,
+                None if this is the last page.
+        """
+        query = self._filtered_query(after_id, is_active, is_superuser, email_prefix)
+        result = await self.session.execute(query.limit(limit + 1))
+        users = list(result.scalars().all())
+        if len(users) > limit:
+            users = users[:limit]
+            return users, users[-1].id
+        return users, None
+
+    async def iter_batches(self,
+                           batch_size: int,
+                           is_active: Optional[bool] = None,
+                           is_superuser: Optional[bool] = None,
+                           email_prefix: Optional[str] = None):
+        """Iterates over all matching users in id-ordered batches.
+
+        Every batch is a separate keyset query, and loaded users are expunged from
+        the session afterwards so memory stays bounded by the batch size.
+
+        Args:
+            batch_size (int): Number of users per batch.
+            is_active (Optional[bool]): Filter on the active flag.
+            is_superuser (Optional[bool]): Filter on the superuser flag.
+            email_prefix (Optional[str]): Only return users whose email starts with it.
+
+        Yields:
+            list[User]: The next batch of users.
+        """
+        after_id = None
+        while True:
+            users, after_id = await self.get_page(batch_size, after_id, is_active, is_superuser, email_prefix)
+            if users:
+                yield users
+            self.session.expunge_all()
+            if after_id is None:
+                return
+
+    async def get_existing_emails(self, emails: list[str]):
+        """Finds which of the given emails are already registered, in one query.
+
+        The comparison is case-insensitive, like `get_by_email`.
+
+        Args:
+            emails (list[str]): Emails to look up.
+
+        Returns:
+            set[str]: Lower-cased emails that already exist.
+        """
+        if not emails:
+            return set()
+        lowered = {email.lower() for email in emails}
+        result = await self.session.execute(
+            select(func.lower(User.email)).where(func.lower(User.email).in_(lowered))
+        )
+        return set(result.scalars().all())
+
+    async def create_many(self, rows: list[dict], batch_size: int):
+        """Inserts users in batches, committing one transaction per batch.
+
+        If a batch violates a constraint (e.g. an email registered concurrently),
+        it is rolled back and retried row by row so only the offending rows fail.
+        Created users are expunged after their commit, so later rollbacks do not
+        expire them and the session does not grow with the number of rows.
+
+        Args:
+            rows (list[dict]): Column values of the users to create.
+            batch_size (int): Number of users per transaction.
+
+        Returns:
+            list[Optional[User]]: Created users in the order of `rows`, None for rows
+                that violated a constraint.
+        """
+        created = []
+        for start in range(0, len(rows), batch_size):
+            batch = [self.user_table(**row) for row in rows[start:start + batch_size]]
+            self.session.add_all(batch)
+            try:
+                await self.session.commit()
+                for user in batch:
+                    self.session.expunge(user)
+                created.extend(batch)
+            except IntegrityError:
+                await self.session.rollback()
+                for row in rows[start:start + batch_size]:
+                    user = self.user_table(**row)
+                    self.session.add(user)
+                    try:
+                        await self.session.commit()
+                        self.session.expunge(user)
+                        created.append(user)
+                    except IntegrityError:
+                        await self.session.rollback()
+                        created.append(None)
+        return created
+
+    async def close(self):
+        """Closes the underlying session, releasing its connection."""
+        await self.session.close()
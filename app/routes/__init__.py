@@ -1,7 +1,11 @@
 from app.routes.authenticated import router as authenticated_router
+from app.routes.metrics import router as metrics_router
+from app.routes.profiling import router as profiling_router
 from app.routes.tasks import router as tasks_router
 from app.routes.users import router as users_router
 
 __all__ = ["authenticated_router",
+           "metrics_router",
+           "profiling_router",
            "tasks_router",
            "users_router"]
\ No newline at end of file
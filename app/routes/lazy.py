@@ -0,0 +1,101 @@
+"""Routers built on first use.
+
+Building an `APIRouter` analyzes the signature and dependencies of every
+endpoint and generates their pydantic validators, which is a noticeable
+part of worker start-up. Rarely used routers (password reset, email
+verification) are registered as a `LazyRouter` placeholder instead: the
+router is built the first time one of its paths is requested, or when the
+OpenAPI schema is rendered, and its routes take the placeholder's place.
+"""
+
+from typing import Callable
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+
+class LazyRouter(BaseRoute):
+    """
+    Placeholder route matching the paths of a router that is not built yet.
+
+    Attributes:
+        paths (frozenset[str]): Full paths served by the router, prefix included
+        loaded (bool): Whether the router has replaced the placeholder
+    """
+
+    def __init__(self, app: FastAPI, factory: Callable[[], APIRouter], paths, prefix: str = "", **include_kwargs):
+        """
+        Initialize the placeholder; `include_lazy_router` also registers it.
+
+        Args:
+            app (FastAPI): Application the router is included in
+            factory (Callable[[], APIRouter]): Builds the router
+            paths (Iterable[str]): Paths of the router, without the prefix
+            prefix (str): Prefix the router is included under
+            **include_kwargs: Other arguments of `FastAPI.include_router`, e.g. `tags`
+        """
+        self.app = app
+        self.factory = factory
+        self.prefix = prefix
+        self.paths = frozenset(prefix + path for path in paths)
+        self.include_kwargs = include_kwargs
+        self.loaded = False
+
+    def matches(self, scope: Scope):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        # Route names are only known once the router is built.
+        raise NoMatchFound(name, path_params)
+
+    def load(self):
+        """Builds the router and puts its routes in place of the placeholder."""
+        if self.loaded:
+            return
+        routes = self.app.router.routes
+        count = len(routes)
+        self.app.include_router(self.factory(), prefix=self.prefix, **self.include_kwargs)
+        included = routes[count:]
+        del routes[count:]
+        if self in routes:
+            index = routes.index(self)
+            routes[index:index + 1] = included
+        self.loaded = True
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        self.load()
+        await self.app.router(scope, receive, send)
+
+
+def include_lazy_router(app: FastAPI, factory: Callable[[], APIRouter], paths, prefix: str = "", **include_kwargs):
+    """
+    Registers a router to be built on first use.
+
+    Args:
+        app (FastAPI): The application
+        factory (Callable[[], APIRouter]): Builds the router
+        paths (Iterable[str]): Paths of the router, without the prefix
+        prefix (str): Prefix the router is included under
+        **include_kwargs: Other arguments of `FastAPI.include_router`, e.g. `tags`
+
+    Returns:
+        LazyRouter: The placeholder
+    """
+    placeholder = LazyRouter(app, factory, paths, prefix, **include_kwargs)
+    app.router.routes.append(placeholder)
+    return placeholder
+
+
+def load_lazy_routers(app: FastAPI):
+    """
+    Builds every lazy router of an application.
+
+    Args:
+        app (FastAPI): The application
+    """
+    for route in list(app.router.routes):
+        if isinstance(route, LazyRouter):
+            route.load()
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.monitoring import registry
+
+router = APIRouter()
+
+@router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Expose application metrics in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: Request, connection pool and cache metrics
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
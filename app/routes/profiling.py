@@ -0,0 +1,119 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.exceptions import HTTPException
+from fastapi.responses import PlainTextResponse, Response
+from app.monitoring import loop_lag_monitor, request_profiler, stack_sampler
+from app.routes.users import is_admin
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get('/profiles')
+async def list_profiles(admin = Depends(is_admin)):
+    """
+    List the stored request profiles, most recent first.
+
+    Requests are profiled when a superuser sends them with the `X-Profile: 1`
+    header or the `profile=1` query parameter.
+
+    Args:
+        admin (bool): Whether the current user is an admin
+
+    Returns:
+        list[dict]: Id, method, path, status, duration and time of every profile
+
+    Raises:
+        HTTPException: 403 if the user is not an admin
+    """
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="The appropriate level of execution permission has not been granted.")
+    return [profile.summary() for profile in reversed(request_profiler.profiles.values())]
+
+@router.get('/profiles/{profile_id}')
+async def get_profile(profile_id: str,
+                      format: Literal["text", "pstats"] = "text",
+                      sort: Literal["cumulative", "tottime", "ncalls"] = "cumulative",
+                      limit: int = Query(50, ge=1, le=1000),
+                      admin = Depends(is_admin)):
+    """
+    Retrieve one request profile.
+
+    Args:
+        profile_id (str): Id returned in the `X-Profile-Id` header of the profiled request
+        format (str): `text` for a pstats report, `pstats` for a file loadable by pstats or snakeviz
+        sort (str): Sort key of the text report
+        limit (int): Functions listed in the text report
+        admin (bool): Whether the current user is an admin
+
+    Returns:
+        PlainTextResponse | Response: The report or the pstats file
+
+    Raises:
+        HTTPException:
+            - 403 if the user is not an admin
+            - 404 if the profile does not exist or was dropped
+    """
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="The appropriate level of execution permission has not been granted.")
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "pstats":
+        return Response(profile.dump(), media_type="application/octet-stream",
+                        headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'})
+    return PlainTextResponse(profile.report(sort, limit))
+
+
+@router.get('/flamegraph', response_class=PlainTextResponse)
+async def get_flamegraph(reset: bool = False, admin = Depends(is_admin)):
+    """
+    Retrieve the stacks collected by the continuous sampler.
+
+    The output is in collapsed-stack format, one `frame;frame;... count` line per
+    distinct stack, and can be rendered with flamegraph.pl or speedscope.
+
+    Args:
+        reset (bool): Clear the counts after reading them
+        admin (bool): Whether the current user is an admin
+
+    Returns:
+        PlainTextResponse: Collapsed stacks, most frequent first
+
+    Raises:
+        HTTPException:
+            - 403 if the user is not an admin
+            - 404 if the sampler is disabled (`SAMPLER_ENABLED`)
+    """
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="The appropriate level of execution permission has not been granted.")
+    if not stack_sampler.running:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sampler is disabled")
+    collapsed = stack_sampler.collapsed()
+    if reset:
+        stack_sampler.reset()
+    return PlainTextResponse(collapsed)
+
+@router.get('/stalls')
+async def list_stalls(admin = Depends(is_admin)):
+    """
+    List the latest event-loop stalls, most recent first.
+
+    A stall is recorded when the event loop could not run for longer than
+    `LOOP_LAG_THRESHOLD_MS`, with the stack of the blocking code and the route
+    being served at the time.
+
+    Args:
+        admin (bool): Whether the current user is an admin
+
+    Returns:
+        list[dict]: Time, duration, method, route and stack of every stall
+
+    Raises:
+        HTTPException: 403 if the user is not an admin
+    """
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="The appropriate level of execution permission has not been granted.")
+    return list(reversed(loop_lag_monitor.stalls))
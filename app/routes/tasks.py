@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from app.schemas import TaskRead, TaskCreate, TaskUpdate, UserRead
 from app.managers import get_task_manager
 from ..auth.auth import current_active_user
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+router = APIRouter(prefix="/tasks", tags=["tasks"], route_class=TracedRoute)
 
 def check_is_admin(user: UserRead = Depends(current_active_user)):
     """
@@ -67,11 +68,12 @@ async def get_all_tasks(user: UserRead = Depends(current_active_user),
     Notes:
         - Regular users can only see their own tasks
         - Admins can see all tasks in the system
+        - Concurrent requests of the same user share one query and its encoded response
     """
     if is_admin:
         return await task_manager.get_all_tasks()
     else:
-        return await task_manager.get_tasks(user.id)
+        return Response(await task_manager.get_tasks_json(user.id), media_type="application/json")
 
 @router.get("/{task_id}")
 async def get_task(task_id: int,
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
 from fastapi.exceptions import HTTPException
-from app.schemas.users import UserCreate, UserRead
+from fastapi.responses import StreamingResponse
+from app.config import config
+from app.schemas.users import UserCreate, UserRead, UserPage, UserBulkCreate, UserBulkResult
 from app.auth.auth import current_active_user, get_user_manager
 from fastapi_users.exceptions import UserAlreadyExists
+from app.tracing import TracedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 def is_admin(user = Depends(current_active_user)):
     """
@@ -56,33 +60,115 @@ async def user_create(user_data: UserCreate,
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                             detail="The appropriate level of execution permission has not been granted.")
 
-@router.get('/users')
-async def get_users(user_manager = Depends(get_user_manager),
+@router.post('/users/bulk', response_model=list[UserBulkResult])
+async def user_bulk_create(bulk_data: UserBulkCreate,
+                           admin = Depends(is_admin),
+                           user_manager = Depends(get_user_manager)):
+    """
+    Create many users in one request.
+
+    This endpoint is restricted to admin users only. Every row is processed
+    independently: conflicting or invalid rows are reported without failing the
+    others.
+
+    Args:
+        bulk_data (UserBulkCreate): Users to create
+        admin (bool): Whether the current user is an admin
+        user_manager: User manager instance for handling user operations
+
+    Returns:
+        list[UserBulkResult]: Outcome of every row, in request order
+
+    Raises:
+        HTTPException:
+            - 403 if the user is not an admin
+            - 413 if more than `USERS_BULK_MAX_SIZE` users are sent
+
+    Notes:
+        - Emails already registered, or repeated within the request, are reported as conflicts
+        - Users are inserted in transactions of `USERS_BULK_BATCH_SIZE` rows
+    """
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="The appropriate level of execution permission has not been granted.")
+    if len(bulk_data.users) > config.USERS_BULK_MAX_SIZE:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"At most {config.USERS_BULK_MAX_SIZE} users can be created at once.")
+    return await user_manager.bulk_create(bulk_data.users, config.USERS_BULK_BATCH_SIZE)
+
+@router.get('/users', response_model=UserPage)
+async def get_users(limit: int = Query(100, ge=1, le=config.USERS_PAGE_MAX_SIZE),
+                    cursor: Optional[int] = None,
+                    is_active: Optional[bool] = None,
+                    is_superuser: Optional[bool] = None,
+                    email_prefix: Optional[str] = None,
+                    user_manager = Depends(get_user_manager),
                     admin = Depends(is_admin)):
     """
-    Retrieve all users in the system.
+    Retrieve one page of users in the system.
 
-    This endpoint is restricted to admin users only. It returns a list of all
-    registered users in the system.
+    This endpoint is restricted to admin users only. Users are ordered by id and
+    paginated with a cursor: pass the returned `next_cursor` to get the next page.
 
     Args:
+        limit (int): Maximum number of users in the page
+        cursor (Optional[int]): Cursor returned with the previous page
+        is_active (Optional[bool]): Filter on the active flag
+        is_superuser (Optional[bool]): Filter on the superuser flag
+        email_prefix (Optional[str]): Only return users whose email starts with it
         user_manager: User manager instance for handling user operations
         admin (bool): Whether the current user is an admin
 
     Returns:
-        list[UserRead]: List of all users in the system
+        UserPage: Users of the page and the cursor of the next one
 
     Raises:
         HTTPException: 403 if the user is not an admin
 
     Notes:
         - Only admin users can access this endpoint
-        - Returns all users regardless of their status
+        - `next_cursor` is null on the last page
     """
     if admin:
-        result = await user_manager.get_all()
-        return result
+        users, next_cursor = await user_manager.get_page(limit, cursor, is_active, is_superuser, email_prefix)
+        return UserPage(items=[UserRead.model_validate(user) for user in users],
+                        next_cursor=next_cursor)
     else:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                             detail="The appropriate level of execution permission has not been granted.")
 
+@router.get('/users/export')
+async def export_users(is_active: Optional[bool] = None,
+                       is_superuser: Optional[bool] = None,
+                       email_prefix: Optional[str] = None,
+                       user_manager = Depends(get_user_manager),
+                       admin = Depends(is_admin)):
+    """
+    Stream all matching users as newline-delimited JSON.
+
+    This endpoint is restricted to admin users only. Users are loaded in batches
+    of `USERS_EXPORT_BATCH_SIZE`, so memory use does not grow with the number of
+    exported users.
+
+    Args:
+        is_active (Optional[bool]): Filter on the active flag
+        is_superuser (Optional[bool]): Filter on the superuser flag
+        email_prefix (Optional[str]): Only export users whose email starts with it
+        user_manager: User manager instance for handling user operations
+        admin (bool): Whether the current user is an admin
+
+    Returns:
+        StreamingResponse: One `UserRead` JSON document per line
+
+    Raises:
+        HTTPException: 403 if the user is not an admin
+    """
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="The appropriate level of execution permission has not been granted.")
+
+    async def stream():
+        async for users in user_manager.export(config.USERS_EXPORT_BATCH_SIZE, is_active, is_superuser, email_prefix):
+            yield "".join(UserRead.model_validate(user).model_dump_json() + "\n" for user in users)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -7,6 +7,9 @@ from .users import (
     UserCreate,
     UserRead,
     UserUpdate,
+    UserPage,
+    UserBulkCreate,
+    UserBulkResult,
 )
 
 __all__ = [
@@ -16,4 +19,7 @@ __all__ = [
     "UserRead",
     "UserCreate",
     "UserUpdate",
+    "UserPage",
+    "UserBulkCreate",
+    "UserBulkResult",
 ]
\ No newline at end of file
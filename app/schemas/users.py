@@ -1,5 +1,7 @@
+from enum import Enum
 from fastapi_users import schemas
 from typing import Optional
+from pydantic import BaseModel, Field
 
 class UserRead(schemas.BaseUser[int]):
     """Schema for reading user data.
@@ -28,4 +30,46 @@ class UserUpdate(schemas.BaseUserUpdate):
     """
 
     name: Optional[str] = None
-    """The updated name of the user. Optional."""
\ No newline at end of file
+    """The updated name of the user. Optional."""
+
+
+class UserPage(BaseModel):
+    """Schema for one page of the user listing."""
+
+    items: list[UserRead]
+    """Users of this page, ordered by id."""
+    next_cursor: Optional[int] = None
+    """Cursor to request the next page with. None on the last page."""
+
+
+class UserBulkCreate(BaseModel):
+    """Schema for provisioning many users in one request."""
+
+    users: list[UserCreate] = Field(min_length=1)
+    """Users to create."""
+
+
+class BulkStatusEnum(str, Enum):
+    """Enum representing the outcome of one row of a bulk operation."""
+
+    created = "created"
+    """The user was created."""
+    conflict = "conflict"
+    """A user with the same email already exists or appears earlier in the request."""
+    invalid = "invalid"
+    """The row was rejected by validation, e.g. the password policy."""
+
+
+class UserBulkResult(BaseModel):
+    """Schema for the outcome of one row of a bulk user creation."""
+
+    index: int
+    """Position of the row in the request."""
+    email: str
+    """Email of the row."""
+    status: BulkStatusEnum
+    """Outcome of the row."""
+    id: Optional[int] = None
+    """ID of the created user. Only set when the user was created."""
+    detail: Optional[str] = None
+    """Reason of a conflict or rejection."""
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""Synthetic dataset seeding.
+
+Users and tasks are inserted with executemany through INSERT statements
+compiled from the tables of the models in `app/models`, bypassing the ORM
+unit of work and passing plain tuples to the driver, so millions of rows
+are created in seconds. Datasets are deterministic for a given seed.
+
+    python -m app.seed --users 10000 --tasks 1000000 --statuses new=5,in_progress=3,completed=2
+    python -m app.seed --database-url sqlite+aiosqlite:///staging.db --tasks 100000 --description-length 50-500
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.auth.hashing import get_password_helper
+from app.models import Task, User
+from app.models.base_model import Base
+
+STATUSES = {"new": 1, "in_progress": 1, "completed": 1}
+TEXT_POOL_SIZE = 1 << 16
+WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do",
+         "eiusmod", "tempor", "incididunt", "ut", "labore", "et", "dolore", "magna", "aliqua")
+
+
+async def create_schema(engine: AsyncEngine):
+    """
+    Creates the tables that do not exist yet.
+
+    Args:
+        engine (AsyncEngine): Engine of the database
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def drop_schema(engine: AsyncEngine):
+    """
+    Drops all tables.
+
+    Args:
+        engine (AsyncEngine): Engine of the database
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def insert_statement(engine: AsyncEngine, table, columns: tuple[str, ...]) -> str:
+    """
+    Compiles a positional INSERT of the given columns for the engine's dialect.
+
+    Args:
+        engine (AsyncEngine): Engine the statement will run on
+        table (Table): Table of a model
+        columns (tuple[str, ...]): Columns, in the order of the row tuples
+
+    Returns:
+        str: The SQL statement
+
+    Raises:
+        ValueError: If the columns are not in table order, which is the order of the placeholders
+    """
+    if columns != tuple(column.name for column in table.columns if column.name in columns):
+        raise ValueError(f"Columns of {table.name} must be given in table order")
+    return str(insert(table).compile(dialect=engine.dialect, column_keys=list(columns)))
+
+
+class TextGenerator:
+    """
+    Produces deterministic filler text of a bounded length.
+
+    A pool of random words is generated once, and every text is a slice of it
+    at a random offset, so producing a text costs two random draws.
+    """
+
+    def __init__(self, rng: random.Random, min_length: int, max_length: int):
+        self.rng = rng
+        self.min_length = min_length
+        self.max_length = max_length
+        pool = " ".join(rng.choices(WORDS, k=TEXT_POOL_SIZE // 4))
+        while len(pool) < TEXT_POOL_SIZE + max_length:
+            pool += " " + pool
+        self.pool = pool
+
+    def __call__(self) -> str:
+        length = self.min_length if self.min_length == self.max_length \
+            else self.rng.randint(self.min_length, self.max_length)
+        start = self.rng.randrange(TEXT_POOL_SIZE)
+        return self.pool[start:start + length]
+
+
+async def seed_users(engine: AsyncEngine,
+                     count: int,
+                     password: str = "password",
+                     email_prefix: str = "bench",
+                     chunk_size: int = 10_000):
+    """
+    Inserts regular users `<email_prefix><i>@example.com` sharing one password.
+
+    The password is hashed once and the hash reused for every row.
+
+    Args:
+        engine (AsyncEngine): Engine of the database
+        count (int): Number of users
+        password (str): Password of every user
+        email_prefix (str): Prefix of the emails, must not clash with existing users
+        chunk_size (int): Rows per executemany
+
+    Returns:
+        list[tuple[int, str]]: Ids and emails of the created users
+    """
+    hashed_password = get_password_helper().hash(password)
+    columns = ("name", "email", "hashed_password", "is_active", "is_superuser", "is_verified")
+    statement = insert_statement(engine, User.__table__, columns)
+    async with engine.begin() as conn:
+        last_id = (await conn.execute(select(func.coalesce(func.max(User.id), 0)))).scalar_one()
+        for start in range(0, count, chunk_size):
+            rows = [(f"User {i}", f"{email_prefix}{i}@example.com", hashed_password, True, False, True)
+                    for i in range(start, min(count, start + chunk_size))]
+            await conn.exec_driver_sql(statement, rows)
+        result = await conn.execute(select(User.id, User.email).where(User.id > last_id).order_by(User.id))
+        return [tuple(row) for row in result]
+
+
+async def seed_tasks(engine: AsyncEngine,
+                     count: int,
+                     user_ids: list[int],
+                     seed: int = 0,
+                     statuses: dict[str, float] = STATUSES,
+                     name_length: tuple[int, int] | None = None,
+                     description_length: tuple[int, int] | None = None,
+                     chunk_size: int = 50_000):
+    """
+    Inserts tasks spread uniformly over the given users.
+
+    Args:
+        engine (AsyncEngine): Engine of the database
+        count (int): Number of tasks
+        user_ids (list[int]): Owners to pick from
+        seed (int): Seed of the random generator
+        statuses (dict[str, float]): Relative weight of every status
+        name_length (tuple[int, int] | None): Bounds of the name length, None for `Task <i>`
+        description_length (tuple[int, int] | None): Bounds of the description length,
+            None for `Description of task <i>`
+        chunk_size (int): Rows per executemany
+    """
+    rng = random.Random(seed)
+    names = TextGenerator(rng, *name_length) if name_length else None
+    descriptions = TextGenerator(rng, *description_length) if description_length else None
+    status_names = list(statuses)
+    status_weights = list(statuses.values())
+    statement = insert_statement(engine, Task.__table__, ("name", "description", "status", "user_id"))
+    async with engine.begin() as conn:
+        for start in range(0, count, chunk_size):
+            indexes = range(start, min(count, start + chunk_size))
+            rows = zip([names() for _ in indexes] if names else [f"Task {i}" for i in indexes],
+                       [descriptions() for _ in indexes] if descriptions
+                       else [f"Description of task {i}" for i in indexes],
+                       rng.choices(status_names, status_weights, k=len(indexes)),
+                       rng.choices(user_ids, k=len(indexes)))
+            await conn.exec_driver_sql(statement, list(rows))
+
+
+async def seed_admin(engine: AsyncEngine, email: str = "admin@example.com", password: str = "password"):
+    """
+    Inserts a superuser.
+
+    Args:
+        engine (AsyncEngine): Engine of the database
+        email (str): Email of the superuser
+        password (str): Password of the superuser
+    """
+    async with engine.begin() as conn:
+        await conn.execute(insert(User.__table__), [{"email": email,
+                                                      "hashed_password": get_password_helper().hash(password),
+                                                      "name": "Admin",
+                                                      "is_active": True,
+                                                      "is_superuser": True,
+                                                      "is_verified": True}])
+
+
+def parse_statuses(value: str) -> dict[str, float]:
+    """
+    Parses a status distribution such as `new=5,completed=1`.
+
+    Args:
+        value (str): Comma-separated `status=weight` pairs
+
+    Returns:
+        dict[str, float]: Weight of every status
+    """
+    statuses = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in STATUSES:
+            raise argparse.ArgumentTypeError(f"Unknown status {name!r}, expected one of {sorted(STATUSES)}")
+        statuses[name] = float(weight)
+    return statuses
+
+
+def parse_length(value: str) -> tuple[int, int]:
+    """
+    Parses a text length `n` or a range `min-max`.
+
+    Args:
+        value (str): The length or range
+
+    Returns:
+        tuple[int, int]: Lower and upper bound
+    """
+    low, _, high = value.partition("-")
+    bounds = (int(low), int(high or low))
+    if bounds[0] < 0 or bounds[0] > bounds[1]:
+        raise argparse.ArgumentTypeError(f"Invalid length {value!r}")
+    return bounds
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    started = time.perf_counter()
+    await create_schema(engine)
+    seeded = await seed_users(engine, args.users, args.password, args.email_prefix)
+    print(f"seeded {len(seeded)} users in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    if args.tasks:
+        started = time.perf_counter()
+        await seed_tasks(engine, args.tasks, [user_id for user_id, _ in seeded], args.seed, args.statuses,
+                         args.name_length, args.description_length, args.chunk_size)
+        elapsed = time.perf_counter() - started
+        print(f"seeded {args.tasks} tasks in {elapsed:.1f} s ({args.tasks / elapsed:,.0f} rows/s)", file=sys.stderr)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    from app.config import config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=config.DATABASE_URL, help="defaults to DATABASE_URL")
+    parser.add_argument("--users", type=int, default=1000, help="users to create")
+    parser.add_argument("--tasks", type=int, default=100_000, help="tasks to create, spread over the new users")
+    parser.add_argument("--statuses", type=parse_statuses, default=STATUSES,
+                        help="relative status weights, e.g. new=5,in_progress=3,completed=2")
+    parser.add_argument("--name-length", type=parse_length, help="task name length or min-max range")
+    parser.add_argument("--description-length", type=parse_length, help="task description length or min-max range")
+    parser.add_argument("--password", default="password", help="password of every user")
+    parser.add_argument("--email-prefix", default="user", help="users are <prefix><i>@example.com")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated tasks")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows per executemany")
+    args = parser.parse_args()
+    if args.users < 1 and args.tasks:
+        parser.error("tasks need at least one user")
+    asyncio.run(main(args))
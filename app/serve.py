@@ -0,0 +1,195 @@
+"""Production server entry point.
+
+    python -m app.serve
+
+Serves `app.main:app` with uvicorn, configured from `Config` (`SERVER_*`
+settings). With `SERVER_WORKERS` above 1, the process pre-forks: it imports
+the application and binds the listening socket once, then forks the
+workers, which accept connections on the shared socket. Workers that die
+are replaced; SIGTERM or SIGINT stops them gracefully.
+
+Nothing opens a database connection or starts a thread at import time, so
+forking after the import is safe. Each worker still resets the inherited
+engine pool (`dispose(close=False)`, as SQLAlchemy recommends after a fork)
+before serving, and its lifespan opens its own connections. Password
+hashing is calibrated once in the parent, before forking, so that every
+worker hashes with the same argon2 time cost.
+
+`SERVER_LOOP=auto` and `SERVER_HTTP=auto` use uvloop and httptools when
+they are installed, asyncio and h11 otherwise.
+"""
+
+import logging
+import os
+import signal
+import sys
+import time
+
+import uvicorn
+
+from .auth.hashing import calibrate_password_hashing
+from .config import config
+
+logger = logging.getLogger("uvicorn.error")
+
+STARTUP_FAILURE = 3
+"""Exit status of a uvicorn worker whose lifespan start-up failed."""
+
+
+def worker_count(workers: int) -> int:
+    """
+    Resolves the configured number of workers.
+
+    Args:
+        workers (int): `SERVER_WORKERS`, 0 for one worker per CPU
+
+    Returns:
+        int: Number of worker processes
+    """
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def build_config(app: str = "app.main:app") -> uvicorn.Config:
+    """
+    Builds the uvicorn configuration from `Config`.
+
+    Args:
+        app (str): Import string of the application
+
+    Returns:
+        uvicorn.Config: The configuration
+    """
+    return uvicorn.Config(app,
+                          host=config.SERVER_HOST,
+                          port=config.SERVER_PORT,
+                          loop=config.SERVER_LOOP,
+                          http=config.SERVER_HTTP,
+                          backlog=config.SERVER_BACKLOG,
+                          timeout_keep_alive=config.SERVER_KEEPALIVE_SECONDS,
+                          limit_concurrency=config.SERVER_LIMIT_CONCURRENCY,
+                          timeout_graceful_shutdown=int(config.SHUTDOWN_DRAIN_TIMEOUT_SECONDS),
+                          access_log=not config.ACCESS_LOG_ENABLED,
+                          log_level="info")
+
+
+def reset_after_fork():
+    """Drops the engine pool inherited from the parent without closing its connections."""
+    from .db import engine
+
+    engine.sync_engine.dispose(close=False)
+
+
+def calibrate_before_fork():
+    """
+    Calibrates password hashing for all the workers.
+
+    Workers calibrating on their own, concurrently on shared CPUs, could pick
+    different time costs and keep rehashing on login the hashes the others
+    created. The workers inherit the cost picked here, and their lifespan
+    skips calibration as the latency budget is cleared.
+    """
+    if config.PASSWORD_HASH_TARGET_MS:
+        time_cost = calibrate_password_hashing(config.PASSWORD_HASH_TARGET_MS)
+        logger.info("Calibrated password hashing to an argon2 time cost of %d", time_cost)
+        config.PASSWORD_HASH_TARGET_MS = None
+
+
+class PreforkServer:
+    """
+    Runs uvicorn in forked workers sharing one listening socket.
+
+    Attributes:
+        config (uvicorn.Config): Configuration of every worker
+        workers (int): Number of worker processes
+        pids (set[int]): Running workers
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.pids = set()
+        self.stopping = False
+        self.socket = None
+
+    def run(self):
+        """
+        Imports the application, binds the socket and supervises the workers until stopped.
+
+        Returns:
+            int: Exit status, `STARTUP_FAILURE` if a worker could not start
+        """
+        self.config.load()
+        calibrate_before_fork()
+        self.socket = self.config.bind_socket()
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        logger.info("Starting %d workers", self.workers)
+        for _ in range(self.workers):
+            self.spawn()
+        exit_code = 0
+        while self.pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            self.pids.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if self.stopping:
+                continue
+            if code == STARTUP_FAILURE:
+                # Restarting would fail the same way.
+                logger.error("Worker %d failed to start, stopping", pid)
+                exit_code = STARTUP_FAILURE
+                self._stop(signal.SIGTERM, None)
+                continue
+            logger.warning("Worker %d exited with status %d, starting a new one", pid, code)
+            time.sleep(0.1)
+            self.spawn()
+        self.socket.close()
+        return exit_code
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.pids.add(pid)
+            return
+        # Worker: serve until uvicorn's own signal handlers stop it.
+        status = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            reset_after_fork()
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self.socket])
+            if not server.started:
+                status = STARTUP_FAILURE
+        except SystemExit as exit:
+            status = exit.code if isinstance(exit.code, int) else 1
+        except BaseException:
+            logger.exception("Worker %d failed", os.getpid())
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main() -> int:
+    """Serves the application with the configured number of workers."""
+    server_config = build_config()
+    workers = worker_count(config.SERVER_WORKERS)
+    if workers == 1:
+        server = uvicorn.Server(server_config)
+        server.run()
+        return 0 if server.started else STARTUP_FAILURE
+    return PreforkServer(server_config, workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
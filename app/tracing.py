@@ -0,0 +1,383 @@
+"""Lightweight request tracing.
+
+A sampled request gets a root span opened by `TracingMiddleware`. Child spans
+are opened around route handlers (`TracedRoute`), manager and repository
+methods (`trace_methods`) and SQL statements (`trace_engine`), each parented
+to the span stored in the `current_span` context variable. When the root span
+ends, the spans of the request are exported in the OTLP/JSON format of
+OpenTelemetry, one `ExportTraceServiceRequest` per line of a local file or
+POSTed to a collector URL, by a background thread.
+
+Sampling is decided once per request with probability `TRACING_SAMPLE_RATE`
+(0 disables tracing). In requests that are not sampled, every instrumented
+call costs a context variable lookup.
+
+This module only depends on the configuration so managers and repositories
+can import it without import cycles.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_ERROR = 2
+
+
+def otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    """
+    One timed operation of a trace.
+
+    Attributes:
+        trace (list[Span]): Spans of the request, shared by all its spans
+        trace_id (str): 32 hex digit id of the trace
+        span_id (str): 16 hex digit id of the span
+        parent_id (str | None): Id of the parent span, None for the root
+        name (str): Operation name
+        kind (int): OTLP span kind
+        attributes (dict): Span attributes
+        error (bool): Whether the operation raised
+    """
+
+    __slots__ = ("trace", "trace_id", "span_id", "parent_id", "name", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, kind: int = SPAN_KIND_INTERNAL, attributes=None):
+        self.trace = parent.trace if parent is not None else []
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.error = False
+        self.start = time.time_ns()
+        self.end = None
+
+    def finish(self):
+        self.end = time.time_ns()
+        self.trace.append(self)
+
+    def to_otlp(self) -> dict:
+        span = {"traceId": self.trace_id,
+                "spanId": self.span_id,
+                "name": self.name,
+                "kind": self.kind,
+                "startTimeUnixNano": str(self.start),
+                "endTimeUnixNano": str(self.end),
+                "attributes": [{"key": key, "value": otlp_value(value)} for key, value in self.attributes.items()],
+                "status": {"code": STATUS_ERROR} if self.error else {}}
+        if self.parent_id is not None:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+"""Innermost open span of the current request, None if it is not traced."""
+
+
+class ActiveSpan:
+    """Context manager opening a child span of the current span and making it current."""
+
+    __slots__ = ("span", "token")
+
+    def __init__(self, name: str, parent: Span, kind: int = SPAN_KIND_INTERNAL, attributes=None):
+        self.span = Span(name, parent, kind, attributes)
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        current_span.reset(self.token)
+        if exc_type is not None:
+            self.span.error = True
+        self.span.finish()
+
+
+class NoopSpan:
+    """Context manager used when the request is not traced."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def span(name: str, **attributes):
+    """
+    Opens a span in the current trace, if the request is traced.
+
+    Args:
+        name (str): Operation name
+        **attributes: Span attributes
+
+    Returns:
+        ActiveSpan | NoopSpan: Context manager yielding the span, or None if not traced
+    """
+    parent = current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return ActiveSpan(name, parent, attributes=attributes)
+
+
+def traced(name: str):
+    """
+    Decorator opening a span around every call of a coroutine function.
+
+    Functions that are already traced are returned unchanged, so routes copied
+    by `include_router` and inherited methods are not traced twice.
+
+    Args:
+        name (str): Operation name
+
+    Returns:
+        Callable: The decorator
+    """
+    def decorator(func):
+        if getattr(func, "__traced__", False):
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            parent = current_span.get()
+            if parent is None:
+                return await func(*args, **kwargs)
+            with ActiveSpan(name, parent):
+                return await func(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def trace_methods(cls):
+    """
+    Class decorator tracing every public coroutine method, including inherited ones.
+
+    Spans are named `<class>.<method>`.
+
+    Args:
+        cls (type): The class
+
+    Returns:
+        type: The same class
+    """
+    for name in dir(cls):
+        if name.startswith("_"):
+            continue
+        method = inspect.getattr_static(cls, name)
+        if inspect.isfunction(method) and inspect.iscoroutinefunction(method):
+            setattr(cls, name, traced(f"{cls.__name__}.{name}")(method))
+    return cls
+
+
+class SpanExporter:
+    """
+    Writes finished traces in OTLP/JSON from a background thread.
+
+    Attributes:
+        target (str): Path of a JSON lines file, or an http(s) URL of an OTLP/HTTP collector
+        exported (int): Traces written
+        dropped (int): Traces dropped because the queue was full or the write failed
+    """
+
+    def __init__(self, target: str, service_name: str, queue_size: int = 1000):
+        self.target = target
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.exported = 0
+        self.dropped = 0
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def export(self, spans: list[Span]):
+        """
+        Queues the spans of one trace, never blocking.
+
+        Args:
+            spans (list[Span]): Finished spans
+        """
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self.thread.start()
+        try:
+            self.queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def encode(self, spans: list[Span]) -> str:
+        return json.dumps({"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": [span.to_otlp() for span in spans]}],
+        }]})
+
+    def write(self, body: str):
+        if self.target.startswith(("http://", "https://")):
+            import urllib.request
+
+            request = urllib.request.Request(self.target, body.encode(), {"Content-Type": "application/json"})
+            urllib.request.urlopen(request, timeout=5).close()
+        else:
+            with open(self.target, "a") as output:
+                output.write(body + "\n")
+
+    def shutdown(self):
+        """Writes the queued traces and stops the thread."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while True:
+            spans = self.queue.get()
+            if spans is None:
+                return
+            try:
+                self.write(self.encode(spans))
+                self.exported += 1
+            except Exception:
+                self.dropped += 1
+                logger.exception("Exporting a trace to %s failed", self.target)
+
+
+class Tracer:
+    """
+    Samples requests and exports their traces.
+
+    Attributes:
+        sample_rate (float): Probability of tracing a request
+        exporter (SpanExporter): Destination of the traces
+    """
+
+    def __init__(self, sample_rate: float, exporter: SpanExporter):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and (self.sample_rate >= 1 or random.random() < self.sample_rate)
+
+
+tracer = Tracer(config.TRACING_SAMPLE_RATE,
+                SpanExporter(config.TRACING_EXPORT, config.TRACING_SERVICE_NAME))
+
+
+class TracingMiddleware:
+    """Opens the root span of sampled requests and exports the trace when they end."""
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.tracer.should_sample():
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(f"{scope['method']} {scope['path']}", kind=SPAN_KIND_SERVER,
+                    attributes={"http.request.method": scope["method"], "url.path": scope["path"]})
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_span.set(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            root.error = True
+            raise
+        finally:
+            current_span.reset(token)
+            route = getattr(scope.get("route"), "path_format", None)
+            if route is not None:
+                root.name = f"{scope['method']} {route}"
+                root.attributes["http.route"] = route
+            root.attributes["http.response.status_code"] = status
+            root.error = root.error or status >= 500
+            root.finish()
+            self.tracer.exporter.export(root.trace)
+
+
+class TracedRoute(APIRoute):
+    """Route class opening a span around the endpoint, separating it from dependencies and serialization."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = traced(f"handler {endpoint.__name__}")(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span.get()
+    if parent is not None:
+        conn.info["trace_span"] = Span(f"SQL {statement.split(None, 1)[0]}", parent, SPAN_KIND_CLIENT,
+                                       {"db.system": conn.dialect.name, "db.statement": statement})
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    sql_span = conn.info.pop("trace_span", None)
+    if sql_span is not None:
+        sql_span.finish()
+
+
+def _handle_error(context):
+    # A failing statement never reaches `after_cursor_execute`.
+    connection = context.connection
+    sql_span = connection.info.pop("trace_span", None) if connection is not None else None
+    if sql_span is not None:
+        sql_span.error = True
+        sql_span.finish()
+
+
+def trace_engine(engine):
+    """
+    Opens a span around every SQL statement an engine executes in a traced request.
+
+    Statements that raise are finished as failed spans.
+
+    Args:
+        engine (AsyncEngine): The engine. Instrumenting twice has no effect.
+    """
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
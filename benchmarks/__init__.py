@@ -0,0 +1,8 @@
+"""
+Performance benchmarks.
+
+Benchmarks are plain scripts, not part of the test suite. Run them from the
+project root with the usual environment variables set, e.g.:
+
+    poetry run python -m benchmarks.auth_tokens
+"""
@@ -0,0 +1,70 @@
+"""Auth overhead per request with and without the verified-token cache.
+
+Measures `read_token` for a single reused access token, the way a client
+replays its token for every request. The user manager is an in-memory stand-in
+so only token handling is timed.
+
+    python -m benchmarks.auth_tokens --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.auth.revocation import RevocationStore
+from app.auth.tokens import CachedJWTStrategy, TokenCache
+from app.models import User
+
+
+class InMemoryUserManager:
+    """User manager stand-in returning a fixed user without touching the database."""
+
+    def __init__(self, user: User):
+        self.user = user
+
+    def parse_id(self, value):
+        return int(value)
+
+    async def get(self, user_id):
+        return self.user
+
+
+async def measure(cache_size: int, requests: int) -> float:
+    """
+    Times `read_token` calls for one reused token.
+
+    Args:
+        cache_size (int): Size of the token cache, 0 disables it
+        requests (int): Number of simulated requests
+
+    Returns:
+        float: Mean auth overhead per request in microseconds
+    """
+    user = User(id=1, email="bench@example.com", is_active=True)
+    strategy = CachedJWTStrategy(secret="benchmark-secret",
+                                 lifetime_seconds=3600,
+                                 cache=TokenCache(cache_size),
+                                 revocations=RevocationStore())
+    user_manager = InMemoryUserManager(user)
+    token = await strategy.write_token(user)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        assert await strategy.read_token(token, user_manager) is user
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int):
+    uncached = await measure(0, requests)
+    cached = await measure(1024, requests)
+    print(f"requests:      {requests}")
+    print(f"without cache: {uncached:8.2f} us/request")
+    print(f"with cache:    {cached:8.2f} us/request")
+    print(f"speedup:       {uncached / cached:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="number of simulated requests")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
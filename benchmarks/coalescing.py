@@ -0,0 +1,108 @@
+"""Bursts of identical `GET /tasks/` requests, with and without coalescing.
+
+Seeds one user with many tasks, then, in a fresh interpreter per
+configuration (`TASK_READ_COALESCING=true` and `false`), logs in and sends
+bursts of concurrent `GET /tasks/` requests of that user through an ASGI
+transport, like clients polling at the top of the minute. Reports the time to
+serve a whole burst, the p95 request latency and the task queries run.
+
+    python -m benchmarks.coalescing --clients 200 --bursts 10 --tasks 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.load import percentile
+
+PASSWORD = "password"
+
+
+async def seed(database_url: str, tasks: int):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.seed import create_schema, seed_tasks, seed_users
+
+    engine = create_async_engine(database_url)
+    await create_schema(engine)
+    seeded = await seed_users(engine, 1, PASSWORD, email_prefix="coalescing")
+    await seed_tasks(engine, tasks, [user_id for user_id, _ in seeded])
+    await engine.dispose()
+    return seeded[0][1]
+
+
+async def measure(email: str, clients: int, bursts: int) -> dict:
+    """
+    Starts the application and sends the bursts.
+
+    Returns:
+        dict: Median burst duration and p95 request latency in milliseconds, task queries run
+    """
+    import httpx
+    from app.main import app
+    from app.managers.coalescing import coalesced_calls_total
+
+    burst_durations, latencies = [], []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://coalescing") as client:
+            response = await client.post("/auth/jwt/login", data={"username": email, "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            async def get():
+                started = time.perf_counter()
+                response = await client.get("/tasks/", headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+            for _ in range(bursts):
+                started = time.perf_counter()
+                await asyncio.gather(*(get() for _ in range(clients)))
+                burst_durations.append(time.perf_counter() - started)
+
+    latencies.sort()
+    burst_durations.sort()
+    leaders = coalesced_calls_total.values.get(("get_tasks", "leader"))
+    return {"burst_ms": burst_durations[len(burst_durations) // 2] * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "queries": leaders if leaders is not None else clients * bursts}
+
+
+def run_worker(coalescing: bool, env: dict, email: str, args) -> dict:
+    env = dict(env, TASK_READ_COALESCING="true" if coalescing else "false")
+    output = subprocess.run([sys.executable, "-m", "benchmarks.coalescing", "--worker", email,
+                             "--clients", str(args.clients), "--bursts", str(args.bursts)],
+                            env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite+aiosqlite:///{directory}/coalescing.db"
+        env = dict(os.environ, DATABASE_URL=database_url, ACCESS_LOG_ENABLED="false",
+                   LOOP_LAG_MONITOR_ENABLED="false")
+        env.setdefault("JWT_SECRET_KEY", "coalescing-secret")
+        email = asyncio.run(seed(database_url, args.tasks))
+        results = {coalescing: run_worker(coalescing, env, email, args) for coalescing in (False, True)}
+
+    print(f"{'coalescing':<12}{'burst ms':>12}{'p95 ms':>12}{'queries':>10}")
+    for coalescing, result in results.items():
+        print(f"{'on' if coalescing else 'off':<12}{result['burst_ms']:>12.1f}{result['p95_ms']:>12.1f}"
+              f"{result['queries']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="concurrent requests per burst")
+    parser.add_argument("--bursts", type=int, default=10, help="bursts sent")
+    parser.add_argument("--tasks", type=int, default=200, help="tasks of the user")
+    parser.add_argument("--worker", metavar="EMAIL", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(asyncio.run(measure(args.worker, args.clients, args.bursts))))
+    else:
+        main(args)
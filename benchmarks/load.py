@@ -0,0 +1,324 @@
+"""End-to-end load test of the API.
+
+Seeds a fresh SQLite database, then runs concurrent virtual users against the
+application, either in-process through an ASGI transport or against a local
+uvicorn process. Every virtual user logs in as its own seeded user and loops
+over a weighted mix of operations until the duration elapses.
+
+Per-endpoint latency percentiles and throughput are written to a JSON report.
+When a baseline report is given, the run fails if any endpoint got slower
+(p95) or slower to serve (requests per second) beyond the tolerance.
+
+    python -m benchmarks.load --target asgi --users 20 --duration 30 --output load.json
+    python -m benchmarks.load --target uvicorn --baseline load.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+DEFAULT_MIX = "login=5,list=35,get=25,create=15,update=15,delete=5"
+OPERATIONS = {"login", "list", "get", "create", "update", "delete"}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """
+    Parses an operation mix such as `login=5,list=40`.
+
+    Args:
+        value (str): Comma-separated `operation=weight` pairs
+
+    Returns:
+        dict[str, int]: Weight of every operation
+    """
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}, expected one of {sorted(OPERATIONS)}")
+        mix[name] = int(weight)
+    return mix
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted samples.
+
+    Args:
+        samples (list[float]): Samples sorted in ascending order
+        fraction (float): Percentile between 0 and 1
+
+    Returns:
+        float: The percentile, 0 for no samples
+    """
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1, round(fraction * len(samples)) - 1))
+    return samples[rank]
+
+
+class Recorder:
+    """Collects latencies and errors per endpoint template."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint: str, started: float, response: httpx.Response | None):
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        if response is None or response.status_code >= 400:
+            self.errors[endpoint] += 1
+
+    def report(self, duration: float) -> dict:
+        """
+        Summarizes the run.
+
+        Args:
+            duration (float): Wall time of the run in seconds
+
+        Returns:
+            dict: Per-endpoint and total count, errors, rps and p50/p95/p99 in milliseconds
+        """
+        def summarize(samples, errors):
+            samples = sorted(samples)
+            return {"count": len(samples),
+                    "errors": errors,
+                    "rps": len(samples) / duration,
+                    "p50_ms": percentile(samples, 0.50),
+                    "p95_ms": percentile(samples, 0.95),
+                    "p99_ms": percentile(samples, 0.99)}
+
+        endpoints = {endpoint: summarize(samples, self.errors[endpoint])
+                     for endpoint, samples in sorted(self.latencies.items())}
+        total = summarize([latency for samples in self.latencies.values() for latency in samples],
+                          sum(self.errors.values()))
+        return {"endpoints": endpoints, "total": total}
+
+
+class VirtualUser:
+    """One simulated client holding its own token and the tasks it created."""
+
+    def __init__(self, client: httpx.AsyncClient, email: str, password: str, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.recorder = recorder
+        self.rng = rng
+        self.headers = {}
+        self.task_ids = []
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.recorder.record(endpoint, started, response)
+        return response
+
+    async def login(self):
+        started = time.perf_counter()
+        response = await self.client.post("/auth/jwt/login",
+                                          data={"username": self.email, "password": self.password})
+        self.recorder.record("POST /auth/jwt/login", started, response)
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def list(self):
+        await self.request("GET /tasks/", "GET", "/tasks/")
+
+    async def get(self):
+        if not self.task_ids:
+            return await self.create()
+        await self.request("GET /tasks/{task_id}", "GET", f"/tasks/{self.rng.choice(self.task_ids)}")
+
+    async def create(self):
+        response = await self.request("POST /tasks/", "POST", "/tasks/",
+                                      json={"name": "Load task", "description": "Created by the load test"})
+        if response is not None and response.status_code == 200:
+            self.task_ids.append(response.json()["id"])
+
+    async def update(self):
+        if not self.task_ids:
+            return await self.create()
+        await self.request("PUT /tasks/{task_id}", "PUT", f"/tasks/{self.rng.choice(self.task_ids)}",
+                           json={"status": self.rng.choice(["new", "in_progress", "completed"])})
+
+    async def delete(self):
+        if not self.task_ids:
+            return await self.create()
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        await self.request("DELETE /tasks/{task_id}", "DELETE", f"/tasks/{task_id}")
+
+    async def run(self, mix: dict[str, int], deadline: float):
+        await self.login()
+        operations = list(mix)
+        weights = [mix[operation] for operation in operations]
+        while time.perf_counter() < deadline:
+            operation = self.rng.choices(operations, weights)[0]
+            await getattr(self, operation)()
+
+
+async def seed_database(database_url: str, users: int, tasks: int, password: str):
+    """
+    Creates the schema and the dataset.
+
+    Args:
+        database_url (str): URL of an empty database
+        users (int): Number of users
+        tasks (int): Number of tasks spread over the users
+        password (str): Password of every user
+
+    Returns:
+        list[tuple[int, str]]: Ids and emails of the seeded users
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.seed import create_schema, seed_tasks, seed_users
+
+    engine = create_async_engine(database_url)
+    await create_schema(engine)
+    seeded = await seed_users(engine, users, password)
+    await seed_tasks(engine, tasks, [user_id for user_id, _ in seeded])
+    await engine.dispose()
+    return seeded
+
+
+async def drive(client: httpx.AsyncClient, seeded, args) -> dict:
+    """
+    Runs the virtual users against a client and summarizes the run.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the application
+        seeded (list[tuple[int, str]]): Seeded users to log in as
+        args (argparse.Namespace): Parsed command line
+
+    Returns:
+        dict: The report
+    """
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    virtual_users = [VirtualUser(client, seeded[i % len(seeded)][1], args.password, recorder, random.Random(args.seed + i))
+                     for i in range(args.users)]
+    await asyncio.gather(*(virtual_user.run(args.mix, deadline) for virtual_user in virtual_users))
+    return recorder.report(time.perf_counter() - started)
+
+
+async def run_asgi(args, seeded) -> dict:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+            return await drive(client, seeded, args)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(args, seeded) -> dict:
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app",
+                               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+                              env=os.environ.copy())
+    try:
+        limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/docs")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not start")
+            return await drive(client, seeded, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Lists endpoints that regressed against a baseline report.
+
+    Args:
+        report (dict): Report of this run
+        baseline (dict): Stored baseline report
+        tolerance (float): Allowed relative degradation, e.g. 0.2 for 20%
+
+    Returns:
+        list[str]: One message per regression, empty if none
+    """
+    regressions = []
+    for endpoint, stats in report["endpoints"].items():
+        reference = baseline["endpoints"].get(endpoint)
+        if reference is None:
+            continue
+        if stats["p95_ms"] > reference["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {stats['p95_ms']:.2f} ms > baseline {reference['p95_ms']:.2f} ms")
+        if stats["rps"] < reference["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: {stats['rps']:.1f} rps < baseline {reference['rps']:.1f} rps")
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"{'endpoint':<28}{'count':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for endpoint, stats in rows:
+        print(f"{endpoint:<28}{stats['count']:>8}{stats['errors']:>8}{stats['rps']:>10.1f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+
+async def main(args) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite+aiosqlite:///{directory}/load.db"
+        os.environ["DATABASE_URL"] = database_url
+        os.environ.setdefault("JWT_SECRET_KEY", "load-test-secret")
+
+        seeded = await seed_database(database_url, args.seed_users, args.seed_tasks, args.password)
+        run = run_asgi if args.target == "asgi" else run_uvicorn
+        report = await run(args, seeded)
+
+    report["config"] = {"target": args.target, "users": args.users, "duration": args.duration,
+                        "mix": args.mix, "seed_users": args.seed_users, "seed_tasks": args.seed_tasks}
+    print_report(report)
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(report, json.load(baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi", help="in-process ASGI app or local uvicorn")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"operation weights, default {DEFAULT_MIX}")
+    parser.add_argument("--seed-users", type=int, default=50, help="users seeded before the run")
+    parser.add_argument("--seed-tasks", type=int, default=5000, help="tasks seeded before the run")
+    parser.add_argument("--password", default="password", help="password of the seeded users")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the virtual users' random choices")
+    parser.add_argument("--output", default="load.json", help="JSON report to write")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression against the baseline")
+    sys.exit(asyncio.run(main(parser.parse_args())))
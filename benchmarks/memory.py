@@ -0,0 +1,205 @@
+"""Memory footprint of the read path at increasing row counts.
+
+For every size, the database is reseeded with that many users and tasks and
+each list/export endpoint is called in-process through an ASGI transport,
+along with `TaskManager.get_all_tasks` directly. For every call the peak of
+Python allocations (tracemalloc) and the growth of the process peak RSS are
+recorded and divided by the number of rows the call covers.
+
+The run fails when any measurement exceeds the per-row budget, so memory
+regressions on the read path are caught before deploy. Peak RSS is reset
+between calls through /proc/self/clear_refs and is only reported on Linux.
+The response body is buffered by the in-process client and counts towards
+the peaks, as it would in a proxy buffering the response.
+
+    python -m benchmarks.memory --sizes 1000,10000,100000 --budget-bytes-per-row 8192
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import httpx
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "password"
+
+
+def read_status(field: str) -> int | None:
+    """
+    Reads a memory field of /proc/self/status.
+
+    Args:
+        field (str): Field name such as `VmRSS` or `VmHWM`
+
+    Returns:
+        int | None: Value in bytes, None where /proc is unavailable
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak RSS of the process to its current RSS.
+
+    Returns:
+        bool: True if the peak could be reset
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+async def measure(call, rows: int) -> dict:
+    """
+    Runs one call and records its memory peaks.
+
+    Args:
+        call (Callable): Coroutine function performing the call
+        rows (int): Number of rows the call covers
+
+    Returns:
+        dict: Rows, tracemalloc peak and RSS growth in bytes, and both per row
+    """
+    gc.collect()
+    rss_tracked = reset_peak_rss()
+    rss_before = read_status("VmRSS")
+
+    tracemalloc.start()
+    await call()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rss_peak = read_status("VmHWM")
+    rss_growth = max(0, rss_peak - rss_before) if rss_tracked and rss_peak and rss_before else None
+    rows = max(1, rows)
+    return {"rows": rows,
+            "traced_peak_bytes": traced_peak,
+            "traced_bytes_per_row": traced_peak / rows,
+            "rss_growth_bytes": rss_growth,
+            "rss_bytes_per_row": rss_growth / rows if rss_growth is not None else None}
+
+
+async def benchmark_size(size: int, client: httpx.AsyncClient) -> dict:
+    """
+    Reseeds the database with `size` users and tasks and measures every read.
+
+    Args:
+        size (int): Number of users and of tasks
+        client (httpx.AsyncClient): Client bound to the application
+
+    Returns:
+        dict: Measurement name -> measurements
+    """
+    from app.db import async_session_maker, engine
+    from app.managers.task import TaskManager
+    from app.models import Task, User
+    from app.repositories import TaskRepository
+    from app.seed import create_schema, drop_schema, seed_admin, seed_tasks, seed_users
+
+    await drop_schema(engine)
+    await create_schema(engine)
+    await seed_admin(engine, ADMIN_EMAIL, ADMIN_PASSWORD)
+    seeded = await seed_users(engine, size)
+    await seed_tasks(engine, size, [user_id for user_id, _ in seeded])
+
+    response = await client.post("/auth/jwt/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def get(url):
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+
+    async def get_all_tasks():
+        async with async_session_maker() as session:
+            await TaskManager(TaskRepository(session, Task, User)).get_all_tasks()
+
+    users = size + 1
+    return {
+        "GET /tasks/": await measure(lambda: get("/tasks/"), size),
+        "GET /users?limit=1000": await measure(lambda: get("/users?limit=1000"), min(1000, users)),
+        "GET /users/export": await measure(lambda: get("/users/export"), users),
+        "TaskManager.get_all_tasks": await measure(get_all_tasks, size),
+    }
+
+
+def over_budget(report: dict, budget: float) -> list[str]:
+    """
+    Lists measurements whose memory per row exceeds the budget.
+
+    Args:
+        report (dict): Size -> measurement name -> measurements
+        budget (float): Allowed bytes per row
+
+    Returns:
+        list[str]: One message per violation, empty if none
+    """
+    violations = []
+    for size, measurements in report.items():
+        for name, stats in measurements.items():
+            for key in ("traced_bytes_per_row", "rss_bytes_per_row"):
+                if stats[key] is not None and stats[key] > budget:
+                    violations.append(f"{name} at {size} rows: {key} {stats[key]:.0f} > {budget:.0f}")
+    return violations
+
+
+def print_report(report: dict):
+    print(f"{'size':>9}  {'call':<28}{'rows':>9}{'traced peak KiB':>17}{'B/row':>9}{'RSS growth KiB':>16}{'B/row':>9}")
+    for size, measurements in report.items():
+        for name, stats in measurements.items():
+            rss = stats["rss_growth_bytes"]
+            rss_kib = f"{rss / 1024:.1f}" if rss is not None else "n/a"
+            rss_per_row = f"{stats['rss_bytes_per_row']:.0f}" if rss is not None else "n/a"
+            print(f"{size:>9}  {name:<28}{stats['rows']:>9}{stats['traced_peak_bytes'] / 1024:>17.1f}"
+                  f"{stats['traced_bytes_per_row']:>9.0f}{rss_kib:>16}{rss_per_row:>9}")
+
+
+async def main(args) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{directory}/memory.db"
+        os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+        from app.db import engine
+        from app.main import app
+        from app.seed import create_schema
+
+        await create_schema(engine)
+        report = {}
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://memory") as client:
+                for size in args.sizes:
+                    report[size] = await benchmark_size(size, client)
+        await engine.dispose()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    violations = over_budget(report, args.budget_bytes_per_row)
+    for violation in violations:
+        print(f"OVER BUDGET {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[1_000, 10_000, 100_000], help="comma-separated numbers of users and tasks")
+    parser.add_argument("--budget-bytes-per-row", type=float, default=8192, help="allowed peak memory per row")
+    parser.add_argument("--output", help="JSON report to write")
+    sys.exit(asyncio.run(main(parser.parse_args())))
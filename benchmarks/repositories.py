@@ -0,0 +1,236 @@
+"""Microbenchmarks of the repository layer across dataset sizes.
+
+For every size, a temporary SQLite database is seeded with that many tasks
+(spread over `size / 100` users) and every `TaskRepository` method, plus the
+`UserRepository` reads, is called repeatedly, each call on a fresh session
+the way a request would. Latency is measured in a plain pass; allocations
+are measured in a separate pass under tracemalloc so tracing does not skew
+the timings.
+
+Full-table reads (`get_all_tasks`, `get_all`) load every row and are run a
+couple of times only; skip them with `--skip` on large sizes if memory is
+tight.
+
+    python -m benchmarks.repositories --sizes 1000,100000,1000000 --output repositories.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+FULL_SCANS = {"get_all_tasks", "get_all_users"}
+
+
+async def load_targets(session_maker, size: int, count: int, rng: random.Random):
+    """
+    Picks the tasks the operations will read, update and delete, with their owners.
+
+    Deletes consume the lowest ids in order so every delete hits an existing row;
+    reads and updates pick from the upper half, which is never deleted.
+
+    Args:
+        session_maker (async_sessionmaker): Factory of sessions
+        size (int): Number of seeded tasks
+        count (int): Number of targets of each kind
+        rng (random.Random): Random generator picking ids
+
+    Returns:
+        tuple[list[tuple[int, int]], list[tuple[int, int]]]: (id, owner) of tasks to read/update
+            and of tasks to delete
+    """
+    from sqlalchemy import select
+    from app.models import Task
+
+    read_ids = [rng.randint(size // 2 + 1, size) for _ in range(count)]
+    async with session_maker() as session:
+        owners = dict((await session.execute(select(Task.id, Task.user_id).where(Task.id.in_(set(read_ids))))).all())
+        deletes = (await session.execute(select(Task.id, Task.user_id).where(Task.id <= min(count, size // 2))
+                                         .order_by(Task.id))).all()
+    return [(task_id, owners[task_id]) for task_id in read_ids], [tuple(row) for row in deletes]
+
+
+def build_operations(user_ids: list[int], reads: list, deletes: list, rng: random.Random):
+    """
+    Describes every benchmarked call.
+
+    Args:
+        user_ids (list[int]): Ids of the seeded users
+        reads (list[tuple[int, int]]): (id, owner) of tasks to read and update
+        deletes (list[tuple[int, int]]): (id, owner) of tasks to delete, consumed in order
+        rng (random.Random): Random generator picking ids
+
+    Returns:
+        dict[str, Callable]: Operation name -> coroutine function taking (task_repository, user_repository)
+    """
+    from app.schemas import TaskCreate, TaskUpdate
+
+    delete_targets = iter(deletes)
+    update = TaskUpdate(status="in_progress")
+
+    async def create_task(tasks, users):
+        await tasks.create_task(TaskCreate(name="Benchmark", description="Benchmark task", user_id=rng.choice(user_ids)))
+
+    async def get_tasks(tasks, users):
+        await tasks.get_tasks(rng.choice(user_ids))
+
+    async def get_all_tasks(tasks, users):
+        await tasks.get_all_tasks()
+
+    async def get_task_by_id(tasks, users):
+        await tasks.get_task_by_id(*rng.choice(reads))
+
+    async def get_specific_task_by_id(tasks, users):
+        await tasks.get_specific_task_by_id(rng.choice(reads)[0])
+
+    async def update_task(tasks, users):
+        task_id, user_id = rng.choice(reads)
+        await tasks.update_task(task_id, update, user_id)
+
+    async def update_specific_task(tasks, users):
+        await tasks.update_specific_task(rng.choice(reads)[0], update)
+
+    async def delete_task(tasks, users):
+        await tasks.delete_task(*next(delete_targets))
+
+    async def delete_specific_task(tasks, users):
+        await tasks.delete_specific_task(next(delete_targets)[0])
+
+    async def get_user(tasks, users):
+        await users.get(rng.choice(user_ids))
+
+    async def get_all_users(tasks, users):
+        await users.get_all()
+
+    return {operation.__name__: operation for operation in (
+        create_task, get_tasks, get_all_tasks, get_task_by_id, get_specific_task_by_id,
+        update_task, update_specific_task, delete_task, delete_specific_task, get_user, get_all_users,
+    )}
+
+
+async def call(session_maker, operation):
+    from app.models import Task, User
+    from app.repositories import TaskRepository, UserRepository
+
+    async with session_maker() as session:
+        await operation(TaskRepository(session, Task, User), UserRepository(session, User))
+
+
+async def measure(session_maker, operation, iterations: int) -> dict:
+    """
+    Times an operation, then measures its allocations.
+
+    Args:
+        session_maker (async_sessionmaker): Factory of fresh sessions
+        operation (Callable): Coroutine function taking the repositories
+        iterations (int): Number of timed calls
+
+    Returns:
+        dict: Latency mean/p50/p95 in milliseconds, mean allocated and peak KiB per call
+    """
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call(session_maker, operation)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    allocation_calls = max(1, min(iterations, 20))
+    allocated = []
+    peaks = []
+    tracemalloc.start()
+    for _ in range(allocation_calls):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        await call(session_maker, operation)
+        after, peak = tracemalloc.get_traced_memory()
+        allocated.append(max(0, after - before) / 1024)
+        peaks.append((peak - before) / 1024)
+    tracemalloc.stop()
+
+    return {"iterations": iterations,
+            "mean_ms": statistics.fmean(latencies),
+            "p50_ms": latencies[len(latencies) // 2],
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "retained_kib": statistics.fmean(allocated),
+            "peak_kib": statistics.fmean(peaks)}
+
+
+async def benchmark_size(size: int, args) -> dict:
+    """
+    Seeds a fresh database with `size` tasks and measures every operation.
+
+    Args:
+        size (int): Number of tasks
+        args (argparse.Namespace): Parsed command line
+
+    Returns:
+        dict: Operation name -> measurements
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.seed import create_schema, seed_tasks, seed_users
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/repositories.db")
+        await create_schema(engine)
+        started = time.perf_counter()
+        seeded = await seed_users(engine, max(10, size // 100))
+        user_ids = [user_id for user_id, _ in seeded]
+        await seed_tasks(engine, size, user_ids, seed=args.seed)
+        print(f"seeded {size} tasks in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        rng = random.Random(args.seed)
+        # Each delete operation runs its timed calls plus up to 20 traced calls.
+        reads, deletes = await load_targets(session_maker, size, 2 * (args.iterations + 20), rng)
+        operations = build_operations(user_ids, reads, deletes, rng)
+        results = {}
+        for name, operation in operations.items():
+            if name in args.skip:
+                continue
+            iterations = args.full_scan_iterations if name in FULL_SCANS else args.iterations
+            results[name] = await measure(session_maker, operation, iterations)
+            print(f"{size:>9} {name:<24}{results[name]['mean_ms']:>10.3f} ms"
+                  f"{results[name]['peak_kib']:>12.1f} KiB peak", file=sys.stderr)
+        await engine.dispose()
+    return results
+
+
+def print_report(report: dict):
+    print(f"{'size':>9}  {'operation':<24}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'retained KiB':>14}{'peak KiB':>12}")
+    for size, operations in report.items():
+        for name, stats in operations.items():
+            print(f"{size:>9}  {name:<24}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                  f"{stats['retained_kib']:>14.1f}{stats['peak_kib']:>12.1f}")
+
+
+async def main(args):
+    os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+    report = {}
+    for size in args.sizes:
+        report[size] = await benchmark_size(size, args)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[1_000, 100_000, 1_000_000], help="comma-separated numbers of tasks")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per operation")
+    parser.add_argument("--full-scan-iterations", type=int, default=2, help="timed calls of full-table reads")
+    parser.add_argument("--skip", type=lambda value: set(value.split(",")), default=set(),
+                        help="comma-separated operations to skip")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the dataset and of the picked ids")
+    parser.add_argument("--output", help="JSON report to write")
+    asyncio.run(main(parser.parse_args()))
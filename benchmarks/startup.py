@@ -0,0 +1,106 @@
+"""Worker start-up time and first-request latency, with and without warm-up.
+
+Every run is a fresh interpreter, like a new worker: it imports app.main,
+runs the lifespan start-up, then times the first request to a few endpoints
+through an ASGI transport. Runs alternate between `WARMUP_ENABLED=true` and
+`false`; medians are reported.
+
+    python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+EMAIL = "startup@example.com"
+PASSWORD = "password"
+
+
+async def seed(database_url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.seed import create_schema, seed_tasks, seed_users
+
+    engine = create_async_engine(database_url)
+    await create_schema(engine)
+    seeded = await seed_users(engine, 1, PASSWORD, email_prefix="startup")
+    await seed_tasks(engine, 100, [user_id for user_id, _ in seeded])
+    await engine.dispose()
+    return seeded[0][1]
+
+
+async def measure(email: str) -> dict:
+    """
+    Imports the application, starts it and times the first requests.
+
+    Returns:
+        dict: Milliseconds spent importing, starting and serving each first request
+    """
+    import httpx
+
+    timings = {}
+    started = time.perf_counter()
+    from app.main import app
+    timings["import"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings["startup"] = (time.perf_counter() - started) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            async def first(name, method, url, **kwargs):
+                request_started = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                timings[name] = (time.perf_counter() - request_started) * 1000
+                return response
+
+            response = await first("login", "POST", "/auth/jwt/login", data={"username": email, "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            await first("list_tasks", "GET", "/tasks/", headers=headers)
+            await first("get_task", "GET", "/tasks/1", headers=headers)
+            await first("openapi", "GET", "/openapi.json")
+    return timings
+
+
+def run_worker(warmup: bool, env: dict, email: str) -> dict:
+    env = dict(env, WARMUP_ENABLED="true" if warmup else "false")
+    output = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--worker", email],
+                            env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite+aiosqlite:///{directory}/startup.db"
+        env = dict(os.environ, DATABASE_URL=database_url, ACCESS_LOG_ENABLED="false",
+                   LOOP_LAG_MONITOR_ENABLED="false")
+        env.setdefault("JWT_SECRET_KEY", "startup-secret")
+        email = asyncio.run(seed(database_url))
+
+        results = {True: [], False: []}
+        for _ in range(args.runs):
+            for warmup in (False, True):
+                results[warmup].append(run_worker(warmup, env, email))
+
+    steps = list(results[True][0])
+    print(f"{'step (median ms)':<20}{'cold':>12}{'warm-up':>12}")
+    for step in steps:
+        cold = statistics.median(run[step] for run in results[False])
+        warm = statistics.median(run[step] for run in results[True])
+        print(f"{step:<20}{cold:>12.1f}{warm:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="workers started per configuration")
+    parser.add_argument("--worker", metavar="EMAIL", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(asyncio.run(measure(args.worker))))
+    else:
+        main(args)
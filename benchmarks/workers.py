@@ -0,0 +1,121 @@
+"""Throughput of `python -m app.serve` by number of workers.
+
+Seeds a fresh SQLite database, then for every worker count starts the
+server and drives it from several client processes (one httpx client
+cannot saturate several workers) with the virtual users of
+benchmarks.load. Requests per second and p95 latency are reported per
+worker count. The default mix is read-heavy, since SQLite serializes
+writes whatever the number of workers.
+
+    python -m benchmarks.workers --workers 1,2,4 --users 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.load import Recorder, VirtualUser, free_port, parse_mix, seed_database
+
+DEFAULT_MIX = "list=60,get=40"
+
+
+async def drive(base_url: str, emails: list[str], args) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=len(emails), max_keepalive_connections=len(emails))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        virtual_users = [VirtualUser(client, email, args.password, recorder, random.Random(args.seed + i))
+                         for i, email in enumerate(emails)]
+        await asyncio.gather(*(virtual_user.run(args.mix, deadline) for virtual_user in virtual_users))
+        return recorder.report(time.perf_counter() - started)
+
+
+async def wait_until_ready(base_url: str):
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(200):
+            try:
+                await client.get("/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("the server did not start")
+
+
+def measure(workers: int, emails: list[str], args, env: dict) -> dict:
+    """
+    Starts the server with a number of workers and drives it.
+
+    Returns:
+        dict: Requests per second, errors and p95 latency over all client processes
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen([sys.executable, "-m", "app.serve"],
+                              env=dict(env, SERVER_WORKERS=str(workers), SERVER_HOST="127.0.0.1", SERVER_PORT=str(port)),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        share = max(1, args.users // args.clients)
+        clients = [subprocess.Popen([sys.executable, "-m", "benchmarks.workers", "--drive", base_url,
+                                     "--duration", str(args.duration), "--mix", args.mix_text,
+                                     "--password", args.password, "--seed", str(args.seed + i * share)],
+                                    env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                   for i in range(args.clients)]
+        reports = []
+        for i, client in enumerate(clients):
+            share_emails = [emails[(i * share + j) % len(emails)] for j in range(share)]
+            output, _ = client.communicate(json.dumps(share_emails))
+            reports.append(json.loads(output))
+    finally:
+        server.terminate()
+        server.wait()
+
+    totals = [report["total"] for report in reports]
+    return {"workers": workers,
+            "rps": sum(total["rps"] for total in totals),
+            "errors": sum(total["errors"] for total in totals),
+            "p95_ms": max(total["p95_ms"] for total in totals)}
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite+aiosqlite:///{directory}/workers.db"
+        env = dict(os.environ, DATABASE_URL=database_url, ACCESS_LOG_ENABLED="false")
+        env.setdefault("JWT_SECRET_KEY", "workers-secret")
+        seeded = asyncio.run(seed_database(database_url, args.seed_users, args.seed_tasks, args.password))
+        emails = [email for _, email in seeded]
+
+        print(f"{'workers':>8}{'rps':>10}{'errors':>8}{'p95 ms':>10}")
+        for workers in args.workers:
+            result = measure(workers, emails, args, env)
+            print(f"{result['workers']:>8}{result['rps']:>10.1f}{result['errors']:>8}{result['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=lambda value: [int(n) for n in value.split(",")], default=[1, 2, 4],
+                        help="comma-separated worker counts")
+    parser.add_argument("--users", type=int, default=32, help="concurrent virtual users over all client processes")
+    parser.add_argument("--clients", type=int, default=4, help="client processes driving the server")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to drive every configuration")
+    parser.add_argument("--mix", dest="mix_text", default=DEFAULT_MIX, help=f"operation weights, default {DEFAULT_MIX}")
+    parser.add_argument("--seed-users", type=int, default=50, help="users seeded before the run")
+    parser.add_argument("--seed-tasks", type=int, default=5000, help="tasks seeded before the run")
+    parser.add_argument("--password", default="password", help="password of the seeded users")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the virtual users' random choices")
+    parser.add_argument("--drive", metavar="URL", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.mix = parse_mix(args.mix_text)
+    if args.drive:
+        print(json.dumps(asyncio.run(drive(args.drive, json.load(sys.stdin), args))))
+    else:
+        main(args)
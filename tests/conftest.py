@@ -1,9 +1,18 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.db import get_async_session
+from app.db import get_async_session, instrument_engine
+from app.tracing import trace_engine
+from app.auth.tokens import revocation_store
+from app.monitoring import request_profiler
+from app.lifecycle import warmup
+from app.repositories import task_writer
+from app.config import config
+from app.auth.hashing import get_password_helper
 from app.models.base_model import Base
 from app.models import User
+from sqlalchemy import event, select
+from contextlib import contextmanager
 import pytest
 from pytest_asyncio import fixture as async_fixture
 from fastapi.testclient import TestClient
@@ -11,12 +20,21 @@ import os
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_db.db"
 engine = create_async_engine(TEST_DATABASE_URL, echo=True)
+instrument_engine(engine)
+trace_engine(engine)
 TestingSessionLocal = async_sessionmaker(
     bind=engine, 
     expire_on_commit=False,
     autoflush=False
 )
 
+revocation_store.session_maker = TestingSessionLocal
+request_profiler.session_maker = TestingSessionLocal
+warmup.engine = engine
+warmup.session_maker = TestingSessionLocal
+task_writer.session_maker = TestingSessionLocal
+config.ACCESS_LOG_ENABLED = False
+
 async def override_get_async_session():
     """
     Функция для замены настоящего get_async_session
@@ -36,16 +54,53 @@ async def setup_db():
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
 
     if os.path.exists("test_db.db"):
         os.remove("test_db.db")
 
+class QueryCounter:
+    """
+    Запоминает SQL-запросы, выполненные через тестовый engine
+
+    `app.db.query_stats` здесь не подходит: его выставляет middleware внутри
+    запроса, в потоке TestClient, и он хранит только число запросов, а бюджету
+    нужен их текст для сообщения об ошибке
+    """
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@pytest.fixture(scope="function")
+def query_budget():
+    """
+    Контекстный менеджер, проверяющий, что блок выполнил не больше `limit` SQL-запросов
+    Пример: with query_budget(2): client.get("/tasks/1")
+    Returns: budget (callable) -> QueryCounter
+    """
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "after_cursor_execute", counter)
+
+    @contextmanager
+    def budget(limit):
+        start = len(counter.statements)
+        block = QueryCounter()
+        yield block
+        block.statements = counter.statements[start:]
+        assert len(block.statements) <= limit, (
+            f"{len(block.statements)} queries executed, budget is {limit}:\n" + "\n".join(block.statements)
+        )
+
+    yield budget
+    event.remove(engine.sync_engine, "after_cursor_execute", counter)
+
 @pytest.fixture(scope="function")
 def get_client():
     app.dependency_overrides[get_async_session] = override_get_async_session
     with TestClient(app) as client:
-        print(type(client))
-        return client
+        yield client
 
 @pytest.fixture(scope="function")
 def make_test_user(get_client):
@@ -92,4 +147,51 @@ def token(get_client, get_test_user):
         }
     )
     assert response.status_code == 200
+    return response.json()["access_token"]
+
+@pytest.fixture(scope="function")
+def get_test_admin():
+    """
+    Получаем данные администратора в формате dict
+    """
+    admin_data = {
+        "email": "admin@example.com",
+        "password": "adminpassword",
+        "name": "Admin"
+    }
+    return admin_data
+
+@async_fixture(scope="function")
+async def make_test_admin(get_test_admin):
+    """
+    Создаёт администратора напрямую в базе, если его ещё нет
+    """
+    admin_data = get_test_admin
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(User).where(User.email == admin_data["email"]))
+        if result.scalar_one_or_none() is None:
+            session.add(User(email=admin_data["email"],
+                             hashed_password=get_password_helper().hash(admin_data["password"]),
+                             name=admin_data["name"],
+                             is_active=True,
+                             is_superuser=True,
+                             is_verified=True))
+            await session.commit()
+    return admin_data
+
+@pytest.fixture(scope="function")
+def admin_token(get_client, make_test_admin):
+    """
+    Получаем токен для действий администратора
+    """
+    client = get_client
+    response = client.post(
+        "/auth/jwt/login",
+        data={
+            "username": make_test_admin["email"],
+            "password": make_test_admin["password"],
+            "grant_type": "password"
+        }
+    )
+    assert response.status_code == 200
     return response.json()["access_token"]
\ No newline at end of file
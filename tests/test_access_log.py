@@ -0,0 +1,68 @@
+import io
+import json
+import logging
+import threading
+import pytest
+from app.monitoring import AccessLog
+from app.monitoring.access_log import access_log
+from tests.conftest import (
+    get_client,
+    token,
+    make_test_user,
+    get_test_user,
+    setup_db
+)
+
+
+class BlockedHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.released.wait()
+        self.records.append(self.format(record))
+
+
+def test_full_queue_drops_entries_without_blocking():
+    log = AccessLog(queue_size=2)
+    handler = BlockedHandler()
+    log.start(handler)
+
+    for number in range(10):
+        log.log({"number": number})
+    handler.released.set()
+    log.stop()
+
+    assert log.dropped > 0
+    assert len(handler.records) == 10 - log.dropped
+    assert json.loads(handler.records[0]) == {"number": 0}
+
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user):
+    pass
+
+
+def test_requests_are_logged_with_route_user_and_queries(get_client, token, get_test_user):
+    stream = io.StringIO()
+    access_log.start(logging.StreamHandler(stream))
+    try:
+        get_client.get("/tasks/", headers={"Authorization": f"Bearer {token}"})
+        get_client.get("/tasks/")
+    finally:
+        access_log.stop()
+
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(entries) == 2
+    tasks, anonymous = entries
+    assert tasks["method"] == "GET"
+    assert tasks["route"] == "/tasks/"
+    assert tasks["status"] == 200
+    assert tasks["user_id"] is not None
+    assert tasks["queries"] >= 1
+    assert tasks["duration_ms"] > 0
+    assert anonymous["route"] == "/tasks/"
+    assert anonymous["status"] == 401
+    assert anonymous["user_id"] is None
@@ -0,0 +1,126 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.admission import (
+    CHEAP,
+    EXPENSIVE,
+    AdmissionController,
+    AdmissionMiddleware,
+    request_priority,
+    shed_total
+)
+
+
+def scope(method, path):
+    return {"type": "http", "method": method, "path": path}
+
+
+def test_requests_are_classified_by_method_and_path():
+    assert request_priority(scope("GET", "/tasks/")) == CHEAP
+    assert request_priority(scope("GET", "/users/me")) == CHEAP
+    assert request_priority(scope("POST", "/tasks/")) == EXPENSIVE
+    assert request_priority(scope("DELETE", "/tasks/1")) == EXPENSIVE
+    assert request_priority(scope("GET", "/users")) == EXPENSIVE
+    assert request_priority(scope("GET", "/users/export")) == EXPENSIVE
+    assert request_priority(scope("GET", "/admin/profiles")) == EXPENSIVE
+    assert request_priority(scope("GET", "/metrics")) is None
+
+
+@pytest.mark.asyncio
+async def test_cheap_reads_are_admitted_first():
+    controller = AdmissionController(max_concurrency=1, queue_size=2, queue_timeout=1)
+    assert await controller.acquire(CHEAP) is None
+
+    expensive = asyncio.create_task(controller.acquire(EXPENSIVE))
+    cheap = asyncio.create_task(controller.acquire(CHEAP))
+    await asyncio.sleep(0)
+    assert controller.queued() == 2
+
+    controller.release()
+    assert await cheap is None
+    assert not expensive.done()
+    controller.release()
+    assert await expensive is None
+    controller.release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_expensive_requests_first():
+    controller = AdmissionController(max_concurrency=1, queue_size=1, queue_timeout=1)
+    await controller.acquire(CHEAP)
+    expensive = asyncio.create_task(controller.acquire(EXPENSIVE))
+    await asyncio.sleep(0)
+
+    assert await controller.acquire(EXPENSIVE) == "queue_full"
+    cheap = asyncio.create_task(controller.acquire(CHEAP))
+    assert await expensive == "evicted"
+    assert await controller.acquire(CHEAP) == "queue_full"
+
+    controller.release()
+    assert await cheap is None
+    assert shed_total.values[(EXPENSIVE, "evicted")] >= 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_requests_are_not_evicted():
+    controller = AdmissionController(max_concurrency=1, queue_size=1, queue_timeout=1)
+    await controller.acquire(CHEAP)
+    expensive = asyncio.create_task(controller.acquire(EXPENSIVE))
+    await asyncio.sleep(0)
+    evicted = shed_total.values.get((EXPENSIVE, "evicted"), 0)
+
+    async def read_after_cancel():
+        # The cancelled waiter is still queued until the expensive task resumes.
+        expensive.cancel()
+        return await controller.acquire(CHEAP)
+
+    cheap = asyncio.create_task(read_after_cancel())
+    await asyncio.sleep(0)
+    with pytest.raises(asyncio.CancelledError):
+        await expensive
+
+    controller.release()
+    assert await cheap is None
+    assert shed_total.values.get((EXPENSIVE, "evicted"), 0) == evicted
+    controller.release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_waiting_too_long_are_shed():
+    controller = AdmissionController(max_concurrency=1, queue_size=1, queue_timeout=0.05)
+    await controller.acquire(CHEAP)
+
+    assert await controller.acquire(CHEAP) == "timeout"
+    assert controller.queued() == 0
+    controller.release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_shed_requests_get_503_with_retry_after():
+    controller = AdmissionController(max_concurrency=1, queue_size=0, queue_timeout=1)
+    released = asyncio.Event()
+    application = FastAPI()
+    application.add_middleware(AdmissionMiddleware, controller=controller, retry_after=2)
+
+    @application.get("/slow")
+    async def slow():
+        await released.wait()
+        return {"in_flight": controller.in_flight}
+
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/slow"))
+        while not controller.in_flight:
+            await asyncio.sleep(0)
+        shed = await client.get("/slow")
+        released.set()
+        served = await first
+
+    assert served.json() == {"in_flight": 1}
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "2"
+    assert controller.in_flight == 0
@@ -5,8 +5,22 @@ from app.auth.auth import (
     get_user_manager,
     fastapi_users
 )
+from app.auth.hashing import (
+    MAX_TIME_COST,
+    build_password_helper,
+    calibrate_password_hashing,
+    get_password_helper,
+    measure_hash_latency
+)
+from app.auth.revocation import RevocationStore
+from app.auth.tokens import CachedJWTStrategy, CachedToken, TokenCache
+from app.models import User
 from app.repositories.user import UserRepository
 from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users.exceptions import UserNotExists
+from fastapi_users.jwt import decode_jwt
+from pwdlib.hashers.argon2 import Argon2Hasher
 from unittest.mock import patch, AsyncMock
 
 def test_get_jwt_strategy():
@@ -76,4 +90,143 @@ def test_parse_id():
     with pytest.raises(ValueError):
         user_manager.parse_id("2.0")
     with pytest.raises(TypeError):
-        user_manager.parse_id()
\ No newline at end of file
+        user_manager.parse_id()
+
+def test_calibrate_password_hashing_reaches_target():
+    with patch("app.auth.hashing.config") as mock_config:
+        time_cost = calibrate_password_hashing(5, memory_cost=1024, parallelism=1, rounds=1)
+
+        assert 1 <= time_cost <= MAX_TIME_COST
+        assert mock_config.ARGON2_TIME_COST == time_cost
+        assert mock_config.ARGON2_MEMORY_COST == 1024
+        assert mock_config.ARGON2_PARALLELISM == 1
+        if time_cost < MAX_TIME_COST:
+            latency = measure_hash_latency(Argon2Hasher(time_cost, 1024, 1), rounds=3)
+            assert latency >= 5 * 0.5
+
+
+def test_get_password_helper_follows_config():
+    with patch("app.auth.hashing.config") as mock_config:
+        mock_config.ARGON2_TIME_COST = 1
+        mock_config.ARGON2_MEMORY_COST = 1024
+        mock_config.ARGON2_PARALLELISM = 1
+        helper = get_password_helper()
+        assert get_password_helper() is helper
+        assert helper.hash("password").startswith("$argon2id$v=19$m=1024,t=1,p=1$")
+
+        mock_config.ARGON2_TIME_COST = 2
+        assert get_password_helper() is not helper
+        assert get_password_helper().hash("password").startswith("$argon2id$v=19$m=1024,t=2,p=1$")
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rehashes_on_parameter_change():
+    old_hash = build_password_helper(1, 1024, 1).hash("password")
+    user = User(id=1, email="test@example.com", hashed_password=old_hash, is_active=True)
+    mock_user_db = AsyncMock(spec=UserRepository)
+    mock_user_db.get_by_email.return_value = user
+    user_manager = UserManager(mock_user_db, password_helper=build_password_helper(2, 1024, 1))
+
+    credentials = OAuth2PasswordRequestForm(username="test@example.com", password="password")
+    assert await user_manager.authenticate(credentials) is user
+
+    mock_user_db.update.assert_awaited_once()
+    new_hash = mock_user_db.update.await_args.args[1]["hashed_password"]
+    assert new_hash.startswith("$argon2id$v=19$m=1024,t=2,p=1$")
+
+
+@pytest.mark.asyncio
+async def test_authenticate_keeps_hash_with_current_parameters():
+    helper = build_password_helper(1, 1024, 1)
+    user = User(id=1, email="test@example.com", hashed_password=helper.hash("password"), is_active=True)
+    mock_user_db = AsyncMock(spec=UserRepository)
+    mock_user_db.get_by_email.return_value = user
+    user_manager = UserManager(mock_user_db, password_helper=helper)
+
+    credentials = OAuth2PasswordRequestForm(username="test@example.com", password="password")
+    assert await user_manager.authenticate(credentials) is user
+    mock_user_db.update.assert_not_awaited()
+
+
+class FakeUserManager:
+    def __init__(self, user):
+        self.user = user
+
+    def parse_id(self, value):
+        return int(value)
+
+    async def get(self, user_id):
+        if user_id != self.user.id:
+            raise UserNotExists()
+        return self.user
+
+
+def make_cached_strategy(max_size=10, lifetime_seconds=3600):
+    return CachedJWTStrategy(secret="SECRET",
+                             lifetime_seconds=lifetime_seconds,
+                             cache=TokenCache(max_size),
+                             revocations=RevocationStore(session_maker=AsyncMock()))
+
+
+@pytest.mark.asyncio
+async def test_cached_strategy_verifies_token_once():
+    user = User(id=1, email="test@example.com", is_active=True)
+    strategy = make_cached_strategy()
+    token = await strategy.write_token(user)
+
+    with patch("app.auth.tokens.decode_jwt", wraps=decode_jwt) as mock_decode:
+        assert await strategy.read_token(token, FakeUserManager(user)) is user
+        assert await strategy.read_token(token, FakeUserManager(user)) is user
+        assert mock_decode.call_count == 1
+
+    assert strategy.cache.hits == 1
+    assert strategy.cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_strategy_rejects_invalid_token():
+    user = User(id=1, email="test@example.com", is_active=True)
+    strategy = make_cached_strategy()
+
+    assert await strategy.read_token(None, FakeUserManager(user)) is None
+    assert await strategy.read_token("invalid", FakeUserManager(user)) is None
+    assert len(strategy.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_strategy_checks_user_on_cache_hit():
+    user = User(id=1, email="test@example.com", is_active=True)
+    strategy = make_cached_strategy()
+    token = await strategy.write_token(user)
+    assert await strategy.read_token(token, FakeUserManager(user)) is user
+
+    other_user = User(id=2, email="other@example.com", is_active=True)
+    assert await strategy.read_token(token, FakeUserManager(other_user)) is None
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(2)
+    cache.put("a", CachedToken("1", None, {}))
+    cache.put("b", CachedToken("2", None, {}))
+    assert cache.get("a") is not None
+    cache.put("c", CachedToken("3", None, {}))
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_token_cache_drops_expired_entries():
+    cache = TokenCache(2)
+    cache.put("a", CachedToken("1", 100.0, {}))
+
+    assert cache.get("a", now=99.0) is not None
+    assert cache.get("a", now=100.0) is None
+    assert len(cache) == 0
+
+
+def test_token_cache_disabled():
+    cache = TokenCache(0)
+    cache.put("a", CachedToken("1", None, {}))
+    assert cache.get("a") is None
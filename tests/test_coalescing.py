@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock
+from app.managers.coalescing import SingleFlight, coalesced_calls_total, coalescing_ratios
+from app.managers.task import TaskManager
+from app.repositories import TaskRepository
+from app.schemas import TaskUpdate
+from tests.mock_repositories import (
+    get_all_tasks,
+    get_updated_task
+)
+
+
+async def slow_call(calls: list, result=None, error=None):
+    calls.append(None)
+    await asyncio.sleep(0.01)
+    if error is not None:
+        raise error
+    return result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_with_the_same_key_share_one_call():
+    flight = SingleFlight("test_share")
+    calls = []
+
+    results = await asyncio.gather(*(flight.do(1, lambda: slow_call(calls, ["a"])) for _ in range(10)),
+                                   flight.do(2, lambda: slow_call(calls, ["b"])))
+
+    assert len(calls) == 2
+    assert results[0] is results[9]
+    assert results[10] == ["b"]
+    assert not flight.calls
+    assert coalesced_calls_total.values[("test_share", "follower")] == 9
+    assert coalescing_ratios()[("test_share",)] == 9 / 11
+
+    await flight.do(1, lambda: slow_call(calls, ["c"]))
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_followers_get_the_error_of_the_call():
+    flight = SingleFlight("test_error")
+    calls = []
+
+    results = await asyncio.gather(*(flight.do(1, lambda: slow_call(calls, error=ValueError("boom")))
+                                     for _ in range(3)), return_exceptions=True)
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_followers_run_the_call_when_the_leader_is_cancelled():
+    flight = SingleFlight("test_cancel")
+    calls = []
+    leader = asyncio.create_task(flight.do(1, lambda: slow_call(calls, "leader")))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do(1, lambda: slow_call(calls, "follower")))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await follower == "follower"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_after_a_write_do_not_join_an_earlier_read(get_all_tasks, get_updated_task):
+    task_db = AsyncMock(spec=TaskRepository)
+    calls = []
+
+    async def get_tasks(user_id):
+        return await slow_call(calls, get_all_tasks)
+
+    task_db.get_tasks = AsyncMock(side_effect=get_tasks)
+    task_db.update_task = AsyncMock(return_value=get_updated_task)
+    manager = TaskManager(task_db)
+
+    before = asyncio.create_task(manager.get_tasks_json(1))
+    await asyncio.sleep(0)
+    concurrent = asyncio.create_task(manager.get_tasks_json(1))
+    await asyncio.sleep(0)
+    await manager.update_task(1, TaskUpdate(name="Updated Test Task"), 1)
+    after = asyncio.create_task(manager.get_tasks_json(1))
+    encoded = await asyncio.gather(before, concurrent, after)
+
+    assert len(calls) == 2
+    assert encoded[0] is encoded[1]
+    assert encoded[2] is not encoded[0]
+    assert [task["id"] for task in json.loads(encoded[2])] == [1, 2, 3]
+    assert json.loads(encoded[2])[1]["status"] == "in_progress"
@@ -0,0 +1,107 @@
+import asyncio
+import sqlite3
+import pytest
+from sqlalchemy import func, select
+from app.config import config
+from app.models import Task, User
+from app.repositories import GroupCommitWriter, TaskRepository, get_task_repository, task_writer
+from app.schemas.tasks import TaskCreate, TaskUpdate
+from tests.conftest import (
+    TestingSessionLocal,
+    engine,
+    get_client,
+    make_test_user,
+    setup_db
+)
+
+
+def committed_batch_tasks():
+    """Names of the batch tasks another connection sees."""
+    connection = sqlite3.connect(engine.url.database)
+    try:
+        return [name for name, in connection.execute("SELECT name FROM tasks WHERE name LIKE 'batch %'")]
+    finally:
+        connection.close()
+
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit():
+    writer = GroupCommitWriter(TestingSessionLocal, window_ms=5, max_batch=64)
+    seen = []
+
+    async def insert(session, name):
+        # Nothing of the batch is committed before the whole batch is.
+        seen.extend(committed_batch_tasks())
+        task = Task(name=name, description="", status="new", user_id=1)
+        session.add(task)
+        await session.flush()
+        return task
+
+    async def invalid(session):
+        session.add(Task(name="invalid", description="", status="new", user_id=1))
+        await session.flush()
+        raise ValueError("invalid task")
+
+    results = await asyncio.gather(*(writer.submit(lambda session, i=i: insert(session, f"batch {i}"))
+                                     for i in range(10)),
+                                   writer.submit(invalid),
+                                   return_exceptions=True)
+
+    assert seen == []
+    assert len(committed_batch_tasks()) == 10
+    assert (writer.batches, writer.operations) == (1, 11)
+    assert sorted(task.name for task in results[:10]) == sorted(f"batch {i}" for i in range(10))
+    assert len({task.id for task in results[:10]}) == 10
+    assert isinstance(results[10], ValueError)
+    async with TestingSessionLocal() as session:
+        names = (await session.execute(select(Task.name).where(Task.name.like("batch %")))).scalars().all()
+        assert len(names) == 10
+        assert (await session.execute(select(func.count()).where(Task.name == "invalid"))).scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_full_batches_are_committed_without_waiting_for_the_window():
+    writer = GroupCommitWriter(TestingSessionLocal, window_ms=10_000, max_batch=4)
+
+    async def noop(session):
+        return None
+
+    await asyncio.wait_for(asyncio.gather(*(writer.submit(noop) for _ in range(8))), timeout=5)
+
+    assert writer.batches == 2
+
+
+@pytest.mark.asyncio
+async def test_repository_writes_keep_their_results():
+    writer = GroupCommitWriter(TestingSessionLocal, window_ms=5, max_batch=64)
+    async with TestingSessionLocal() as session:
+        repository = TaskRepository(session, Task, User, writer=writer)
+        created = await repository.create_task(TaskCreate(name="grouped", description="", user_id=1))
+
+        updated, missing, foreign = await asyncio.gather(
+            repository.update_task(created.id, TaskUpdate(status="completed"), 1),
+            repository.update_specific_task(999_999, TaskUpdate(name="missing")),
+            repository.delete_task(created.id, 2))
+        deleted = await repository.delete_specific_task(created.id)
+
+    assert updated.status == "completed" and updated.name == "grouped"
+    assert missing is None and foreign is None
+    assert deleted.id == created.id
+    async with TestingSessionLocal() as session:
+        assert await session.get(Task, created.id) is None
+
+
+@pytest.mark.asyncio
+async def test_group_commit_is_opt_in(monkeypatch):
+    async with TestingSessionLocal() as session:
+        repository = await get_task_repository(session).__anext__()
+        assert repository.writer is None
+
+        monkeypatch.setattr(config, "TASK_GROUP_COMMIT", True)
+        repository = await get_task_repository(session).__anext__()
+        assert repository.writer is task_writer
@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.exc import OperationalError
+from fastapi.testclient import TestClient
+from app.lifecycle import RequestGate, RequestGateMiddleware, warmup
+from tests.conftest import (
+    engine,
+    get_client,
+    make_test_user,
+    setup_db
+)
+
+
+def gated_app(gate):
+    application = FastAPI()
+    application.add_middleware(RequestGateMiddleware, gate=gate)
+
+    @application.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.1)
+        return {"in_flight": gate.in_flight}
+
+    return application
+
+
+def test_closed_gate_rejects_requests():
+    gate = RequestGate()
+    client = TestClient(gated_app(gate))
+
+    assert client.get("/slow").json() == {"in_flight": 1}
+    gate.accepting = False
+    response = client.get("/slow")
+
+    assert response.status_code == 503
+    assert response.headers["connection"] == "close"
+    assert gate.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_requests_in_flight():
+    gate = RequestGate()
+    gate.in_flight = 1
+
+    async def finish():
+        await asyncio.sleep(0.05)
+        gate.in_flight -= 1
+
+    task = asyncio.create_task(finish())
+    assert await gate.drain(timeout=1)
+    await task
+    assert not gate.accepting
+
+    gate.in_flight = 1
+    assert not await gate.drain(timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_warmup_runs_every_step(monkeypatch):
+    # `run` logs and swallows statement warm-up errors.
+    await warmup.statements()
+    application = FastAPI()
+    durations = await warmup.run(application)
+
+    assert set(durations) == {"pool", "statements"}
+    assert application.openapi_schema is None
+
+    monkeypatch.setattr(warmup, "render_openapi", True)
+    durations = await warmup.run(application)
+
+    assert set(durations) == {"pool", "statements", "openapi"}
+    assert application.openapi_schema is not None
+
+
+class FailingEngine:
+    """Engine whose last connection attempt fails."""
+
+    def __init__(self, engine, fail_at):
+        self.pool = engine.pool
+        self.engine = engine
+        self.attempts = 0
+        self.fail_at = fail_at
+        self.opened = []
+
+    async def connect(self):
+        self.attempts += 1
+        if self.attempts == self.fail_at:
+            raise OperationalError("connect", None, Exception("unreachable"))
+        connection = await self.engine.connect()
+        self.opened.append(connection)
+        return connection
+
+
+@pytest.mark.asyncio
+async def test_pool_warmup_closes_connections_when_one_fails(monkeypatch):
+    failing = FailingEngine(engine, fail_at=3)
+    monkeypatch.setattr(warmup, "engine", failing)
+    monkeypatch.setattr(warmup, "connections", 3)
+
+    with pytest.raises(OperationalError):
+        await warmup.pool()
+
+    assert len(failing.opened) == 2
+    assert all(connection.closed for connection in failing.opened)
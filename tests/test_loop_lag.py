@@ -0,0 +1,73 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from app.monitoring import LoopLagMonitor
+from app.monitoring.middleware import run_request, running_request
+
+
+def block_event_loop(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_stall_is_captured_with_stack_and_route():
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+
+    async def request():
+        block_event_loop(0.3)
+
+    scope = {"type": "http", "method": "GET", "path": "/tasks/1",
+             "route": SimpleNamespace(path_format="/tasks/{task_id}")}
+    await asyncio.create_task(run_request(request(), scope))
+    assert running_request.scope is None
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert len(monitor.stalls) == 1
+    stall = monitor.stalls[0]
+    assert stall["duration_ms"] >= 200
+    assert stall["method"] == "GET"
+    assert stall["route"] == "/tasks/{task_id}"
+    assert "block_event_loop" in stall["stack"]
+
+
+@pytest.mark.asyncio
+async def test_no_stall_when_loop_is_responsive():
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+    task = asyncio.create_task(monitor.run())
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert len(monitor.stalls) == 0
+
+
+@pytest.mark.asyncio
+async def test_running_request_is_set_during_its_steps_only():
+    scope = {"type": "http", "method": "GET", "path": "/tasks/"}
+    seen = []
+
+    async def request():
+        seen.append(running_request.scope)
+        await asyncio.sleep(0)
+        seen.append(running_request.scope)
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        await run_request(request(), scope)
+    assert seen == [scope, scope]
+    assert running_request.scope is None
+
+    waiting = asyncio.create_task(run_request(asyncio.sleep(10), scope))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert running_request.scope is None
@@ -0,0 +1,79 @@
+import logging
+import re
+import pytest
+from app.monitoring import Counter, Gauge, Histogram, Registry
+from tests.conftest import (
+    get_client,
+    token,
+    make_test_user,
+    get_test_user,
+    setup_db
+)
+
+
+def test_registry_renders_text_format():
+    registry = Registry()
+    counter = registry.register(Counter("requests_total", "Requests", ("route",)))
+    gauge = registry.register(Gauge("entries", "Entries", function=lambda: 7))
+    histogram = registry.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1)))
+
+    counter.inc('/a/"b"')
+    counter.inc('/a/"b"', amount=2)
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(3, "/a")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a/\\"b\\""} 3' in lines
+    assert "entries 7" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert gauge.function() == 7
+
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user):
+    pass
+
+
+def test_metrics_are_labeled_by_route_template(get_client, token):
+    client = get_client
+    headers = {"Authorization": f"Bearer {token}"}
+    task = client.post("/tasks/", json={"name": "Task", "description": "Task"}, headers=headers).json()
+    client.get(f"/tasks/{task['id']}", headers=headers)
+    client.get(f"/tasks/{task['id']}", headers=headers)
+    client.get("/missing")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/tasks/{task_id}",status="200"} 2' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in body
+    assert f"/tasks/{task['id']}\"" not in body
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/tasks/",status="200",le="+Inf"} 1' in body
+    assert "http_requests_in_progress 1" in body
+    assert "db_pool_checked_out" in body
+    assert "token_cache_hits" in body
+
+
+def test_sql_statements_are_reported_per_request(get_client, token, mocker, caplog):
+    client = get_client
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/tasks/", headers=headers)
+
+    timing = re.fullmatch(r'db;dur=([0-9.]+);desc="(\d+) queries"', response.headers["server-timing"])
+    assert timing is not None
+    assert int(timing.group(2)) >= 2
+    body = client.get("/metrics").text
+    assert 'http_request_db_queries_count{method="GET",route="/tasks/"}' in body
+
+    mocker.patch("app.monitoring.middleware.config.SQL_QUERY_BUDGET", 1)
+    with caplog.at_level(logging.WARNING, logger="app.monitoring.middleware"):
+        client.get("/tasks/", headers=headers)
+    assert "GET /tasks/ executed" in caplog.text
@@ -0,0 +1,116 @@
+import marshal
+import threading
+import time
+import pytest
+from app.monitoring import StackSampler, request_profiler, stack_sampler
+from tests.conftest import (
+    admin_token,
+    get_client,
+    get_test_admin,
+    get_test_user,
+    make_test_admin,
+    make_test_user,
+    setup_db,
+    token
+)
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user, make_test_admin):
+    pass
+
+def test_request_is_not_profiled_without_flag(get_client, admin_token):
+    client = get_client
+
+    response = client.get("/tasks/", headers={"Authorization": f"Bearer {admin_token}"})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+def test_regular_user_cannot_profile(get_client, token):
+    client = get_client
+
+    response = client.get("/tasks/", params={"profile": 1}, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+def test_admin_profiles_request(get_client, admin_token):
+    client = get_client
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = client.get("/tasks/", headers={**headers, "X-Profile": "1", "X-Request-ID": "tasks-list"})
+
+    assert response.status_code == 200
+    assert response.headers["x-profile-id"] == "tasks-list"
+    assert request_profiler.get("tasks-list").status == 200
+
+    profiles = client.get("/admin/profiles", headers=headers).json()
+    assert profiles[0]["id"] == "tasks-list"
+    assert profiles[0]["path"] == "/tasks/"
+
+    report = client.get("/admin/profiles/tasks-list", headers=headers)
+    assert report.status_code == 200
+    assert "get_all_tasks" in report.text
+
+    dump = client.get("/admin/profiles/tasks-list", params={"format": "pstats"}, headers=headers)
+    assert any(function == "get_all_tasks" for _, _, function in marshal.loads(dump.content))
+
+def test_admin_profile_query_flag(get_client, admin_token):
+    client = get_client
+
+    response = client.get("/tasks/", params={"profile": 1}, headers={"Authorization": f"Bearer {admin_token}"})
+
+    assert response.headers["x-profile-id"] in request_profiler.profiles
+
+def test_profiles_forbidden_and_missing(get_client, token, admin_token):
+    client = get_client
+
+    assert client.get("/admin/profiles", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+    response = client.get("/admin/profiles/missing", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 404
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_stack_sampler_counts_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    worker.start()
+    sampler = StackSampler(interval=0.001, max_stacks=1)
+    sampler.start(worker.ident)
+    time.sleep(0.2)
+    sampler.stop()
+    stop.set()
+    worker.join()
+
+    lines = sampler.collapsed().splitlines()
+    assert sampler.samples > 10
+    assert len(lines) <= 2
+    assert any("tests.test_profiling:busy_loop" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sampler.samples
+
+    sampler.reset()
+    assert sampler.collapsed() == ""
+
+def test_flamegraph(get_client, token, admin_token):
+    client = get_client
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    assert client.get("/admin/flamegraph", headers=headers).status_code == 404
+
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    worker.start()
+    stack_sampler.start(worker.ident)
+    try:
+        time.sleep(0.1)
+        assert client.get("/admin/flamegraph", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+        response = client.get("/admin/flamegraph", params={"reset": True}, headers=headers)
+    finally:
+        stack_sampler.stop()
+        stop.set()
+        worker.join()
+
+    assert response.status_code == 200
+    assert "busy_loop" in response.text
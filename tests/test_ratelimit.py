@@ -0,0 +1,77 @@
+import pytest
+from app.ratelimit import (
+    Limit,
+    MemoryBackend,
+    parse_limits,
+    rate_limiter,
+    route_group
+)
+from tests.conftest import (
+    get_client,
+    token,
+    make_test_user,
+    get_test_user,
+    setup_db
+)
+
+
+def test_limits_are_parsed_per_group():
+    assert parse_limits("tasks_read=5/20, auth=0.5/5,default=2") == {
+        "tasks_read": Limit(5, 20), "auth": Limit(0.5, 5), "default": Limit(2, 2)}
+    assert parse_limits(None) == {}
+    with pytest.raises(ValueError):
+        parse_limits("everything=1/1")
+
+
+def test_requests_are_grouped_by_method_and_path():
+    assert route_group("POST", "/auth/jwt/login") == "auth"
+    assert route_group("GET", "/tasks/1") == "tasks_read"
+    assert route_group("PUT", "/tasks/1") == "tasks_write"
+    assert route_group("GET", "/users/export") == "users"
+    assert route_group("GET", "/authenticated-route") == "default"
+
+
+@pytest.mark.asyncio
+async def test_bucket_refills_over_time_and_is_evicted_once_full():
+    backend = MemoryBackend()
+    limit = Limit(rate=2, burst=2)
+
+    assert (await backend.take(("tasks_read", "user:1"), limit, now=0)).remaining == 1
+    assert (await backend.take(("tasks_read", "user:1"), limit, now=0)).allowed
+    rejected = await backend.take(("tasks_read", "user:1"), limit, now=0)
+    assert not rejected.allowed
+    assert rejected.retry_after == 0.5
+    assert rejected.reset_after == 1
+    assert (await backend.take(("tasks_read", "user:1"), limit, now=0.5)).allowed
+    assert (await backend.take(("tasks_read", "user:2"), limit, now=0.5)).allowed
+
+    assert backend.evict(now=0.9) == 0
+    assert backend.evict(now=1) == 1
+    assert set(backend.buckets) == {("tasks_read", "user:1")}
+
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user):
+    pass
+
+
+def test_clients_over_their_limit_get_429(get_client, token, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "limits", parse_limits("tasks_read=0.01/2"))
+    monkeypatch.setattr(rate_limiter, "backend", MemoryBackend())
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = get_client.get("/tasks/", headers=headers)
+    assert first.status_code == 200
+    assert first.headers["x-ratelimit-limit"] == "2"
+    assert first.headers["x-ratelimit-remaining"] == "1"
+    assert get_client.get("/tasks/", headers=headers).status_code == 200
+    limited = get_client.get("/tasks/", headers=headers)
+
+    assert limited.status_code == 429
+    assert limited.headers["x-ratelimit-remaining"] == "0"
+    assert int(limited.headers["retry-after"]) > 0
+    assert int(limited.headers["x-ratelimit-reset"]) > 0
+    # Anonymous requests are counted per IP address, apart from the user.
+    assert get_client.get("/tasks/").status_code == 401
+    assert get_client.post("/tasks/", headers=headers, json={"title": "t"}).status_code != 429
+    assert set(rate_limiter.backend.buckets) == {("tasks_read", "user:1"), ("tasks_read", "ip:testclient")}
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import select
+from app.auth.revocation import BloomFilter, RevocationStore
+from app.auth.tokens import CachedJWTStrategy, TokenCache
+from app.models import RevokedToken, User
+from tests.conftest import (
+    TestingSessionLocal,
+    get_client,
+    get_test_user,
+    make_test_user,
+    setup_db,
+    token
+)
+
+
+@pytest.fixture
+def revocations():
+    return RevocationStore(session_maker=TestingSessionLocal, capacity=100)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_revoke_is_visible_in_memory_and_database(setup_db, revocations):
+    assert not revocations.is_revoked("jti-1")
+    assert not revocations.is_revoked(None)
+
+    await revocations.revoke("jti-1", 2_000_000_000)
+
+    assert revocations.is_revoked("jti-1")
+    assert not revocations.is_revoked("jti-2")
+    async with TestingSessionLocal() as session:
+        rows = (await session.execute(select(RevokedToken.jti))).scalars().all()
+    assert "jti-1" in rows
+
+
+@pytest.mark.asyncio
+async def test_sync_loads_revocations_from_other_workers(revocations):
+    other_worker = RevocationStore(session_maker=TestingSessionLocal, capacity=100)
+    await other_worker.revoke("jti-2", 2_000_000_000)
+    await other_worker.revoke("jti-expired", 1_000)
+
+    await revocations.sync()
+
+    assert revocations.is_revoked("jti-1")
+    assert revocations.is_revoked("jti-2")
+    assert not revocations.is_revoked("jti-expired")
+
+
+@pytest.mark.asyncio
+async def test_prune_drops_expired_revocations(revocations):
+    await revocations.revoke("jti-3", 1_000)
+    assert revocations.is_revoked("jti-3")
+
+    assert await revocations.prune() == 1
+
+    assert not revocations.is_revoked("jti-3")
+    async with TestingSessionLocal() as session:
+        rows = (await session.execute(select(RevokedToken.jti))).scalars().all()
+    assert "jti-3" not in rows
+    assert "jti-1" in rows
+
+
+@pytest.mark.asyncio
+async def test_destroy_token_revokes_cached_token(revocations):
+    user = User(id=1, email="test@example.com", is_active=True)
+    strategy = CachedJWTStrategy(secret="SECRET",
+                                 lifetime_seconds=3600,
+                                 cache=TokenCache(10),
+                                 revocations=revocations)
+    token = await strategy.write_token(user)
+    assert strategy.verify_token(token) is not None
+
+    await strategy.destroy_token(token, user)
+
+    assert strategy.verify_token(token) is None
+    assert await strategy.write_token(user) != token
+
+
+@pytest.mark.asyncio
+async def test_logout_route_revokes_token(make_test_user, get_client, token):
+    client = get_client
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/authenticated-route", headers=headers).status_code == 200
+
+    response = client.post("/auth/jwt/logout", headers=headers)
+    assert response.status_code == 204
+
+    assert client.get("/authenticated-route", headers=headers).status_code == 401
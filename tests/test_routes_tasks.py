@@ -8,6 +8,10 @@ from tests.conftest import (
     token,
     make_test_user,
     get_test_user,
+    admin_token,
+    get_test_admin,
+    make_test_admin,
+    query_budget,
     setup_db
 )
 
@@ -32,7 +36,7 @@ async def test_create_task_unauthorized(get_client):
     assert response.status_code == 401
 
 @pytest.mark.asyncio
-async def test_create_task(get_client, token):
+async def test_create_task(get_client, token, query_budget):
     client = get_client
     task_data = {
         "name": "Test Task",
@@ -40,11 +44,12 @@ async def test_create_task(get_client, token):
         "status": "new"
     }
 
-    response = client.post(
-        "/tasks",
-        json=task_data,
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    with query_budget(4):
+        response = client.post(
+            "/tasks",
+            json=task_data,
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
     assert response.status_code == 200
     assert response.json()["name"] == "Test Task"
@@ -120,13 +125,14 @@ async def test_create_task_missing_description_or_name(get_client, token):
     assert response.status_code == 422
 
 @pytest.mark.asyncio
-async def test_get_all_tasks(get_client, token):
+async def test_get_all_tasks(get_client, token, query_budget):
     client = get_client
 
-    response = client.get(
-        "/tasks",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    with query_budget(2):
+        response = client.get(
+            "/tasks",
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
     assert response.status_code == 200
     assert isinstance(response.json(), list)
@@ -142,13 +148,14 @@ async def test_get_all_tasks_unauthorized(get_client):
     assert response.status_code == 401
 
 @pytest.mark.asyncio
-async def test_get_task(get_client, token):
+async def test_get_task(get_client, token, query_budget):
     client = get_client
 
-    response = client.get(
-        "/tasks/1",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    with query_budget(2):
+        response = client.get(
+            "/tasks/1",
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
     assert response.status_code == 200
     assert response.json()["id"] == 1
@@ -187,7 +194,7 @@ async def test_get_task_invalid_id(get_client, token):
     assert response.status_code == 422
 
 @pytest.mark.asyncio
-async def test_update_task(get_client, token):
+async def test_update_task(get_client, token, query_budget):
     client = get_client
 
     task_data = {
@@ -196,11 +203,12 @@ async def test_update_task(get_client, token):
         "status": "in_progress"
     }
 
-    response = client.put(
-        "/tasks/1",
-        json=task_data,
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    with query_budget(4):
+        response = client.put(
+            "/tasks/1",
+            json=task_data,
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
     assert response.status_code == 200
     assert response.json()["name"] == "Updated Task"
@@ -348,13 +356,14 @@ async def test_delete_task_invalid_id(get_client, token):
     assert response.status_code == 422
 
 @pytest.mark.asyncio
-async def test_delete_task(get_client, token):
+async def test_delete_task(get_client, token, query_budget):
     client = get_client
 
-    response = client.delete(
-        "/tasks/1",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    with query_budget(3):
+        response = client.delete(
+            "/tasks/1",
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
     assert response.status_code == 200
     assert response.json()["id"] == 1
@@ -365,4 +374,33 @@ async def test_delete_task(get_client, token):
     )
 
     assert response.status_code == 200
-    assert response.json() is None
\ No newline at end of file
+    assert response.json() is None
+
+@pytest.mark.asyncio
+async def test_admin_task_routes(get_client, admin_token, query_budget):
+    client = get_client
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    with query_budget(4):
+        task = client.post(
+            "/tasks",
+            json={"name": "Admin Task", "description": "Admin Description", "user_id": 1},
+            headers=headers
+        ).json()
+    assert task["user_id"] == 1
+
+    with query_budget(2):
+        response = client.get("/tasks", headers=headers)
+    assert response.status_code == 200
+    assert task["id"] in [item["id"] for item in response.json()]
+
+    with query_budget(2):
+        response = client.get(f"/tasks/{task['id']}", headers=headers)
+    assert response.json()["name"] == "Admin Task"
+
+    with query_budget(4):
+        response = client.put(f"/tasks/{task['id']}", json={"status": "completed"}, headers=headers)
+    assert response.json()["status"] == "completed"
+
+    with query_budget(3):
+        response = client.delete(f"/tasks/{task['id']}", headers=headers)
+    assert response.json()["id"] == task["id"]
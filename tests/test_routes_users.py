@@ -0,0 +1,221 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from tests.conftest import (
+    admin_token,
+    get_client,
+    get_test_admin,
+    get_test_user,
+    make_test_admin,
+    make_test_user,
+    query_budget,
+    setup_db,
+    token
+)
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user, make_test_admin):
+    pass
+
+@pytest.mark.asyncio
+async def test_create_users(get_client, admin_token, query_budget):
+    client = get_client
+
+    for i in range(5):
+        with query_budget(4):
+            response = client.post(
+                "/users",
+                json={"email": f"user{i}@example.com", "password": "password", "name": f"User {i}"},
+                headers={"Authorization": f"Bearer {admin_token}"}
+            )
+        assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_get_users_forbidden(get_client, token):
+    client = get_client
+
+    response = client.get(
+        "/users",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_get_users_first_page(get_client, admin_token, query_budget):
+    client = get_client
+
+    with query_budget(2):
+        response = client.get(
+            "/users",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 7
+    assert response.json()["next_cursor"] is None
+
+@pytest.mark.asyncio
+async def test_get_users_pagination(get_client, admin_token):
+    client = get_client
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get(
+            "/users",
+            params=params,
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 3
+        ids.extend(user["id"] for user in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids)) == 7
+
+@pytest.mark.asyncio
+async def test_get_users_invalid_limit(get_client, admin_token):
+    client = get_client
+
+    response = client.get(
+        "/users",
+        params={"limit": 0},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_get_users_filters(get_client, admin_token, query_budget):
+    client = get_client
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    with query_budget(2):
+        response = client.get("/users", params={"is_superuser": True}, headers=headers)
+    assert [user["email"] for user in response.json()["items"]] == ["admin@example.com"]
+
+    response = client.get("/users", params={"is_superuser": False, "is_active": True}, headers=headers)
+    assert len(response.json()["items"]) == 6
+
+    response = client.get("/users", params={"email_prefix": "user"}, headers=headers)
+    assert [user["email"] for user in response.json()["items"]] == [f"user{i}@example.com" for i in range(5)]
+
+    response = client.get("/users", params={"email_prefix": "nobody"}, headers=headers)
+    assert response.json()["items"] == []
+
+    # The upper bound of the range carries past the largest code point.
+    response = client.get("/users", params={"email_prefix": "user\U0010FFFF"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+    response = client.get("/users", params={"email_prefix": "\U0010FFFF"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+@pytest.mark.asyncio
+async def test_export_users(get_client, admin_token, query_budget):
+    client = get_client
+
+    with query_budget(2):
+        response = client.get(
+            "/users/export",
+            params={"email_prefix": "user"},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert [user["email"] for user in users] == [f"user{i}@example.com" for i in range(5)]
+
+@pytest.mark.asyncio
+async def test_export_users_forbidden(get_client, token):
+    client = get_client
+
+    response = client.get(
+        "/users/export",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_bulk_create_users(get_client, admin_token, query_budget):
+    client = get_client
+    users = [
+        {"email": "bulk0@example.com", "password": "password", "name": "Bulk 0"},
+        {"email": "user0@example.com", "password": "password", "name": "Existing"},
+        {"email": "bulk1@example.com", "password": "password", "name": "Bulk 1"},
+        {"email": "BULK0@example.com", "password": "password", "name": "Duplicate"},
+    ]
+
+    with query_budget(4):
+        response = client.post(
+            "/users/bulk",
+            json={"users": users},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status"] for result in results] == ["created", "conflict", "created", "conflict"]
+    assert results[0]["id"] is not None
+    assert results[1]["id"] is None
+
+    login = client.post(
+        "/auth/jwt/login",
+        data={"username": "bulk1@example.com", "password": "password", "grant_type": "password"}
+    )
+    assert login.status_code == 200
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_concurrent_conflict(get_client, admin_token):
+    client = get_client
+    users = [
+        {"email": "bulk2@example.com", "password": "password", "name": "Bulk 2"},
+        {"email": "bulk0@example.com", "password": "password", "name": "Registered meanwhile"},
+    ]
+
+    with patch("app.repositories.user.UserRepository.get_existing_emails", AsyncMock(return_value=set())):
+        response = client.post(
+            "/users/bulk",
+            json={"users": users},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == ["created", "conflict"]
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_too_many(get_client, admin_token):
+    client = get_client
+    users = [{"email": f"many{i}@example.com", "password": "password", "name": "Many"} for i in range(3)]
+
+    with patch("app.routes.users.config.USERS_BULK_MAX_SIZE", 2):
+        response = client.post(
+            "/users/bulk",
+            json={"users": users},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.status_code == 413
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_forbidden(get_client, token):
+    client = get_client
+
+    response = client.post(
+        "/users/bulk",
+        json={"users": [{"email": "bulk9@example.com", "password": "password", "name": "Bulk 9"}]},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,68 @@
+import pytest
+from pytest_asyncio import fixture as async_fixture
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.models import Task, User
+from app.seed import create_schema, insert_statement, seed_tasks, seed_users
+
+
+@async_fixture
+async def seed_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/seed.db")
+    await create_schema(engine)
+    yield engine
+    await engine.dispose()
+
+
+async def read_tasks(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(select(Task.name, Task.description, Task.status, Task.user_id).order_by(Task.id))
+        return [tuple(row) for row in result]
+
+
+@pytest.mark.asyncio
+async def test_seed_users_returns_created_users(seed_engine):
+    seeded = await seed_users(seed_engine, 25, chunk_size=10)
+    more = await seed_users(seed_engine, 5, email_prefix="other")
+
+    assert len(seeded) == 25
+    assert seeded[0][1] == "bench0@example.com"
+    assert [email for _, email in more] == [f"other{i}@example.com" for i in range(5)]
+    async with seed_engine.connect() as conn:
+        assert (await conn.execute(select(func.count(User.id)))).scalar_one() == 30
+
+
+@pytest.mark.asyncio
+async def test_seed_tasks_follows_distribution_and_lengths(seed_engine):
+    user_ids = [user_id for user_id, _ in await seed_users(seed_engine, 10)]
+
+    await seed_tasks(seed_engine, 3000, user_ids, seed=1, statuses={"new": 3, "completed": 1},
+                     name_length=(5, 5), description_length=(20, 40), chunk_size=1000)
+
+    tasks = await read_tasks(seed_engine)
+    assert len(tasks) == 3000
+    assert {status for _, _, status, _ in tasks} == {"new", "completed"}
+    assert 0.7 < sum(status == "new" for _, _, status, _ in tasks) / 3000 < 0.8
+    assert all(len(name) == 5 for name, _, _, _ in tasks)
+    assert all(20 <= len(description) <= 40 for _, description, _, _ in tasks)
+    assert {user_id for _, _, _, user_id in tasks} <= set(user_ids)
+
+
+@pytest.mark.asyncio
+async def test_seed_tasks_is_deterministic(tmp_path, seed_engine):
+    other_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/other.db")
+    await create_schema(other_engine)
+    for engine in (seed_engine, other_engine):
+        user_ids = [user_id for user_id, _ in await seed_users(engine, 10)]
+        await seed_tasks(engine, 500, user_ids, seed=7, description_length=(10, 100))
+
+    assert await read_tasks(seed_engine) == await read_tasks(other_engine)
+    await other_engine.dispose()
+
+
+def test_insert_statement_requires_table_order():
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    assert insert_statement(engine, Task.__table__, ("name", "status")) == "INSERT INTO tasks (name, status) VALUES (?, ?)"
+    with pytest.raises(ValueError):
+        insert_statement(engine, Task.__table__, ("status", "name"))
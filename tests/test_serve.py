@@ -0,0 +1,79 @@
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import config
+from app.seed import create_schema
+from app.serve import build_config, calibrate_before_fork, worker_count
+
+
+def test_worker_count_defaults_to_cpu_count():
+    assert worker_count(3) == 3
+    assert worker_count(0) == (os.cpu_count() or 1)
+
+
+def test_uvicorn_config_comes_from_config(monkeypatch):
+    monkeypatch.setattr(config, "SERVER_BACKLOG", 512)
+    monkeypatch.setattr(config, "SERVER_KEEPALIVE_SECONDS", 15)
+    monkeypatch.setattr(config, "SERVER_LIMIT_CONCURRENCY", 100)
+    monkeypatch.setattr(config, "SERVER_HTTP", "h11")
+
+    server_config = build_config()
+
+    assert server_config.backlog == 512
+    assert server_config.timeout_keep_alive == 15
+    assert server_config.limit_concurrency == 100
+    assert server_config.http == "h11"
+
+
+def test_workers_inherit_the_calibration_of_the_parent(monkeypatch):
+    monkeypatch.setattr(config, "PASSWORD_HASH_TARGET_MS", 1.0)
+    monkeypatch.setattr(config, "ARGON2_TIME_COST", 0)
+    monkeypatch.setattr(config, "ARGON2_MEMORY_COST", 1024)
+
+    calibrate_before_fork()
+
+    assert config.ARGON2_TIME_COST >= 1
+    # The lifespan of the workers does not calibrate again.
+    assert config.PASSWORD_HASH_TARGET_MS is None
+
+
+async def create_database(url):
+    engine = create_async_engine(url)
+    await create_schema(engine)
+    await engine.dispose()
+
+
+def test_prefork_server_serves_and_stops(tmp_path):
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/serve.db"
+    asyncio.run(create_database(database_url))
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = dict(os.environ,
+               DATABASE_URL=database_url,
+               SERVER_WORKERS="2",
+               SERVER_HOST="127.0.0.1",
+               SERVER_PORT=str(port),
+               ACCESS_LOG_ENABLED="false",
+               LOOP_LAG_MONITOR_ENABLED="false")
+    server = subprocess.Popen([sys.executable, "-m", "app.serve"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/metrics")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise AssertionError("the server did not start")
+        assert response.status_code == 200
+    finally:
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=15) == 0
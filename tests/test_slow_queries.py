@@ -0,0 +1,52 @@
+import json
+import pytest
+from sqlalchemy import select
+from app.models import Task, User
+from app.monitoring import SlowQueryLog
+from app.monitoring.slow_queries import parameter_shape
+from tests.conftest import (
+    TestingSessionLocal,
+    engine,
+    setup_db
+)
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape((1, "secret", None), False) == ["int", "str(6)", "NoneType"]
+    assert parameter_shape({"email": "a@b.c"}, False) == {"email": "str(5)"}
+    assert parameter_shape([(1, "ab"), (2, "cd")], True) == {"rows": 2, "first": ["int", "str(2)"]}
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_with_plan(setup_db, tmp_path):
+    path = tmp_path / "slow.log"
+    slow_query_log = SlowQueryLog(0, str(path), database="test_db.db")
+    slow_query_log.attach(engine)
+    try:
+        async with TestingSessionLocal() as session:
+            await session.execute(select(Task).where(Task.user_id == 1))
+            await session.execute(select(User).where(User.email == "nobody@example.com"))
+    finally:
+        slow_query_log.close()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    by_table = {entry["statement"].split("FROM ")[1].split()[0]: entry for entry in entries}
+    assert by_table["tasks"]["parameters"] == ["int"]
+    assert by_table["tasks"]["duration_ms"] >= 0
+    assert "SCAN tasks" in by_table["tasks"]["plan"][0]
+    assert "USING INDEX" in by_table["users"]["plan"][0]
+    assert by_table["users"]["parameters"] == ["str(18)"]
+
+
+@pytest.mark.asyncio
+async def test_fast_queries_are_not_logged(tmp_path):
+    path = tmp_path / "slow.log"
+    slow_query_log = SlowQueryLog(60_000, str(path))
+    slow_query_log.attach(engine)
+    try:
+        async with TestingSessionLocal() as session:
+            await session.execute(select(Task))
+    finally:
+        slow_query_log.close()
+
+    assert not path.exists()
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import pytest
+from fastapi.testclient import TestClient
+from app.config import ENV_FILE
+from app.db import get_async_session
+from app.main import create_app
+from app.routes.lazy import LazyRouter
+from tests.conftest import override_get_async_session, setup_db
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Imports a module in a fresh interpreter under `-X importtime`.
+
+    Returns:
+        dict[str, int]: Cumulative import time in microseconds of every imported module
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=os.environ.copy(), check=True, capture_output=True, text=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time_within_budget():
+    times = import_times("app.main")
+
+    assert times["app.main"] / 1000 <= IMPORT_TIME_BUDGET_MS, \
+        f"app.main took {times['app.main'] / 1000:.0f} ms to import, budget is {IMPORT_TIME_BUDGET_MS:.0f} ms"
+    assert "uvicorn" not in times
+    if ENV_FILE is None:
+        assert "dotenv" not in times
+
+
+def lazy_routers(application):
+    return [route for route in application.router.routes if isinstance(route, LazyRouter)]
+
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db):
+    pass
+
+
+def test_rarely_used_routers_are_built_on_first_request():
+    application = create_app()
+    application.dependency_overrides[get_async_session] = override_get_async_session
+    assert len(lazy_routers(application)) == 2
+    paths_before = [getattr(route, "path", None) for route in application.router.routes]
+
+    with TestClient(application) as client:
+        response = client.post("/auth/forgot-password", json={"email": "nobody@example.com"})
+
+    assert response.status_code == 202
+    assert len(lazy_routers(application)) == 1
+    paths = [getattr(route, "path", None) for route in application.router.routes]
+    assert "/auth/forgot-password" in paths and "/auth/reset-password" in paths
+    assert paths.index("/auth/forgot-password") == paths_before.index(None)
+
+
+def test_openapi_schema_includes_lazy_routers():
+    application = create_app()
+
+    with TestClient(application) as client:
+        schema = client.get("/openapi.json").json()
+
+    assert not lazy_routers(application)
+    for path in ("/auth/forgot-password", "/auth/reset-password", "/auth/request-verify-token", "/auth/verify"):
+        assert path in schema["paths"]
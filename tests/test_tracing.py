@@ -0,0 +1,109 @@
+import json
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.tracing import Span, SpanExporter, Tracer, current_span, span, trace_methods, tracer
+from tests.conftest import (
+    TestingSessionLocal,
+    get_client,
+    token,
+    make_test_user,
+    get_test_user,
+    setup_db
+)
+
+
+@trace_methods
+class Service:
+    async def work(self):
+        with span("inner", size=3):
+            return 42
+
+    async def _private(self):
+        return 0
+
+    def sync(self):
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_untraced_calls_create_no_spans():
+    with span("outside") as current:
+        assert current is None
+    assert await Service().work() == 42
+    assert not hasattr(Service.sync, "__wrapped__")
+    assert not hasattr(Service._private, "__wrapped__")
+
+
+@pytest.mark.asyncio
+async def test_setup_db(setup_db, make_test_user):
+    pass
+
+
+@pytest.fixture(scope="function")
+def traces(tmp_path, monkeypatch):
+    """
+    Трассирует все запросы в файл и возвращает функцию чтения трасс
+    """
+    exporter = SpanExporter(str(tmp_path / "traces.jsonl"), "test")
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    monkeypatch.setattr(tracer, "exporter", exporter)
+
+    def read():
+        exporter.shutdown()
+        with open(exporter.target) as output:
+            return [json.loads(line) for line in output]
+    return read
+
+
+def test_request_is_exported_as_otlp_trace(get_client, token, traces):
+    client = get_client
+    headers = {"Authorization": f"Bearer {token}"}
+    task = client.post("/tasks/", json={"name": "Task", "description": "Task"}, headers=headers).json()
+    client.get(f"/tasks/{task['id']}", headers=headers)
+
+    exported = traces()
+
+    assert len(exported) == 2
+    resource_spans = exported[1]["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0] == {"key": "service.name", "value": {"stringValue": "test"}}
+    spans = {item["name"]: item for item in resource_spans["scopeSpans"][0]["spans"]}
+    root = spans["GET /tasks/{task_id}"]
+    assert "parentSpanId" not in root
+    assert {"key": "http.response.status_code", "value": {"intValue": "200"}} in root["attributes"]
+    handler = spans["handler get_task"]
+    manager = spans["TaskManager.get_task_by_id"]
+    repository = spans["TaskRepository.get_task_by_id"]
+    assert handler["parentSpanId"] == root["spanId"]
+    assert manager["parentSpanId"] == handler["spanId"]
+    assert repository["parentSpanId"] == manager["spanId"]
+    sql = [item for item in spans.values() if item["name"].startswith("SQL ")]
+    assert sql and all(item["parentSpanId"] != root["spanId"] for item in sql)
+    assert len({item["traceId"] for item in spans.values()}) == 1
+    assert all(int(item["endTimeUnixNano"]) >= int(item["startTimeUnixNano"]) for item in spans.values())
+
+
+def test_unsampled_requests_are_not_exported(get_client, token, traces, monkeypatch):
+    monkeypatch.setattr(tracer, "sample_rate", 0.0)
+    get_client.get("/tasks/", headers={"Authorization": f"Bearer {token}"})
+
+    assert tracer.exporter.thread is None
+    assert not Tracer(0.0, tracer.exporter).should_sample()
+
+
+@pytest.mark.asyncio
+async def test_failing_statements_are_finished_as_errors():
+    root = Span("request")
+    token = current_span.set(root)
+    try:
+        async with TestingSessionLocal() as session:
+            with pytest.raises(OperationalError):
+                await session.execute(text("SELECT * FROM missing_table"))
+            connection = await session.connection()
+            assert "trace_span" not in (await connection.get_raw_connection()).info
+    finally:
+        current_span.reset(token)
+
+    failed = [item for item in root.trace if item.name == "SQL SELECT"]
+    assert len(failed) == 1
+    assert failed[0].error and failed[0].end is not None